@@ -0,0 +1,332 @@
+"""Benchmarks for the hot paths of `stock_data_processor.py`.
+
+Everything runs offline: Alpha Vantage responses are served from fixture payloads in
+the API's own format, and returns are simulated from a GARCH(1,1) process.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py                          # print the results
+    python benchmarks/run_benchmarks.py --save-baseline base.json
+    python benchmarks/run_benchmarks.py --compare base.json      # exit code 1 on regressions
+
+Module import times are checked against `IMPORT_BUDGETS_MS` on every run (exit code 1 when
+a module is over budget or loads one of the `DEFERRED_MODULES` at import time).
+"""
+
+# Import necessary libraries
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# Append the absolute path of the `src/data` directory to system path
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data")
+sys.path.append(SRC_DIR)
+from backtest import GarchBacktester
+from risk import RiskEngine
+from stock_data_processor import APIStockProcessor
+from transport import HTTPTransport
+
+# ----------------------------------------------------------------------------------------------
+# 1. Fixtures
+# ----------------------------------------------------------------------------------------------
+
+
+def simulate_garch(n: int, mu=0.05, omega=0.05, alpha=0.1, beta=0.85, seed: int = 0) -> pd.Series:
+    """Simulate `n` daily percent returns from a GARCH(1,1) process."""
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal(n)
+    returns = np.empty(n)
+    sigma2, resid = omega / (1 - alpha - beta), 0.0
+    for t in range(n):
+        sigma2 = omega + alpha * resid**2 + beta * sigma2
+        resid = np.sqrt(sigma2) * shocks[t]
+        returns[t] = mu + resid
+    dates = pd.bdate_range(end="2024-12-31", periods=n, name="date")
+    return pd.Series(returns, index=dates, name="returns")
+
+
+def alpha_vantage_payload(n_bars: int = 6000, data_type: str = "json", seed: int = 0) -> bytes:
+    """Build a `TIME_SERIES_DAILY` response (newest bar first) as Alpha Vantage sends it."""
+    returns = simulate_garch(n_bars, seed=seed)
+    close = 100 * np.exp(np.cumsum(returns.values / 100))
+    bars = [
+        (d.strftime("%Y-%m-%d"), c * 0.995, c * 1.01, c * 0.99, c, 1_000_000 + i)
+        for i, (d, c) in enumerate(zip(returns.index[::-1], close[::-1]))
+    ]
+    if data_type == "csv":
+        lines = ["timestamp,open,high,low,close,volume"]
+        lines += [f"{d},{o:.4f},{h:.4f},{lo:.4f},{c:.4f},{v}" for d, o, h, lo, c, v in bars]
+        return ("\r\n".join(lines) + "\r\n").encode()
+    series = {
+        d: {
+            "1. open": f"{o:.4f}",
+            "2. high": f"{h:.4f}",
+            "3. low": f"{lo:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(v),
+        }
+        for d, o, h, lo, c, v in bars
+    }
+    meta = {"1. Information": "Daily Prices (open, high, low, close) and Volumes", "2. Symbol": "FIXT"}
+    return json.dumps({"Meta Data": meta, "Time Series (Daily)": series}, indent=4).encode()
+
+
+class FixtureResponse:
+    """Minimal streamed `requests.Response` stand-in that serves a fixture payload."""
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.headers = {"Content-Length": str(len(payload))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.payload), chunk_size):
+            yield self.payload[i : i + chunk_size]
+
+
+class FixtureSession:
+    """Serves fixture payloads in place of the processor's HTTP session."""
+
+    def __init__(self, payloads: dict):
+        self.payloads = payloads  # data_type -> bytes
+
+    def get(self, url: str, **kwargs):
+        data_type = "csv" if "datatype=csv" in url else "json"
+        return FixtureResponse(self.payloads[data_type])
+
+
+# ----------------------------------------------------------------------------------------------
+# 2. Measurement
+# ----------------------------------------------------------------------------------------------
+
+
+def measure(func, repeat: int = 5, units: int = 0) -> dict:
+    """Time `func` (median wall time), then record its peak traced memory in one more run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {"wall_ms": 1000 * float(np.median(times)), "peak_mb": peak / 1e6}
+    if units:
+        result["fits_per_s"] = units / float(np.median(times))
+    return result
+
+
+# Startup budgets (ms) of the modules the app, the service and the scripts import first
+IMPORT_BUDGETS_MS = {"stock_data_processor": 500, "config": 400}
+
+# Heavy dependencies that must only be imported on first use, never at module import
+DEFERRED_MODULES = ("arch", "scipy", "pandas", "statsmodels", "pydantic", "plotly")
+
+# Deferred modules a module may load anyway: `config.Settings` subclasses pydantic's
+# BaseSettings at module level (only reading `.env` and validating are deferred)
+IMPORT_ALLOWED = {"config": ("pydantic",)}
+
+IMPORT_PROBE = """
+import json, sys, time, tracemalloc
+sys.path.append({src_dir!r})
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+import {module}
+wall = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if {trace} else 0
+loaded = [name for name in {deferred!r} if name in sys.modules]
+print(json.dumps({{"wall": wall, "peak": peak, "loaded": loaded}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 5) -> dict:
+    """Import `module` in fresh interpreters: best wall time, then peak memory in one more run."""
+    runs = []
+    for trace in [False] * repeat + [True]:
+        code = IMPORT_PROBE.format(
+            src_dir=SRC_DIR, trace=trace, module=module, deferred=DEFERRED_MODULES
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    return {
+        "wall_ms": 1000 * min(run["wall"] for run in runs[:-1]),
+        "peak_mb": runs[-1]["peak"] / 1e6,
+        "loaded": runs[-1]["loaded"],
+    }
+
+
+def run_benchmarks(quick: bool = False) -> dict:
+    """Run every benchmark and return name -> metrics."""
+    repeat = 2 if quick else 5
+    session = FixtureSession(
+        {"json": alpha_vantage_payload(6000), "csv": alpha_vantage_payload(6000, "csv")}
+    )
+    processor = APIStockProcessor(
+        api_key="benchmark", requests_per_minute=None, transport=HTTPTransport(session=session)
+    )
+    results = {}
+
+    # Cold imports, as paid by every new process before it serves anything
+    for module in IMPORT_BUDGETS_MS:
+        results[f"import[{module}]"] = measure_import(module, repeat)
+
+    # get_stock_data: download (from fixtures) and parse a full history
+    for data_type in ("json", "csv"):
+        results[f"get_stock_data[{data_type}]"] = measure(
+            lambda: processor.get_stock_data("FIXT", data_type=data_type), repeat
+        )
+
+    # extract_returns on a full history
+    df_stock = processor.get_stock_data("FIXT")
+    results["extract_returns"] = measure(lambda: processor.extract_returns(df_stock), repeat * 10)
+
+    # volatility_forecaster: cold fits (cache cleared) and cached fits, per window and horizon
+    returns = simulate_garch(2500)
+    for window in (500, 1000, 2500):
+        window_returns = returns.iloc[-window:]
+        for horizon in (1, 10, 30):
+
+            def cold():
+                processor.model_cache.clear()
+                processor.volatility_forecaster(window_returns, horizon)
+
+            results[f"volatility_forecaster[cold,n={window},h={horizon}]"] = measure(
+                cold, repeat, units=1
+            )
+        results[f"volatility_forecaster[cached,n={window},h=30]"] = measure(
+            lambda: processor.volatility_forecaster(window_returns, 30), repeat * 10
+        )
+
+    # simulation_forecast: 20,000 paths over the app's longest horizon, from a cached fit
+    results["simulation_forecast[paths=20000,h=30]"] = measure(
+        lambda: processor.simulation_forecast(returns, 30, seed=0), repeat
+    )
+
+    # RiskEngine: parametric and FHS VaR/ES for a 5,000-name book from fitted models
+    n_names = 5000
+    rng = np.random.default_rng(0)
+    engine = RiskEngine()
+    book = {
+        "tickers": [f"T{i}" for i in range(n_names)],
+        "mu": rng.normal(0.05, 0.02, n_names),
+        "variances": rng.uniform(1.0, 4.0, (n_names, max(engine.horizons))),
+        "nu": rng.uniform(4.0, 20.0, n_names),
+        "lam": rng.uniform(-0.3, 0.3, n_names),
+        "std_resid": rng.standard_normal((2500, n_names)),
+    }
+    results[f"risk_engine[names={n_names}]"] = measure(lambda: engine.run(**book), repeat)
+
+    # Multi-day FHS: 10,000 bootstrapped GARCH paths per name for a 500-name book
+    n_fhs = 500
+    fhs_book = {key: value[:n_fhs] for key, value in book.items() if key != "std_resid"}
+    fhs_book["std_resid"] = book["std_resid"][:, :n_fhs]
+    fhs_book["garch"] = {
+        "omega": rng.uniform(0.01, 0.1, n_fhs),
+        "alpha": rng.uniform(0.05, 0.1, n_fhs),
+        "beta": rng.uniform(0.8, 0.9, n_fhs),
+    }
+    results[f"risk_engine[fhs,names={n_fhs},paths={engine.n_paths}]"] = measure(
+        lambda: engine.run(**fhs_book), max(1, repeat // 2)
+    )
+
+    # Walk-forward loop of `3.0_forecasting_volatility.py`
+    test_size = 20 if quick else 100
+    for refit_every in (1, 20):
+        backtester = GarchBacktester(refit_every=refit_every)
+        n_fits = -(-test_size // refit_every)
+        results[f"walk_forward[test={test_size},k={refit_every}]"] = measure(
+            lambda: backtester.run(returns, test_size), max(1, repeat // 2), units=n_fits
+        )
+
+    return results
+
+
+# ----------------------------------------------------------------------------------------------
+# 3. Baseline comparison
+# ----------------------------------------------------------------------------------------------
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return the benchmarks whose wall time grew by more than `tolerance` (e.g. 0.25 = 25%)."""
+    regressions = []
+    for name, metrics in results.items():
+        if name in baseline:
+            ratio = metrics["wall_ms"] / baseline[name]["wall_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def check_import_budgets(results: dict) -> list:
+    """Return a message for every module over its import budget or loading a deferred module."""
+    problems = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        metrics = results.get(f"import[{module}]")
+        if metrics is None:
+            continue
+        if metrics["wall_ms"] > budget:
+            problems.append(f"importing {module} takes {metrics['wall_ms']:.0f} ms (budget {budget} ms)")
+        loaded = [name for name in metrics["loaded"] if name not in IMPORT_ALLOWED.get(module, ())]
+        if loaded:
+            problems.append(f"importing {module} loads {', '.join(loaded)}")
+    return problems
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    print(f"{'benchmark':<48}{'wall ms':>10}{'peak MB':>10}{'fits/s':>10}{'vs base':>10}")
+    for name, metrics in results.items():
+        fits = f"{metrics['fits_per_s']:.1f}" if "fits_per_s" in metrics else ""
+        ratio = ""
+        if baseline and name in baseline:
+            ratio = f"{metrics['wall_ms'] / baseline[name]['wall_ms']:.2f}x"
+        print(f"{name:<48}{metrics['wall_ms']:>10.3f}{metrics['peak_mb']:>10.2f}{fits:>10}{ratio:>10}")
+
+
+# Run the benchmarks when the script is executed
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the stock data processor hot paths")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats and a shorter walk-forward")
+    args = parser.parse_args()
+
+    results = run_benchmarks(quick=args.quick)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    for problem in check_import_budgets(results):
+        print(f"IMPORT BUDGET: {problem}")
+        failed = True
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, ratio in regressions:
+            print(f"REGRESSION: {name} is {ratio:.2f}x slower than the baseline")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
@@ -1,40 +1,64 @@
 # Import necessary libraries
 import streamlit as st  # For building the interactive web app
-import plotly.express as px  # For data visualization
 import sys
 import os
 
 # Append the absolute path of the `src/data` directory to system path
 # This allows importing modules from that directory
 sys.path.append(os.path.abspath("../../src/data"))
-from stock_data_processor import (
-    APIStockProcessor,
-)  # Import the stock data processor class
+# plotly and the stock data processor are imported on first use, so the page renders
+# without waiting for them on a cold start
+
+# How long fetched prices are reused before Alpha Vantage is asked again (seconds)
+DATA_TTL = 60 * 60
+
+
+# === Server-wide caches (shared by every session and rerun) ===
+@st.cache_resource
+def get_processor():
+    """Create one APIStockProcessor (HTTP session and fitted-model cache) per server."""
+    from stock_data_processor import APIStockProcessor
+
+    return APIStockProcessor()
+
+
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def fetch_stock_data(ticker: str, limit_value):
+    """Fetch stock price data once per (ticker, limit) for all users."""
+    return get_processor().get_stock_data(ticker, limit=limit_value)
+
+
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def fetch_returns(ticker: str, limit_value):
+    """Compute the returns once per (ticker, limit) from the cached prices."""
+    return get_processor().extract_returns(fetch_stock_data(ticker, limit_value))
 
 
 class StockVolatilityApp:
     def __init__(self):
-        """Initialize the application by creating an instance of APIStockProcessor."""
-        self.processor = (
-            APIStockProcessor()
-        )  # Object for handling stock data processing
+        """Initialize the application; the shared APIStockProcessor is created on first use."""
         self.df_stock = None  # Placeholder for stock price data
         self.returns = None  # Placeholder for stock returns data
 
+    @property
+    def processor(self):
+        """The shared APIStockProcessor, for handling stock data processing."""
+        return get_processor()
+
     def get_stock_data(self, ticker: str, limit):
         """Fetch stock price data for a given ticker symbol."""
         with st.spinner("Fetching stock data..."):  # Display a loading spinner
             # If 'full' is selected, fetch all available data; otherwise, use the specified limit
             limit_value = None if limit == "full" else int(limit)
-            self.df_stock = self.processor.get_stock_data(ticker, limit=limit_value)
+            self.df_stock = fetch_stock_data(ticker, limit_value)
 
-            # Store the fetched data in Streamlit's session state for later use
-            st.session_state["df_stock"] = self.df_stock
+            # Remember which data this session is looking at; the frame itself lives in the cache
+            st.session_state["stock_request"] = (ticker, limit_value)
 
     def compute_returns(self):
         """Calculate stock returns based on the fetched stock data."""
-        if self.df_stock is not None:
-            self.returns = self.processor.extract_returns(self.df_stock)
+        if "stock_request" in st.session_state:
+            self.returns = fetch_returns(*st.session_state["stock_request"])
             return self.returns
         return None  # Return None if no stock data is available
 
@@ -42,7 +66,12 @@ class StockVolatilityApp:
         """Forecast stock volatility over a given number of days."""
         if self.returns is not None:
             try:
-                volatility = self.processor.volatility_forecaster(self.returns, n_days)
+                # The fitted model is cached per (data window, spec) by the shared processor,
+                # so moving the slider only re-runs the forecast
+                ticker = st.session_state["stock_request"][0]
+                volatility = self.processor.volatility_forecaster(
+                    self.returns, n_days, ticker=ticker
+                )
 
                 # If annualization is selected, scale daily volatility using sqrt(252)
                 if annualized:
@@ -89,16 +118,18 @@ class StockVolatilityApp:
         # === Main App Content ===
         st.title("Alpha Vantage Stock Volatility Forecasting")  # Main title
 
-        if (
-            "df_stock" in st.session_state and not st.session_state["df_stock"].empty
-        ):  # Check if stock data is available
-            self.df_stock = st.session_state["df_stock"]
+        if "stock_request" in st.session_state:  # Check if stock data was requested
+            self.df_stock = fetch_stock_data(*st.session_state["stock_request"])
+            ticker = st.session_state["stock_request"][0]
 
+        if self.df_stock is not None and not self.df_stock.empty:
             # Display stock price data (last 10 records)
             st.subheader("Stock Price Data")
             st.dataframe(self.df_stock.head(10))
 
             # Plot the stock closing price trend using Plotly
+            import plotly.express as px
+
             fig = px.line(
                 self.df_stock,
                 x=self.df_stock.index,
@@ -0,0 +1,198 @@
+# Import necessary libraries
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Append the absolute path of the `src/data` directory to system path
+# This allows importing modules from that directory
+sys.path.append(os.path.abspath("../../src/data"))
+from stock_data_processor import (
+    APIStockProcessor,
+    RateLimitError,
+)  # Import the stock data processor class
+
+# Horizon limits match the "Forecast Days" slider of the Streamlit app
+MAX_HORIZON = 30
+
+
+class ForecastService:
+    """
+    Serves volatility forecasts for the HTTP endpoint.
+
+    Returns are kept for `data_ttl` seconds per ticker, fitted models are reused through
+    the processor's model cache, and identical requests that arrive while one is still
+    being computed wait for that result instead of starting their own download or fit.
+
+    Methods:
+    --------
+    - get_returns: Returns the (cached) daily returns of a ticker.
+    - forecast: Returns the date -> volatility dict for a ticker and horizon.
+    """
+
+    def __init__(self, processor: APIStockProcessor = None, data_ttl: float = 60 * 60):
+        self.processor = processor or APIStockProcessor()
+        self.data_ttl = data_ttl
+        self._returns = {}  # ticker -> (fetched_at, returns)
+        self._inflight = {}  # request key -> Future shared by duplicate requests
+        self._lock = threading.Lock()
+
+    def _coalesce(self, key, func):
+        """Run `func` once for all concurrent callers with the same key."""
+        with self._lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+        return future.result()
+
+    def get_returns(self, ticker: str):
+        """Return the daily returns of a ticker, downloading them at most once per TTL."""
+        with self._lock:
+            cached = self._returns.get(ticker)
+        if cached is not None and time.monotonic() - cached[0] < self.data_ttl:
+            return cached[1]
+
+        def fetch():
+            returns = self.processor.extract_returns(self.processor.get_stock_data(ticker))
+            with self._lock:
+                self._returns[ticker] = (time.monotonic(), returns)
+            return returns
+
+        return self._coalesce(("returns", ticker), fetch)
+
+    def forecast(self, ticker: str, horizon: int, annualized: bool = False) -> dict:
+        """Forecast the daily (or annualized) volatility of a ticker for `horizon` days."""
+        returns = self.get_returns(ticker)
+        volatility = self._coalesce(
+            ("forecast", ticker, horizon),
+            lambda: self.processor.volatility_forecaster(returns, horizon, ticker=ticker),
+        )
+        # If annualization is selected, scale daily volatility using sqrt(252)
+        if annualized:
+            return {date: (vol * (252**0.5)) for date, vol in volatility.items()}
+        return volatility
+
+
+class ForecastRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles `GET /forecast?ticker=MSFT&horizon=10&annualized=true`, `GET /health` and
+    `GET /metrics` (the processor's stage timings and counters in the Prometheus format).
+    """
+
+    service: ForecastService = None  # Set by `build_server`
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send_json(200, {"status": "ok"})
+            return
+        if url.path == "/metrics":
+            body = self.service.processor.metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path != "/forecast":
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+
+        query = parse_qs(url.query)
+        ticker = query.get("ticker", [""])[0].strip().upper()
+        try:
+            horizon = int(query.get("horizon", ["5"])[0])
+        except ValueError:
+            horizon = 0
+        annualized = query.get("annualized", ["false"])[0].lower() in ("1", "true", "yes")
+
+        if not ticker:
+            self._send_json(400, {"error": "The 'ticker' parameter is required."})
+            return
+        if not 1 <= horizon <= MAX_HORIZON:
+            self._send_json(400, {"error": f"'horizon' must be between 1 and {MAX_HORIZON}."})
+            return
+
+        try:
+            volatility = self.service.forecast(ticker, horizon, annualized)
+        except RateLimitError as e:
+            self._send_json(429, {"error": str(e)})
+        except Exception as e:
+            self._send_json(502, {"error": f"Error forecasting volatility: {str(e)}"})
+        else:
+            self._send_json(200, volatility)
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PooledHTTPServer(HTTPServer):
+    """An HTTPServer that handles requests on a fixed-size thread pool."""
+
+    def __init__(self, server_address, handler_class, max_workers: int = 8):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def build_server(host: str, port: int, workers: int, service: ForecastService = None):
+    """Create the forecasting HTTP server (call `serve_forever` on it to start serving)."""
+    handler = type(
+        "BoundForecastRequestHandler",
+        (ForecastRequestHandler,),
+        {"service": service or ForecastService()},
+    )
+    return PooledHTTPServer((host, port), handler, max_workers=workers)
+
+
+# Run the service when the script is executed
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless volatility forecasting service")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = build_server(args.host, args.port, args.workers)
+    print(f"Serving forecasts on http://{args.host}:{args.port}/forecast")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,28 +1,33 @@
 # Import necessary libraries
 import sys
 import matplotlib.pyplot as plt
+import pandas as pd
 from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 sys.path.append("../../src/data")
 # Import API Stock data using the class in the stock_data_processor.py file
 from stock_data_processor import APIStockProcessor
+from volatility_features import VolatilityFeatureEngine
 
 # ----------------------------------------------------------------------------------------------
 # 1. Load the data from the API
 # ----------------------------------------------------------------------------------------------
 # Create an instance of the APIStockProcessor class
-asp = APIStockProcessor()
+# Prices are cached in `data/raw`, so later runs only download the newest bars
+# (pass `offline=True` to run against the cache without an API key)
+asp = APIStockProcessor(cache_dir="../../data/raw")
 
-# Get the stock data for Microsoft (MSFT) using the get_stock_data method
+# Get the stock data for Microsoft (MSFT) and Apple (AAPL) in one batch using the get_many method
 # The outputsize is set to 'full' to return the full-length time series
-df_microsoft = asp.get_stock_data(ticker="MSFT")
+stock_frames = asp.get_many(["MSFT", "AAPL"], outputsize="full")
+
+df_microsoft = stock_frames["MSFT"]
 df_microsoft = df_microsoft.head(2501)  # Limit the number of rows to 2501
 print(df_microsoft.head())
 print("Microsoft Stock Shape", df_microsoft.shape)
 print(df_microsoft.info())
 
-# Get the stock data for Apple (AAPL) using the get_stock_data method
-df_apple = asp.get_stock_data(ticker="AAPL", outputsize="full")
+df_apple = stock_frames["AAPL"]
 df_apple = df_apple.head(2501)  # Limit the number of rows to 2501
 print(df_apple.head())
 print("Apple Stock Shape", df_apple.shape)
@@ -203,8 +208,11 @@ that Apple's stock is riskier than Microsoft's stock over a year, as it has a hi
 # ----------------------------------------------------------------------------------------------
 
 # Calculate the rolling 30-day volatility for Microsoft and Apple to see how they change over time
-rolling_microsoft_volatility = msft_stock_returns.rolling(window=30).std().dropna()
-rolling_apple_volatility = aapl_stock_returns.rolling(window=30).std().dropna()
+# (the feature engine computes every ticker of the returns matrix in one pass)
+returns_matrix = pd.concat({"MSFT": msft_stock_returns, "AAPL": aapl_stock_returns}, axis=1)
+rolling_volatility = VolatilityFeatureEngine(windows=(30,)).rolling_volatility(returns_matrix)[30]
+rolling_microsoft_volatility = rolling_volatility["MSFT"].dropna()
+rolling_apple_volatility = rolling_volatility["AAPL"].dropna()
 
 # Print the rolling 30-day volatility for Microsoft and Apple
 print(rolling_microsoft_volatility.head())
@@ -309,6 +317,9 @@ of the volatility patterns.
 """
 # ----------------------------------------------------------------------------------------------
 
+# The squared-return autocorrelations of both tickers, computed in one FFT pass
+print(VolatilityFeatureEngine().squared_return_acf(returns_matrix, nlags=10))
+
 # Create an ACF plot for the squared returns of Microsoft and Apple to determine the ideal number
 # of lags for the ARCH model
 # Create a figure and axis with a dark background
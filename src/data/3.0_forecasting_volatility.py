@@ -8,12 +8,19 @@ from arch import arch_model
 sys.path.append("../../src/data")
 # Import API Stock data using the class in the stock_data_processor.py file
 from stock_data_processor import APIStockProcessor
+from backtest import GarchBacktester
+from evaluation import evaluate_forecasts
+from model_selection import GarchModelSelector
+from dcc_garch import DCCGarch
 
 # ----------------------------------------------------------------------------------------------
 # 1. Use the APIStockProcessor class to prepare the stock for Microsoft
 # ----------------------------------------------------------------------------------------------
 # Create an instance of the APIStockProcessor class
-asp = APIStockProcessor()
+# Prices are cached in `data/raw`, so later runs only download the newest bars
+# (pass `offline=True` to run against the cache without an API key)
+# Fitted models are saved in `models`, so a re-run on unchanged data skips the refits
+asp = APIStockProcessor(cache_dir="../../data/raw", model_dir="../../models")
 
 # Get the stock data for Microsoft (MSFT) using the get_stock_data method
 df_microsoft = asp.get_stock_data(ticker="MSFT")
@@ -155,35 +162,14 @@ forecasted_volatility
 
 # ----------------------------------------------------------------------------------------------
 
-# Model walk-fforward validation forecast on the test set to evaluate the model's performance
-# Create an empty list to store the forecasted volatility
-forecasted_volatility = []
+# Model walk-forward validation forecast on the test set to evaluate the model's performance
 test_size = int(len(msft_stock_returns) * 0.2)
 
-# Iterate over the test set to forecast the volatility
-for i in range(test_size):
-    # Create the test set
-    msft_test = msft_stock_returns.iloc[
-        : -(test_size + i)
-    ]  # The +i includes the current day
-    # Fit the model on the test set
-    model = arch_model(
-        msft_test,
-        p=1,
-        q=1,
-        rescale=False,
-    ).fit(disp=0)
-
-    # Forecast the volatility for the next day
-    forecasted_volatility.append(
-        model.forecast(horizon=1, reindex=False).variance.iloc[0, 0]
-        ** 0.5  # The [0, 0] index is used to extract the forecasted volatility
-    )
-
-# Convert the forecasted volatility to a Series
-forecasted_volatility = pd.Series(
-    forecasted_volatility, index=msft_stock_returns.tail(test_size).index
-)
+# Each test day is forecast from a GARCH(1,1) fitted on all the returns before it.
+# `warm_start` starts every fit from the previous day's parameters, and `refit_every=k`
+# re-estimates only every k days (the variance recursion is updated in between)
+backtester = GarchBacktester(p=1, q=1, refit_every=1, warm_start=True)
+forecasted_volatility = backtester.run(msft_stock_returns, test_size)
 forecasted_volatility.head()
 forecasted_volatility.shape
 
@@ -208,6 +194,45 @@ plt.ylabel("Return")
 plt.legend()
 plt.show()
 
+# Score the walk-forward forecasts against the realized returns: QLIKE and MSE against squared
+# returns, the share of returns inside the ±2 SD band (about 95% if well calibrated) and the
+# Mincer-Zarnowitz regression of squared returns on the forecast variance (alpha=0, beta=1)
+print(evaluate_forecasts(msft_stock_returns, forecasted_volatility.rename("MSFT")).T)
+
+# ----------------------------------------------------------------------------------------------
+
+# Compare GARCH, GJR and EGARCH specs (orders up to (2,2), normal/t/skew-t errors) instead of
+# assuming GARCH(1,1): each spec is fitted on all but the test period and scored by BIC and by
+# the QLIKE of its one-day-ahead forecasts over the test period
+selector = GarchModelSelector(criterion="qlike", test_size=test_size)
+msft_scores = selector.score(msft_stock_returns)
+print(msft_scores[["loglikelihood", "aic", "bic", "qlike", "converged"]].head(10))
+
+# The best spec can be passed straight to the processor's forecaster
+msft_best_spec = selector.best_specs({"MSFT": msft_scores})["MSFT"]
+print(msft_best_spec)
+asp.volatility_forecaster(msft_stock_returns, 10, **msft_best_spec)
+
+# ----------------------------------------------------------------------------------------------
+
+# Portfolio volatility of a 50/50 MSFT/AAPL portfolio: the DCC layer re-uses each stock's own
+# GARCH fit and only models how their correlation moves over time
+aapl_stock_returns = asp.extract_returns(asp.get_stock_data(ticker="AAPL"))
+fits = {
+    "MSFT": asp.fit_model(msft_stock_returns, p=1, q=1, ticker="MSFT"),
+    "AAPL": asp.fit_model(aapl_stock_returns, p=1, q=1, ticker="AAPL"),
+}
+dcc_inputs = DCCGarch.inputs_from_results(fits, horizon=10)
+dcc = DCCGarch().fit(dcc_inputs["std_resid"])
+print(f"DCC a={dcc.a:.4f}, b={dcc.b:.4f}")
+print(dcc.portfolio_volatility(pd.Series({"MSFT": 0.5, "AAPL": 0.5}), dcc_inputs["variances"]))
+
+# Plot the conditional correlation between the two stocks
+fig, ax = plt.subplots(figsize=(15, 6))
+dcc.conditional_correlation([("MSFT", "AAPL")]).plot(ax=ax)
+plt.title("DCC Conditional Correlation - MSFT/AAPL")
+plt.show()
+
 
 # ----------------------------------------------------------------------------------------------
 # 6. Communicate the Results
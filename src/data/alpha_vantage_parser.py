@@ -0,0 +1,176 @@
+# Import necessary libraries
+from __future__ import annotations
+import json
+import re
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first use, to keep this module quick to import
+
+# ----------------------------------------------------------------------------------------------
+# Payload errors
+# ----------------------------------------------------------------------------------------------
+
+
+class RateLimitError(ValueError):
+    """Raised when Alpha Vantage answers with a rate-limit note instead of data."""
+
+
+# "Information" payloads also carry premium-endpoint and API-key messages (e.g.
+# `outputsize=full` on a free key); only these texts are rate limits worth retrying
+RATE_LIMIT_TEXT = re.compile(
+    r"rate limit|call frequency|(calls|requests) per (minute|day)", re.IGNORECASE
+)
+
+
+def check_payload(response_data: dict, ticker: str) -> None:
+    """Raise the matching error for an Alpha Vantage payload that carries no time series."""
+    if "Error Message" in response_data:
+        raise ValueError(f"Error encountered while fetching data: {response_data['Error Message']}")
+    if "Note" in response_data:
+        raise RateLimitError("Rate limit exceeded. Please wait and try again.")
+    if "Information" in response_data:
+        message = str(response_data["Information"])
+        if RATE_LIMIT_TEXT.search(message):
+            raise RateLimitError(f"Rate limit exceeded. Please wait and try again. ({message})")
+        raise ValueError(f"Alpha Vantage refused the request for {ticker}: {message}")
+    if "Time Series (Daily)" not in response_data:
+        raise Exception(f"Invalid API call for {ticker}. Please enter a valid ticker symbol.")
+
+
+# ----------------------------------------------------------------------------------------------
+# TimeSeriesParser Class
+# ----------------------------------------------------------------------------------------------
+
+# One daily bar of a `datatype=json` payload
+JSON_BAR = re.compile(
+    rb'"(\d{4}-\d{2}-\d{2})"\s*:\s*\{\s*'
+    rb'"1\. open"\s*:\s*"([^"]*)"\s*,\s*'
+    rb'"2\. high"\s*:\s*"([^"]*)"\s*,\s*'
+    rb'"3\. low"\s*:\s*"([^"]*)"\s*,\s*'
+    rb'"4\. close"\s*:\s*"([^"]*)"\s*,\s*'
+    rb'"5\. volume"\s*:\s*"([^"]*)"\s*\}'
+)
+# One daily bar (line) of a `datatype=csv` payload
+CSV_BAR = re.compile(rb"^(\d{4}-\d{2}-\d{2}),([^,]*),([^,]*),([^,]*),([^,]*),([^,\r\n]*)\r?$", re.M)
+# The start of every bar, matched or not: bars the patterns above skip (an extra field, a
+# reordered key) are counted against the parsed ones instead of being silently dropped
+JSON_BAR_KEY = re.compile(rb'"(\d{4}-\d{2}-\d{2})"\s*:\s*\{')
+CSV_BAR_KEY = re.compile(rb"^(\d{4}-\d{2}-\d{2}),", re.M)
+
+JSON_MARKER = b'"Time Series (Daily)"'
+CSV_MARKER = b"timestamp,open,high,low,close,volume"
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class TimeSeriesParser:
+    """
+    Parses a `TIME_SERIES_DAILY` payload chunk by chunk into NumPy arrays.
+
+    Complete bars are decoded as soon as they arrive and written into preallocated
+    datetime64/float64/int64 arrays (grown by doubling), so no dict of dicts or
+    string-typed DataFrame is ever built. Both `datatype=json` and `datatype=csv`
+    payloads are supported. Error payloads (which are small JSON documents) are
+    detected at the end and raise the same errors as before.
+
+    Methods:
+    --------
+    - feed: Parses the complete bars in a chunk of bytes.
+    - close: Finishes parsing and returns the DataFrame.
+    """
+
+    def __init__(self, ticker: str, data_type: str = "json", size_hint: int = None):
+        self.ticker = ticker
+        self.pattern = CSV_BAR if data_type == "csv" else JSON_BAR
+        self.key = CSV_BAR_KEY if data_type == "csv" else JSON_BAR_KEY
+        self.marker = CSV_MARKER if data_type == "csv" else JSON_MARKER
+        # About 150 bytes per JSON bar; start small when the size is unknown
+        capacity = max(size_hint // 100, 128) if size_hint else 1024
+        self.dates = np.empty(capacity, dtype="datetime64[D]")
+        self.prices = np.empty((capacity, 4), dtype=np.float64)
+        self.volume = np.empty(capacity, dtype=np.int64)
+        self.n_rows = 0
+        self.buffer = b""  # Bytes of bars that are not complete yet
+        self.head = b""  # Everything before the time series (kept to report errors)
+        self.in_series = False
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.dates)
+        while capacity < needed:
+            capacity *= 2
+        self.dates = np.resize(self.dates, capacity)
+        self.prices = np.resize(self.prices, (capacity, 4))
+        self.volume = np.resize(self.volume, capacity)
+
+    def _check_bars(self, matches: list, end: int) -> None:
+        """Raise if `buffer[:end]` holds bars that are not among the parsed `matches`."""
+        dates = self.key.findall(self.buffer, 0, end)
+        if len(dates) != len(matches):
+            skipped = sorted(set(dates) - {match.group(1) for match in matches})
+            raise ValueError(
+                f"Unexpected bar format in the {self.ticker} time series "
+                f"({len(dates) - len(matches)} bar(s) not parsed: "
+                f"{b', '.join(skipped[:5]).decode()})."
+            )
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the complete bars in `chunk` and keep the incomplete tail for later."""
+        self.buffer += chunk
+        if not self.in_series:
+            position = self.buffer.find(self.marker)
+            if position < 0:
+                # Keep only enough of the buffer to still spot a marker split across chunks
+                self.head += self.buffer[: -len(self.marker)]
+                self.buffer = self.buffer[-len(self.marker) :]
+                return
+            self.head += self.buffer[:position]
+            self.buffer = self.buffer[position + len(self.marker) :]
+            self.in_series = True
+
+        # Only look at complete lines, so a CSV row cut off mid-number is not parsed early
+        end = self.buffer.rfind(b"\n") + 1 if self.pattern is CSV_BAR else len(self.buffer)
+        matches = list(self.pattern.finditer(self.buffer, 0, end))
+        if not matches:
+            return
+        self._check_bars(matches, matches[-1].end())
+        bars = [match.groups() for match in matches]
+        self.buffer = self.buffer[matches[-1].end() :]
+
+        fields = np.array(bars)
+        start, stop = self.n_rows, self.n_rows + len(bars)
+        if stop > len(self.dates):
+            self._grow(stop)
+        self.dates[start:stop] = fields[:, 0].astype("datetime64[D]")
+        self.prices[start:stop] = fields[:, 1:5].astype(np.float64)
+        self.volume[start:stop] = fields[:, 5].astype(np.float64).astype(np.int64)
+        self.n_rows = stop
+
+    def close(self) -> pd.DataFrame:
+        """Return the parsed bars (newest first, as sent) or raise the payload's error."""
+        if self.in_series and self.pattern is CSV_BAR:
+            self.feed(b"\n")  # The last CSV row may not end with a newline
+        if self.in_series:
+            self._check_bars([], len(self.buffer))  # A bad bar after the last parsed one
+        if not self.in_series:
+            text = self.head + self.buffer
+            try:
+                response_data = json.loads(text)
+            except ValueError:
+                response_data = {}
+            check_payload(response_data, self.ticker)
+
+        import pandas as pd
+
+        index = pd.DatetimeIndex(self.dates[: self.n_rows].astype("datetime64[ns]"), name="date")
+        df_stock = pd.DataFrame(self.prices[: self.n_rows], index=index, columns=COLUMNS[:4])
+        df_stock["volume"] = self.volume[: self.n_rows]
+        return df_stock
+
+
+def parse_time_series(chunks, ticker: str, data_type: str = "json", size_hint: int = None) -> pd.DataFrame:
+    """Parse an iterable of byte chunks (e.g. `response.iter_content()`) into a DataFrame."""
+    parser = TimeSeriesParser(ticker, data_type, size_hint)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
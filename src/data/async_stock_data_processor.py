@@ -0,0 +1,232 @@
+# Import necessary libraries
+import asyncio
+import functools
+import logging
+import time
+import aiohttp
+import pandas as pd
+
+from alpha_vantage_parser import RateLimitError, TimeSeriesParser
+from stock_data_processor import ALPHA_VANTAGE_URL, APIStockProcessor
+from transport import RETRY_STATUSES, HTTPTransport
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------------------------------------
+# AsyncAPIStockProcessor Class
+# ----------------------------------------------------------------------------------------------
+
+
+class AsyncAPIStockProcessor:
+    """
+    An asyncio version of `APIStockProcessor` with the same methods, all awaitable.
+
+    Downloads go through one pooled `aiohttp` client session, and the GARCH fits run in an
+    executor, so a single event loop can overlap many ticker downloads with model fitting.
+    Parsing, the price cache, the rate limits and the metrics registry are shared with
+    `APIStockProcessor`.
+
+    Use it as an async context manager (or call `close`) to release the connection pool.
+
+    Methods:
+    --------
+    - get_stock_data: Fetches stock data from the AlphaVantage API (or the local price cache).
+    - get_many: Fetches several tickers concurrently within the API rate limits.
+    - extract_returns: Computes daily returns and limits the dataset.
+    - extract_returns_matrix: Computes the daily returns of several tickers.
+    - close_matrix: Aligns the closing prices of several tickers.
+    - fit_model: Fits a GARCH model in the executor.
+    - volatility_path: Forecasts the daily volatility path in the executor.
+    - volatility_forecaster: Forecasts stock volatility using a GARCH model in the executor.
+    - simulation_forecast: Simulates forecast volatility quantiles in the executor.
+    """
+
+    def __init__(
+        self,
+        api_key=None,
+        cache_dir=None,
+        offline=False,
+        requests_per_minute=5,
+        requests_per_day=None,
+        base_url=ALPHA_VANTAGE_URL,
+        max_connections: int = 20,
+        executor=None,
+        transport: HTTPTransport = None,
+        model_dir=None,
+    ):
+        # Synchronous processor used for URL building, parsing, caching and fitting
+        self.processor = APIStockProcessor(
+            api_key=api_key,
+            cache_dir=cache_dir,
+            offline=offline,
+            requests_per_minute=requests_per_minute,
+            requests_per_day=requests_per_day,
+            base_url=base_url,
+            transport=transport,
+            model_dir=model_dir,
+        )
+        # Timeouts, retries, backoff and compression follow the processor's transport
+        self.transport = self.processor.transport
+        self.max_connections = max_connections
+        self.executor = executor  # None uses the event loop's default thread pool
+        self.session = None  # Created lazily so it is bound to the running event loop
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connect_timeout, read_timeout = self.transport.timeout
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                headers=self.transport.headers,
+            )
+        return self.session
+
+    async def _run_in_executor(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def get_stock_data(
+        self,
+        ticker: str,
+        outputsize: str = "full",
+        data_type: str = "json",
+        limit: int = None,
+    ) -> pd.DataFrame:
+        """Fetch stock data from Alpha Vantage API (see `APIStockProcessor.get_stock_data`)."""
+        processor = self.processor
+        with processor.metrics.timed("get_stock_data", ticker=ticker):
+            if processor.cache is None:
+                df_stock = await self._fetch_stock_data(ticker, outputsize, data_type)
+            else:
+                # The cache policy is the synchronous processor's; only the download differs
+                with processor.metrics.timed("price_cache_load", ticker=ticker):
+                    df_cached = await self._run_in_executor(processor.cache.load, ticker)
+                fetch_size = processor._cache_fetch_size(ticker, outputsize, df_cached)
+                if fetch_size is None:
+                    df_stock = processor._cache_offline(outputsize, df_cached)
+                else:
+                    df_new = await self._fetch_stock_data(ticker, fetch_size, data_type)
+                    df_stock = await self._run_in_executor(
+                        processor._cache_update, ticker, outputsize, fetch_size, df_new, df_cached
+                    )
+
+        if limit:
+            df_stock = df_stock.head(limit)
+
+        return df_stock
+
+    async def get_many(
+        self,
+        tickers: list,
+        outputsize: str = "full",
+        data_type: str = "json",
+        limit: int = None,
+        return_exceptions: bool = False,
+    ) -> dict:
+        """Fetch several tickers concurrently (see `APIStockProcessor.get_many`)."""
+        results = await asyncio.gather(
+            *(self.get_stock_data(ticker, outputsize, data_type, limit) for ticker in tickers),
+            return_exceptions=return_exceptions,
+        )
+        return dict(zip(tickers, results))
+
+    async def _fetch_stock_data(
+        self, ticker: str, outputsize: str, data_type: str
+    ) -> pd.DataFrame:
+        """
+        Download the daily time series for a ticker and parse it while it streams in.
+
+        Connection errors, timeouts, 5xx/429 responses and rate-limit notes are retried
+        with the transport's exponential backoff.
+        """
+        url = self.processor._build_url(ticker, outputsize, data_type)
+
+        logger.debug("Fetching %s (outputsize=%s, datatype=%s, async)", ticker, outputsize, data_type)
+        for attempt in range(self.transport.max_retries + 1):
+            try:
+                return await self._download(url, ticker, data_type)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == self.transport.max_retries:
+                    raise
+            except RateLimitError:
+                if attempt == self.transport.max_retries:
+                    raise
+                self.processor.rate_limiter.drain()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.transport.max_retries:
+                    raise
+            delay = self.transport.backoff(attempt)
+            logger.warning("Retrying %s in %.1fs", ticker, delay)
+            self.processor.metrics.increment("fetch_retries_total", ticker=ticker)
+            await asyncio.sleep(delay)
+
+    async def _download(self, url: str, ticker: str, data_type: str) -> pd.DataFrame:
+        """One rate-limited request, parsed while the response streams in."""
+        metrics = self.processor.metrics
+
+        wait = self.processor.rate_limiter.reserve()
+        metrics.observe("rate_limit_wait", max(wait, 0.0), ticker=ticker)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        start = time.perf_counter()
+        async with self._get_session().get(url) as response:
+            metrics.observe("network", time.perf_counter() - start, ticker=ticker)
+            response.raise_for_status()
+            parser = TimeSeriesParser(ticker, data_type, self.processor._size_hint(response.headers))
+            with metrics.timed("download_parse", ticker=ticker):
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    metrics.increment("bytes_downloaded_total", len(chunk), ticker=ticker)
+                    parser.feed(chunk)
+                df_stock = parser.close()
+
+        metrics.increment("rows_parsed_total", len(df_stock), ticker=ticker)
+        return df_stock
+
+    # The remaining methods forward every argument, so they keep the same signatures as
+    # `APIStockProcessor`; model fitting and simulation run in the executor
+
+    async def extract_returns(self, df: pd.DataFrame, *args, **kwargs):
+        return self.processor.extract_returns(df, *args, **kwargs)
+
+    async def extract_returns_matrix(self, close_prices: pd.DataFrame, *args, **kwargs):
+        return self.processor.extract_returns_matrix(close_prices, *args, **kwargs)
+
+    async def close_matrix(self, stock_frames: dict) -> pd.DataFrame:
+        return self.processor.close_matrix(stock_frames)
+
+    async def fit_model(self, stock_data: pd.Series, *args, **kwargs):
+        return await self._run_in_executor(
+            functools.partial(self.processor.fit_model, stock_data, *args, **kwargs)
+        )
+
+    async def volatility_path(self, stock_data: pd.Series, n_days: int, *args, **kwargs):
+        return await self._run_in_executor(
+            functools.partial(self.processor.volatility_path, stock_data, n_days, *args, **kwargs)
+        )
+
+    async def volatility_forecaster(self, stock_data: pd.Series, n_days: int, *args, **kwargs):
+        return await self._run_in_executor(
+            functools.partial(
+                self.processor.volatility_forecaster, stock_data, n_days, *args, **kwargs
+            )
+        )
+
+    async def simulation_forecast(self, stock_data: pd.Series, n_days: int, *args, **kwargs):
+        return await self._run_in_executor(
+            functools.partial(
+                self.processor.simulation_forecast, stock_data, n_days, *args, **kwargs
+            )
+        )
@@ -0,0 +1,85 @@
+# Import necessary libraries
+from arch import arch_model
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------------------------------------------
+# GarchBacktester Class
+# ----------------------------------------------------------------------------------------------
+
+
+class GarchBacktester:
+    """
+    A walk-forward backtest engine for GARCH(p, q) one-day volatility forecasts.
+
+    Every test day is forecast from the returns observed before it (expanding window).
+    The model is re-estimated every `refit_every` days; in between, the variance
+    recursion is advanced with the last fitted parameters, which is much cheaper than
+    a fit. With `warm_start`, each fit starts from the previous fit's parameters.
+
+    With `refit_every=1` and `warm_start=False` the forecasts are exactly those of
+    refitting `arch_model` from scratch on every step.
+
+    Methods:
+    --------
+    - run: Walk-forward forecasts for the last `test_size` returns of a Series.
+    - run_array: Walk-forward forecasts for positions [start, stop) of a returns array.
+    """
+
+    def __init__(self, p: int = 1, q: int = 1, refit_every: int = 1, warm_start: bool = True):
+        if refit_every < 1:
+            raise ValueError("refit_every must be at least 1.")
+        self.p = p
+        self.q = q
+        self.refit_every = refit_every
+        self.warm_start = warm_start
+
+    def run(self, returns: pd.Series, test_size: int) -> pd.Series:
+        """
+        Forecast the volatility of each of the last `test_size` days of `returns`.
+
+        Parameters:
+        returns (pd.Series): A time series of stock returns (in percent).
+        test_size (int): The number of days at the end of the series to forecast.
+
+        Returns:
+        pd.Series: The one-day-ahead volatility forecasts, indexed by the test dates.
+        """
+        values = np.asarray(returns, dtype=float)
+        start = len(values) - test_size
+        forecasts = self.run_array(values, start, len(values))
+        return pd.Series(forecasts, index=returns.index[start:])
+
+    def run_array(self, values: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Forecast the volatility of positions `start` to `stop - 1` of a returns array."""
+        if start <= 0 or stop > len(values):
+            raise ValueError("The forecast range must lie inside the returns array.")
+
+        forecasts = np.empty(stop - start)
+        params = None
+        for i, t in enumerate(range(start, stop)):
+            if i % self.refit_every == 0:
+                # Re-estimate on everything observed before day t
+                result = arch_model(values[:t], p=self.p, q=self.q, rescale=False).fit(
+                    disp="off",
+                    starting_values=params if self.warm_start else None,
+                )
+                params = result.params.values
+                mu, omega = params[0], params[1]
+                alpha = params[2 : 2 + self.p]
+                beta = params[2 + self.p : 2 + self.p + self.q]
+                # Most recent values first, to line up with alpha[0] and beta[0]
+                resid2 = ((values[t - self.p : t] - mu) ** 2)[::-1].copy()
+                sigma2 = (result.conditional_volatility[-self.q :] ** 2)[::-1].copy()
+
+            # One-step-ahead variance from the most recent squared residuals and variances
+            sigma2_next = omega + alpha @ resid2 + beta @ sigma2
+            forecasts[i] = np.sqrt(sigma2_next)
+
+            # Advance the recursion with day t's return before forecasting day t + 1
+            resid2 = np.roll(resid2, 1)
+            resid2[0] = (values[t] - mu) ** 2
+            sigma2 = np.roll(sigma2, 1)
+            sigma2[0] = sigma2_next
+
+        return forecasts
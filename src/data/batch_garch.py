@@ -0,0 +1,311 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+
+from garch_forecast import garch11_variance_path
+
+# ----------------------------------------------------------------------------------------------
+# BatchGarch11 Class
+# ----------------------------------------------------------------------------------------------
+
+# Column names follow `arch_model(...).fit().params` for a constant-mean GARCH(1,1)
+PARAM_NAMES = ["mu", "omega", "alpha[1]", "beta[1]"]
+
+
+def _backcast(resids: np.ndarray) -> float:
+    """Exponentially weighted starting variance, as used by `arch`."""
+    tau = min(75, len(resids))
+    w = 0.94 ** np.arange(tau)
+    return float(np.sum(resids[:tau] ** 2 * (w / w.sum())))
+
+
+def _to_natural(u: np.ndarray):
+    """
+    Map unconstrained parameters (N x 4) to mu, omega, alpha, beta.
+
+    omega = exp(u1), persistence = logistic(u2) and alpha's share of it = logistic(u3),
+    so omega > 0, alpha >= 0, beta >= 0 and alpha + beta < 1 hold for any u.
+    """
+    mu = u[:, 0]
+    omega = np.exp(u[:, 1])
+    persistence = 1.0 / (1.0 + np.exp(-u[:, 2]))
+    share = 1.0 / (1.0 + np.exp(-u[:, 3]))
+    return mu, omega, persistence * share, persistence * (1.0 - share), persistence, share
+
+
+def _to_unconstrained(mu, omega, alpha, beta) -> np.ndarray:
+    persistence = alpha + beta
+    share = alpha / persistence
+    return np.column_stack(
+        [
+            mu,
+            np.log(omega),
+            np.log(persistence / (1.0 - persistence)),
+            np.log(share / (1.0 - share)),
+        ]
+    )
+
+
+class BatchGarch11:
+    """
+    Fits constant-mean GARCH(1,1) models with normal errors to many tickers at once.
+
+    The variance recursion runs for all columns of a (dates x tickers) returns matrix in
+    one pass, and the likelihoods are maximized in lockstep by a BFGS optimizer that is
+    vectorized over tickers. The likelihood, starting variance (backcast) and
+    parameterization follow `arch_model(returns, p=1, q=1, rescale=False)`, so the
+    estimates agree with `arch` within optimizer tolerance.
+
+    Missing values (e.g. before a ticker was listed) are allowed: the recursion of a
+    column starts at its first valid return, and later gaps are skipped in the likelihood.
+
+    Methods:
+    --------
+    - fit: Estimates the parameters for every column of a returns matrix.
+    - conditional_volatility: Returns the fitted conditional volatility matrix.
+    - variance_forecast: Returns the variance forecasts for horizons 1..h per ticker.
+    """
+
+    def __init__(self, max_iter: int = 200, tol: float = 1e-7):
+        self.max_iter = max_iter
+        self.tol = tol
+        self.params = None  # DataFrame of parameters per ticker
+        self.loglikelihood = None  # Series of log-likelihoods per ticker
+        self.converged = None  # Series of convergence flags per ticker
+        self.iterations = 0
+        self.sigma2_next = None  # Next-day variance forecast per ticker
+
+    # ------------------------------------------------------------------------------------------
+    # Likelihood and gradient
+    # ------------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _recursion(u, X, mask, started, backcast, with_grad: bool):
+        """
+        Run the variance recursion for all columns.
+
+        Returns the average negative log-likelihood per column (without the constant),
+        its gradient with respect to the unconstrained parameters, and the variances.
+        """
+        T, N = X.shape
+        mu, omega, alpha, beta, persistence, share = _to_natural(u)
+        eps = X - mu
+        all_valid = mask.all(axis=1)
+
+        sigma2 = np.empty((T, N))
+        e2_prev = backcast.copy()
+        s2_prev = backcast.copy()
+        loss = np.zeros(N)
+        if with_grad:
+            # Derivatives w.r.t. (mu, omega, alpha, beta) of the previous eps^2 and sigma^2
+            de2_prev = np.zeros((4, N))
+            ds2_prev = np.zeros((4, N))
+            grad = np.zeros((4, N))
+
+        for t in range(T):
+            s2 = omega + alpha * e2_prev + beta * s2_prev
+            sigma2[t] = s2
+            e2 = eps[t] ** 2
+            if with_grad:
+                ds2 = alpha * de2_prev + beta * ds2_prev
+                ds2[1] += 1.0
+                ds2[2] += e2_prev
+                ds2[3] += s2_prev
+                de2 = np.zeros((4, N))
+                de2[0] = -2.0 * eps[t]
+                weight = 0.5 * (1.0 / s2 - e2 / s2**2)
+
+            if all_valid[t]:
+                loss += 0.5 * (np.log(s2) + e2 / s2)
+                if with_grad:
+                    grad += weight * ds2
+                    grad[0] -= eps[t] / s2
+            else:
+                valid = mask[t]
+                loss += np.where(valid, 0.5 * (np.log(s2) + e2 / s2), 0.0)
+                # A missing return contributes its expected value, sigma^2, to the recursion
+                e2 = np.where(valid, e2, s2)
+                if with_grad:
+                    grad += np.where(valid, weight * ds2, 0.0)
+                    grad[0] -= np.where(valid, eps[t] / s2, 0.0)
+                    de2 = np.where(valid, de2, ds2)
+                # Columns that have not started yet stay at the backcast
+                e2 = np.where(started[t], e2, backcast)
+                s2 = np.where(started[t], s2, backcast)
+                if with_grad:
+                    de2 = np.where(started[t], de2, 0.0)
+                    ds2 = np.where(started[t], ds2, 0.0)
+
+            e2_prev, s2_prev = e2, s2
+            if with_grad:
+                de2_prev, ds2_prev = de2, ds2
+
+        n_obs = mask.sum(axis=0)
+        loss = loss / n_obs
+        if not with_grad:
+            return loss, None, sigma2
+
+        # Chain rule from (mu, omega, alpha, beta) to the unconstrained parameters
+        grad = grad / n_obs
+        grad_u = np.empty((N, 4))
+        grad_u[:, 0] = grad[0]
+        grad_u[:, 1] = grad[1] * omega
+        d_persistence = grad[2] * share + grad[3] * (1.0 - share)
+        d_share = (grad[2] - grad[3]) * persistence
+        grad_u[:, 2] = d_persistence * persistence * (1.0 - persistence)
+        grad_u[:, 3] = d_share * share * (1.0 - share)
+        return loss, grad_u, sigma2
+
+    # ------------------------------------------------------------------------------------------
+    # Estimation
+    # ------------------------------------------------------------------------------------------
+
+    def _starting_values(self, X, mask, started, backcast, mean, variance):
+        """Pick the best of a small grid of starting values per column, like `arch` does."""
+        best_u, best_loss = None, None
+        for alpha in (0.01, 0.05, 0.1, 0.2):
+            for persistence in (0.5, 0.9, 0.99):
+                beta = persistence - alpha
+                if beta <= 0:
+                    continue
+                omega = variance * (1.0 - persistence)
+                u = _to_unconstrained(
+                    mean, omega, np.full_like(mean, alpha), np.full_like(mean, beta)
+                )
+                loss, _, _ = self._recursion(u, X, mask, started, backcast, False)
+                if best_u is None:
+                    best_u, best_loss = u, loss
+                else:
+                    better = loss < best_loss
+                    best_u = np.where(better[:, None], u, best_u)
+                    best_loss = np.where(better, loss, best_loss)
+        return best_u
+
+    def fit(self, returns) -> "BatchGarch11":
+        """
+        Estimate GARCH(1,1) parameters for every column of a returns matrix.
+
+        Parameters:
+        returns (pd.DataFrame or np.ndarray): Returns (in percent), dates x tickers.
+
+        Returns:
+        BatchGarch11: The fitted estimator (see `params`, `loglikelihood`, `converged`).
+        """
+        if isinstance(returns, pd.DataFrame):
+            index, columns = returns.index, returns.columns
+        else:
+            index, columns = None, None
+        X = np.asarray(returns, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError("returns must be a 2-D (dates x tickers) matrix.")
+        T, N = X.shape
+        columns = columns if columns is not None else pd.RangeIndex(N)
+
+        mask = ~np.isnan(X)
+        if (mask.sum(axis=0) < 2).any():
+            raise ValueError("Every column needs at least two returns.")
+        first_valid = mask.argmax(axis=0)
+        started = np.arange(T)[:, None] >= first_valid[None, :]
+        X = np.where(mask, X, 0.0)
+
+        mean = np.nanmean(np.where(mask, X, np.nan), axis=0)
+        variance = np.nanvar(np.where(mask, X, np.nan), axis=0)
+        backcast = np.array(
+            [_backcast(X[mask[:, i], i] - mean[i]) for i in range(N)]
+        )
+
+        u = self._starting_values(X, mask, started, backcast, mean, variance)
+        loss, grad, _ = self._recursion(u, X, mask, started, backcast, True)
+
+        # Lockstep BFGS on the unconstrained parameters, one 4x4 inverse Hessian per column
+        H = np.tile(np.eye(4), (N, 1, 1))
+        converged = np.abs(grad).max(axis=1) < self.tol
+        iteration = 0
+        while iteration < self.max_iter and not converged.all():
+            iteration += 1
+            active = np.flatnonzero(~converged)
+            Xa, ma, sa, ba = X[:, active], mask[:, active], started[:, active], backcast[active]
+            ua, fa, ga, Ha = u[active], loss[active], grad[active], H[active]
+
+            direction = -np.einsum("nij,nj->ni", Ha, ga)
+            slope = (direction * ga).sum(axis=1)
+            # Fall back to steepest descent where the BFGS direction is not a descent direction
+            reset = slope >= 0
+            if reset.any():
+                Ha[reset] = np.eye(4)
+                direction[reset] = -ga[reset]
+                slope[reset] = -(ga[reset] ** 2).sum(axis=1)
+
+            # Backtracking line search (Armijo) for all active columns together
+            step = np.ones(len(active))
+            u_new = ua + direction
+            f_new, _, _ = self._recursion(u_new, Xa, ma, sa, ba, False)
+            for _ in range(30):
+                failed = ~(f_new <= fa + 1e-4 * step * slope)
+                if not failed.any():
+                    break
+                step[failed] *= 0.5
+                u_new[failed] = ua[failed] + step[failed, None] * direction[failed]
+                f_failed, _, _ = self._recursion(
+                    u_new[failed], Xa[:, failed], ma[:, failed], sa[:, failed], ba[failed], False
+                )
+                f_new[failed] = f_failed
+            f_new, g_new, _ = self._recursion(u_new, Xa, ma, sa, ba, True)
+
+            # BFGS update of the inverse Hessians
+            s = u_new - ua
+            y = g_new - ga
+            sy = (s * y).sum(axis=1)
+            update = sy > 1e-12
+            rho = np.where(update, 1.0 / np.where(update, sy, 1.0), 0.0)
+            eye = np.eye(4)[None]
+            left = eye - rho[:, None, None] * np.einsum("ni,nj->nij", s, y)
+            H_new = np.einsum("nij,njk,nlk->nil", left, Ha, left) + rho[:, None, None] * np.einsum(
+                "ni,nj->nij", s, s
+            )
+            H[active] = np.where(update[:, None, None], H_new, Ha)
+
+            done = (np.abs(g_new).max(axis=1) < self.tol) | (np.abs(fa - f_new) < 1e-14)
+            u[active], loss[active], grad[active] = u_new, f_new, g_new
+            converged[active] = done
+
+        loss, _, sigma2 = self._recursion(u, X, mask, started, backcast, False)
+        mu, omega, alpha, beta, _, _ = _to_natural(u)
+        n_obs = mask.sum(axis=0)
+
+        # Next-day variance from the last return (its expected value if it is missing)
+        last_e2 = np.where(mask[-1], (X[-1] - mu) ** 2, sigma2[-1])
+        sigma2_next = omega + alpha * last_e2 + beta * sigma2[-1]
+
+        self.iterations = iteration
+        self.params = pd.DataFrame(
+            np.column_stack([mu, omega, alpha, beta]), index=columns, columns=PARAM_NAMES
+        )
+        self.loglikelihood = pd.Series(
+            -n_obs * (loss + 0.5 * np.log(2 * np.pi)), index=columns, name="loglikelihood"
+        )
+        self.converged = pd.Series(converged, index=columns, name="converged")
+        self.sigma2_next = pd.Series(sigma2_next, index=columns, name="sigma2_next")
+        sigma2[~started] = np.nan
+        self._conditional_volatility = pd.DataFrame(
+            np.sqrt(sigma2), index=index, columns=columns
+        )
+        return self
+
+    def conditional_volatility(self) -> pd.DataFrame:
+        """Return the fitted conditional volatility (dates x tickers)."""
+        if self.params is None:
+            raise ValueError("The model has not been fitted yet.")
+        return self._conditional_volatility
+
+    def variance_forecast(self, horizon: int) -> np.ndarray:
+        """Return the variance forecasts for horizons 1..`horizon` as a (tickers x horizon) array."""
+        if self.params is None:
+            raise ValueError("The model has not been fitted yet.")
+        return garch11_variance_path(
+            self.params["omega"].values,
+            self.params["alpha[1]"].values,
+            self.params["beta[1]"].values,
+            self.sigma2_next.values,
+            horizon,
+        )
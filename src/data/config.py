@@ -1,14 +1,18 @@
 """This module extracts information from the `.env` file so that
 AlphaVantage API key can be used in other parts of the project.
+
+Nothing is read or validated at import time: `get_settings()` (or `config.settings`)
+loads the `.env` file and builds the `Settings` on first use, so modules that never
+need the key import this one without an API key.
 """
 
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+import functools
 import os
 
 
 env_path = os.path.join(os.path.dirname(__file__), ".env")
-load_dotenv(env_path)
 
 
 class Settings(BaseSettings):
@@ -20,8 +24,8 @@ class Settings(BaseSettings):
         alpha_api_key (str): API key for Alpha Vantage.
     The configuration is loaded from a .env file specified in the inner Config class.
     Example:
-        To use the settings, create an instance of the Settings class:
-        settings = Settings()
+        To use the settings, get the shared instance:
+        settings = get_settings()
         print(settings.alpha_api_key)
     """
 
@@ -33,5 +37,15 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-# Create instance of `Settings` class that will be imported
-settings = Settings()
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load the `.env` file and return the project `Settings`, built once on first use."""
+    load_dotenv(env_path)
+    return Settings()
+
+
+def __getattr__(name: str):
+    """Build `settings` lazily, so `from config import settings` keeps working."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
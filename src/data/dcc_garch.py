@@ -0,0 +1,262 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+
+from simulation import variance_path
+
+# ----------------------------------------------------------------------------------------------
+# DCC recursion helpers
+# ----------------------------------------------------------------------------------------------
+
+
+def _normalize(q: np.ndarray) -> np.ndarray:
+    """Correlation matrix R = diag(Q)^-1/2 Q diag(Q)^-1/2 of a (..., N, N) array."""
+    scale = 1.0 / np.sqrt(np.diagonal(q, axis1=-2, axis2=-1))
+    return q * scale[..., :, None] * scale[..., None, :]
+
+
+def _q_paths(products: np.ndarray, targets: np.ndarray, a: float, b: float) -> np.ndarray:
+    """
+    Paths of selected elements of Q_t for every date, as one linear filter pass.
+
+    Each element follows q_t = (1 - a - b) s + a x_{t-1} + b q_{t-1}, started at q_1 = s,
+    where x is the product z_i z_j of the element's standardized residuals.
+
+    Parameters:
+    products (np.ndarray): x for each element, shape (T, K).
+    targets (np.ndarray): s for each element, shape (K,).
+
+    Returns:
+    np.ndarray: q for each date and element, shape (T, K).
+    """
+    inputs = np.empty_like(products)
+    inputs[0] = targets
+    np.multiply(products[:-1], a, out=inputs[1:])
+    inputs[1:] += (1.0 - a - b) * targets
+    return lfilter([1.0], [1.0, -b], inputs, axis=0)
+
+
+# ----------------------------------------------------------------------------------------------
+# DCCGarch Class
+# ----------------------------------------------------------------------------------------------
+
+
+class DCCGarch:
+    """
+    Engle's DCC(1,1) dynamic conditional correlations on top of univariate GARCH fits.
+
+    The volatility of each name comes from its own fit (`fit_model` results or a
+    `BatchGarch11`); only their standardized residuals z enter the correlation layer
+    Q_t = (1 - a - b) S + a z_{t-1} z_{t-1}' + b Q_{t-1}, R_t = diag(Q_t)^-1/2 Q_t diag(Q_t)^-1/2,
+    with S the sample correlation of z (correlation targeting).
+
+    - (a, b) maximize the composite likelihood of the contiguous pairs (1, 2), (2, 3), ...
+      (the full likelihood for two names). Every pair's Q path is one linear filter over
+      dates, so an evaluation costs O(T·N) and needs no N x N inversions.
+    - The next-day Q is an exponentially weighted sum of the z z' products, computed as
+      one matrix product: no T x N x N history is ever stored.
+    - Multi-step correlations revert to S at rate a + b (Engle & Sheppard), and the
+      covariances combine them with each name's variance forecasts.
+
+    Methods:
+    --------
+    - fit: Estimates (a, b) and the next-day correlation matrix.
+    - forecast_correlation: Correlation matrices for days 1..H.
+    - forecast_covariance: Covariance matrices for days 1..H.
+    - portfolio_volatility: Daily and cumulative volatility of a portfolio for days 1..H.
+    - conditional_correlation: In-sample correlation path of selected pairs.
+    - inputs_from_results: Builds the inputs from fitted `arch_model` results.
+    - inputs_from_batch: Builds the inputs from a fitted `BatchGarch11`.
+    """
+
+    def __init__(self, max_iter: int = 200):
+        self.max_iter = max_iter
+        self.tickers = None
+        self.a = None
+        self.b = None
+
+    def _pair_indices(self, n: int):
+        return np.arange(n - 1), np.arange(1, n)
+
+    def _negative_loglik(self, params, products, targets, left, right) -> float:
+        """Negative composite log-likelihood of the contiguous pairs (constant terms dropped)."""
+        persistence, share = params
+        a, b = persistence * share, persistence * (1.0 - share)
+        n = len(left) + 1
+        q = _q_paths(products, targets, a, b)
+        rho = q[:, n:] / np.sqrt(q[:, left] * q[:, right])
+        one_minus = np.maximum(1.0 - rho**2, 1e-12)
+        squares = products[:, left] + products[:, right]
+        quad = (squares - 2.0 * rho * products[:, n:]) / one_minus
+        return 0.5 * float(np.sum(np.log(one_minus) + quad))
+
+    def fit(self, std_resid: pd.DataFrame) -> "DCCGarch":
+        """
+        Estimate the correlation layer from the names' standardized residuals.
+
+        Parameters:
+        std_resid (pd.DataFrame): Dates x tickers standardized residuals (residual over
+        conditional volatility). Only dates on which every name has one are used.
+
+        Returns:
+        DCCGarch: The fitted model (self).
+        """
+        std_resid = std_resid.dropna(how="any")
+        if std_resid.shape[1] < 2 or len(std_resid) < 10:
+            raise ValueError("DCC needs at least two names and ten common dates.")
+        z = std_resid.to_numpy(dtype=np.float64)
+        n_obs, n = z.shape
+
+        # Correlation targeting: S is the sample correlation of z
+        target = _normalize(z.T @ z / n_obs)
+        left, right = self._pair_indices(n)
+        targets = np.concatenate([np.ones(n), target[left, right]])
+        # The squares z_i^2 of every name, then the cross products of the pairs
+        products = np.concatenate([z**2, z[:, left] * z[:, right]], axis=1)
+
+        # (a + b, a / (a + b)) keeps the stationarity constraint a box
+        outcome = minimize(
+            self._negative_loglik,
+            x0=np.array([0.97, 0.02 / 0.97]),
+            args=(products, targets, left, right),
+            method="L-BFGS-B",
+            bounds=[(0.0, 0.999), (0.0, 1.0)],
+            options={"maxiter": self.max_iter},
+        )
+        persistence, share = outcome.x
+        self.a, self.b = persistence * share, persistence * (1.0 - share)
+        self.converged = bool(outcome.success)
+        self.loglikelihood = -float(outcome.fun)
+
+        # Q_{T+1} = c S (1 - b^T) / (1 - b) + a sum_t b^(T-t) z_t z_t' + b^T S, with Q_1 = S
+        a, b = self.a, self.b
+        decay = b ** np.arange(n_obs - 1, -1, -1)
+        weighted = z * (a * decay)[:, None]
+        geometric = n_obs if b == 1.0 else (1.0 - b**n_obs) / (1.0 - b)
+        q_next = (1.0 - a - b) * geometric * target + weighted.T @ z + b**n_obs * target
+
+        self.tickers = list(std_resid.columns)
+        self.index = std_resid.index
+        self.target = target
+        self.correlation_next = _normalize(q_next)
+        self._z = z
+        return self
+
+    def _check_fitted(self) -> None:
+        if self.tickers is None:
+            raise ValueError("The model must be fitted first.")
+
+    def forecast_correlation(self, horizon: int) -> np.ndarray:
+        """
+        Correlation matrices for days 1..`horizon`.
+
+        R_{T+h} = (1 - (a + b)^(h-1)) S + (a + b)^(h-1) R_{T+1}.
+
+        Returns:
+        np.ndarray: Shape (horizon, N, N), names in the order of `tickers`.
+        """
+        self._check_fitted()
+        weights = (self.a + self.b) ** np.arange(horizon)
+        return (
+            (1.0 - weights)[:, None, None] * self.target
+            + weights[:, None, None] * self.correlation_next
+        )
+
+    def forecast_covariance(self, variances) -> np.ndarray:
+        """
+        Covariance matrices H_{T+h} = D_h R_{T+h} D_h for days 1..H.
+
+        Parameters:
+        variances (array): Daily variance forecasts of each name, shape (N, H), names in
+        the order of `tickers` (e.g. `inputs_from_results(...)["variances"]`).
+
+        Returns:
+        np.ndarray: Shape (H, N, N). For many names prefer `portfolio_volatility`,
+        which never builds the H matrices.
+        """
+        volatility = np.sqrt(np.asarray(variances, dtype=np.float64)).T
+        correlation = self.forecast_correlation(volatility.shape[0])
+        return correlation * volatility[:, :, None] * volatility[:, None, :]
+
+    def portfolio_volatility(self, weights, variances) -> pd.DataFrame:
+        """
+        Forecast volatility of a portfolio for days 1..H.
+
+        With u_h = D_h w, the daily variance is (1 - (a + b)^(h-1)) u' S u +
+        (a + b)^(h-1) u' R_{T+1} u: two N x N by N x H products for the whole horizon.
+
+        Parameters:
+        weights (pd.Series | array): Portfolio weights, by ticker or in `tickers` order.
+        variances (array): Daily variance forecasts of each name, shape (N, H).
+
+        Returns:
+        pd.DataFrame: One row per day with the daily `volatility` and the
+        `cumulative_volatility` of the return from today to that day (in percent).
+        """
+        self._check_fitted()
+        if isinstance(weights, pd.Series):
+            weights = weights.reindex(self.tickers).fillna(0.0)
+        weights = np.asarray(weights, dtype=np.float64)
+        exposures = weights[:, None] * np.sqrt(np.asarray(variances, dtype=np.float64))
+        reversion = (self.a + self.b) ** np.arange(exposures.shape[1])
+        long_run = np.einsum("nh,nh->h", exposures, self.target @ exposures)
+        next_day = np.einsum("nh,nh->h", exposures, self.correlation_next @ exposures)
+        daily = (1.0 - reversion) * long_run + reversion * next_day
+        return pd.DataFrame(
+            {"volatility": np.sqrt(daily), "cumulative_volatility": np.sqrt(np.cumsum(daily))},
+            index=pd.RangeIndex(1, len(daily) + 1, name="horizon"),
+        )
+
+    def conditional_correlation(self, pairs: list) -> pd.DataFrame:
+        """
+        In-sample conditional correlations of selected pairs, one linear filter pass.
+
+        Parameters:
+        pairs (list): (ticker, ticker) tuples.
+
+        Returns:
+        pd.DataFrame: Dates x pairs, with columns named "A/B".
+        """
+        self._check_fitted()
+        position = {ticker: i for i, ticker in enumerate(self.tickers)}
+        left = np.array([position[x] for x, _ in pairs])
+        right = np.array([position[y] for _, y in pairs])
+        z = self._z
+        q_left = _q_paths(z[:, left] ** 2, np.ones(len(pairs)), self.a, self.b)
+        q_right = _q_paths(z[:, right] ** 2, np.ones(len(pairs)), self.a, self.b)
+        q_pair = _q_paths(z[:, left] * z[:, right], self.target[left, right], self.a, self.b)
+        return pd.DataFrame(
+            q_pair / np.sqrt(q_left * q_right),
+            index=self.index,
+            columns=[f"{x}/{y}" for x, y in pairs],
+        )
+
+    @staticmethod
+    def inputs_from_results(results: dict, horizon: int) -> dict:
+        """
+        Build the inputs from fitted `arch_model` results (e.g. `fit_model` per ticker).
+
+        Returns:
+        dict: `std_resid` (dates x tickers DataFrame, for `fit`) and `variances`
+        (array of shape (N, horizon), for the forecasts).
+        """
+        std_resid = pd.DataFrame(
+            {ticker: result.resid / result.conditional_volatility for ticker, result in results.items()}
+        )
+        variances = np.vstack([variance_path(result, horizon) for result in results.values()])
+        return {"std_resid": std_resid, "variances": variances}
+
+    @staticmethod
+    def inputs_from_batch(batch, returns: pd.DataFrame, horizon: int) -> dict:
+        """
+        Build the inputs from a `BatchGarch11` fitted on `returns`.
+
+        Returns:
+        dict: `std_resid` (dates x tickers DataFrame, for `fit`) and `variances`
+        (array of shape (N, horizon), for the forecasts).
+        """
+        mu = batch.params["mu"].values
+        std_resid = (returns - mu) / batch.conditional_volatility().to_numpy()
+        return {"std_resid": std_resid, "variances": batch.variance_forecast(horizon)}
@@ -0,0 +1,144 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ----------------------------------------------------------------------------------------------
+# Forecast evaluation metrics
+# ----------------------------------------------------------------------------------------------
+
+# All metrics take 2-D arrays of shape (T, K): T forecast dates by K columns, where a
+# column is one forecast path (a ticker, a horizon, a model, ...). They return one value
+# per column and skip NaN pairs, so paths of different lengths can share one array.
+
+
+def _as_2d(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _masked(*arrays):
+    """Broadcast the arrays, zero out every position where any of them is NaN."""
+    arrays = np.broadcast_arrays(*(_as_2d(a) for a in arrays))
+    valid = np.logical_and.reduce([~np.isnan(a) for a in arrays])
+    return [np.where(valid, a, 0.0) for a in arrays], valid, valid.sum(axis=0)
+
+
+def qlike(proxy, variance) -> np.ndarray:
+    """
+    Mean QLIKE loss, log(h) + proxy / h, of variance forecasts h against a variance proxy.
+
+    QLIKE ranks forecasts consistently even with a noisy proxy such as squared returns,
+    and penalizes under-prediction more than over-prediction.
+
+    Parameters:
+    proxy (array): Realized variance proxy (e.g. squared returns), shape (T, K).
+    variance (array): Forecast variances, shape (T, K).
+
+    Returns:
+    np.ndarray: The loss per column, shape (K,).
+    """
+    (proxy, variance), valid, n = _masked(proxy, variance)
+    variance = np.where(valid, variance, 1.0)  # log(1) + 0 / 1 adds nothing
+    return (np.log(variance) + proxy / variance).sum(axis=0) / n
+
+
+def mse(proxy, variance) -> np.ndarray:
+    """Mean squared error of variance forecasts against a variance proxy, per column."""
+    (proxy, variance), _, n = _masked(proxy, variance)
+    return ((proxy - variance) ** 2).sum(axis=0) / n
+
+
+def band_hit_rate(returns, volatility, k: float = 2.0, mean=0.0) -> np.ndarray:
+    """
+    Share of returns inside the mean ± k·σ band of the volatility forecasts, per column.
+
+    For k = 2 a well-calibrated normal model gives about 0.954.
+    """
+    (returns, volatility), valid, n = _masked(returns, volatility)
+    inside = valid & (np.abs(returns - mean) <= k * volatility)
+    return inside.sum(axis=0) / n
+
+
+def mincer_zarnowitz(proxy, variance) -> pd.DataFrame:
+    """
+    Mincer–Zarnowitz regressions proxy = a + b·h + e, one per column, in closed form.
+
+    Unbiased forecasts have a = 0 and b = 1; `pvalue` is the F-test of that joint
+    hypothesis (homoskedastic errors), and `r2` measures how much of the proxy's
+    variation the forecasts explain.
+
+    Returns:
+    pd.DataFrame: One row per column with alpha, beta, r2, f_stat and pvalue.
+    """
+    (y, x), valid, n = _masked(proxy, variance)
+    x_mean = x.sum(axis=0) / n
+    y_mean = y.sum(axis=0) / n
+    dx = np.where(valid, x - x_mean, 0.0)
+    dy = np.where(valid, y - y_mean, 0.0)
+    sxx = (dx**2).sum(axis=0)
+    sxy = (dx * dy).sum(axis=0)
+    syy = (dy**2).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = sxy / sxx
+        alpha = y_mean - beta * x_mean
+        ssr = np.maximum(syy - beta * sxy, 0.0)
+        r2 = 1.0 - ssr / syy
+        sigma2 = ssr / (n - 2)
+
+        # Wald statistic of (a, b) = (0, 1): d' X'X d / (2 s^2), with d = (a, b - 1)
+        da, db = alpha, beta - 1.0
+        sum_x = x.sum(axis=0)
+        sum_x2 = (x**2).sum(axis=0)
+        quad = n * da**2 + 2 * sum_x * da * db + sum_x2 * db**2
+        f_stat = quad / (2 * sigma2)
+    pvalue = stats.f.sf(f_stat, 2, np.maximum(n - 2, 1))
+
+    return pd.DataFrame(
+        {"alpha": alpha, "beta": beta, "r2": r2, "f_stat": f_stat, "pvalue": pvalue}
+    )
+
+
+def evaluate_forecasts(returns, volatility, proxy=None, k: float = 2.0) -> pd.DataFrame:
+    """
+    Score volatility forecasts against the realized returns, one row per column.
+
+    Parameters:
+    returns (pd.DataFrame | array): Realized returns (in percent), dates x paths. A
+    Series or 1-D array is one path.
+    volatility (pd.DataFrame | array): The volatility forecasts for the same dates and
+    paths, e.g. `pd.DataFrame(ParallelBacktestRunner(...).run(...))`.
+    proxy (array): The realized variance proxy; defaults to the squared returns.
+    k (float): The width of the hit-rate band in standard deviations.
+
+    Returns:
+    pd.DataFrame: n, qlike, mse, hit_rate and the Mincer–Zarnowitz columns per path.
+    """
+    index = None
+    if isinstance(volatility, pd.DataFrame):
+        index = volatility.columns
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(index=volatility.index, columns=index)
+    elif isinstance(volatility, pd.Series):
+        index = pd.Index([volatility.name or 0])
+        if isinstance(returns, pd.Series):
+            returns = returns.reindex(volatility.index)
+
+    returns = _as_2d(returns)
+    variance = _as_2d(volatility) ** 2
+    proxy = returns**2 if proxy is None else _as_2d(proxy)
+
+    _, _, n = _masked(proxy, variance)
+    table = pd.DataFrame(
+        {
+            "n": n,
+            "qlike": qlike(proxy, variance),
+            "mse": mse(proxy, variance),
+            "hit_rate": band_hit_rate(returns, np.sqrt(variance), k=k),
+        }
+    )
+    table = pd.concat([table, mincer_zarnowitz(proxy, variance).add_prefix("mz_")], axis=1)
+    if index is not None:
+        table.index = index
+    return table
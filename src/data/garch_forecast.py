@@ -0,0 +1,61 @@
+# Import necessary libraries
+import numpy as np
+
+# ----------------------------------------------------------------------------------------------
+# Closed-form GARCH(1,1) forecasts
+# ----------------------------------------------------------------------------------------------
+
+
+def garch11_state(result) -> dict:
+    """
+    Extract what a GARCH(1,1) forecast needs from a fitted `arch_model` result.
+
+    Returns:
+    dict: mu, omega, alpha, beta and sigma2_next, the variance forecast for the day
+    after the last observation.
+    """
+    params = result.params
+    mu, omega = float(params["mu"]), float(params["omega"])
+    alpha, beta = float(params["alpha[1]"]), float(params["beta[1]"])
+    last_resid = float(np.asarray(result.resid)[-1])
+    last_sigma2 = float(np.asarray(result.conditional_volatility)[-1]) ** 2
+    return {
+        "mu": mu,
+        "omega": omega,
+        "alpha": alpha,
+        "beta": beta,
+        "sigma2_next": omega + alpha * last_resid**2 + beta * last_sigma2,
+    }
+
+
+def garch11_variance_path(omega, alpha, beta, sigma2_next, horizon: int) -> np.ndarray:
+    """
+    Variance forecasts for horizons 1..`horizon` of one or many GARCH(1,1) models.
+
+    sigma2[h] = long_run + (alpha + beta) ** (h - 1) * (sigma2_next - long_run), where
+    long_run = omega / (1 - alpha - beta). With alpha + beta = 1 (IGARCH) the path grows
+    linearly by omega per day instead.
+
+    Parameters:
+    omega, alpha, beta, sigma2_next (float or np.ndarray): Parameters and next-day
+    variance, scalars for one model or arrays of shape (N,) for N models.
+    horizon (int): The number of days to forecast.
+
+    Returns:
+    np.ndarray: Shape (horizon,) for scalar inputs, (N, horizon) for array inputs.
+    """
+    omega, alpha, beta, sigma2_next = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (omega, alpha, beta, sigma2_next))
+    )
+    steps = np.arange(horizon)
+    persistence = (alpha + beta)[..., None]
+    integrated = np.isclose(persistence, 1.0)
+    long_run = omega[..., None] / np.where(integrated, 1.0, 1.0 - persistence)
+    mean_reverting = long_run + persistence**steps * (sigma2_next[..., None] - long_run)
+    linear = sigma2_next[..., None] + steps * omega[..., None]
+    return np.where(integrated, linear, mean_reverting)
+
+
+def garch11_volatility_path(omega, alpha, beta, sigma2_next, horizon: int) -> np.ndarray:
+    """Volatility (square root of `garch11_variance_path`) for horizons 1..`horizon`."""
+    return np.sqrt(garch11_variance_path(omega, alpha, beta, sigma2_next, horizon))
@@ -0,0 +1,134 @@
+# Import necessary libraries
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+# ----------------------------------------------------------------------------------------------
+# MetricsRegistry Class
+# ----------------------------------------------------------------------------------------------
+
+PREFIX = "stock_processor"
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key: tuple) -> str:
+    if not label_key:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in label_key)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(label_key, escaped)) + "}"
+
+
+class MetricsRegistry:
+    """
+    Collects stage timings, counters and gauges for `APIStockProcessor`.
+
+    Every measurement is kept as an aggregate (for `render_prometheus`) and also passed
+    to the registered sinks, which are plain callables receiving one event dict:
+    {"type": "timing" | "counter" | "gauge", "name": ..., "value": ..., "labels": {...}}.
+
+    Methods:
+    --------
+    - timed: Context manager that records how long a stage took.
+    - observe: Records a stage duration in seconds.
+    - increment: Adds to a counter (e.g. bytes downloaded, cache hits).
+    - set_gauge: Sets a gauge (e.g. optimizer iterations of the last fit).
+    - add_sink: Registers a callable that receives every event.
+    - render_prometheus: Returns all metrics in the Prometheus text format.
+    """
+
+    def __init__(self, sinks: list = None):
+        self.sinks = list(sinks or [])
+        self._timings = {}  # (stage, labels) -> [count, sum, max]
+        self._counters = {}  # (name, labels) -> value
+        self._gauges = {}  # (name, labels) -> value
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink) -> None:
+        """Register a callable that receives every metrics event."""
+        self.sinks.append(sink)
+
+    def _emit(self, event_type: str, name: str, value, labels: dict) -> None:
+        event = {"type": event_type, "name": name, "value": value, "labels": labels}
+        for sink in self.sinks:
+            sink(event)
+
+    @contextmanager
+    def timed(self, stage: str, **labels):
+        """Record the duration of the `with` block as `stage` (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def observe(self, stage: str, seconds: float, **labels) -> None:
+        """Record one duration of `stage` in seconds."""
+        key = (stage, _label_key(labels))
+        with self._lock:
+            count_sum_max = self._timings.setdefault(key, [0, 0.0, 0.0])
+            count_sum_max[0] += 1
+            count_sum_max[1] += seconds
+            count_sum_max[2] = max(count_sum_max[2], seconds)
+        self._emit("timing", stage, seconds, labels)
+
+    def increment(self, name: str, amount: float = 1, **labels) -> None:
+        """Add `amount` to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+        self._emit("counter", name, amount, labels)
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to its latest value."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._gauges[key] = value
+        self._emit("gauge", name, value, labels)
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            timings = dict(self._timings)
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        lines = []
+        if timings:
+            name = f"{PREFIX}_stage_duration_seconds"
+            lines.append(f"# HELP {name} Time spent per processing stage.")
+            lines.append(f"# TYPE {name} summary")
+            for (stage, label_key), (count, total, _) in sorted(timings.items()):
+                labels = _format_labels((("stage", stage),) + label_key)
+                lines.append(f"{name}_count{labels} {count}")
+                lines.append(f"{name}_sum{labels} {total:.6f}")
+            max_name = f"{PREFIX}_stage_duration_max_seconds"
+            lines.append(f"# TYPE {max_name} gauge")
+            for (stage, label_key), (_, _, longest) in sorted(timings.items()):
+                labels = _format_labels((("stage", stage),) + label_key)
+                lines.append(f"{max_name}{labels} {longest:.6f}")
+
+        for metrics, metric_type in ((counters, "counter"), (gauges, "gauge")):
+            for metric in sorted({name for name, _ in metrics}):
+                full_name = f"{PREFIX}_{metric}"
+                lines.append(f"# TYPE {full_name} {metric_type}")
+                for (name, label_key), value in sorted(metrics.items()):
+                    if name == metric:
+                        lines.append(f"{full_name}{_format_labels(label_key)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class LoggingSink:
+    """A metrics sink that writes every event to a logger (e.g. for log-based dashboards)."""
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("stock_processor.metrics")
+        self.level = level
+
+    def __call__(self, event: dict) -> None:
+        self.logger.log(
+            self.level, "%s %s=%s %s", event["type"], event["name"], event["value"], event["labels"]
+        )
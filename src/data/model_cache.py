@@ -0,0 +1,128 @@
+# Import necessary libraries
+from __future__ import annotations
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first use, to keep this module quick to import
+
+# ----------------------------------------------------------------------------------------------
+# Data fingerprint
+# ----------------------------------------------------------------------------------------------
+
+
+def fingerprint_returns(returns: pd.Series, **spec) -> str:
+    """
+    Hash a returns Series together with a model spec (e.g. p, q, dist).
+
+    The hash covers the return values, the last date and the spec, so any new bar,
+    revised value or spec change gives a different fingerprint.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(returns.values, dtype=np.float64).tobytes())
+    digest.update(str(returns.index[-1] if len(returns) else "").encode())
+    digest.update(repr(sorted(spec.items())).encode())
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------------------------------
+# ModelCache Class
+# ----------------------------------------------------------------------------------------------
+
+
+class ModelCache:
+    """
+    A thread-safe LRU cache for fitted models with optional time-to-live eviction.
+
+    Methods:
+    --------
+    - get: Returns a cached model or None (counts a hit or a miss).
+    - put: Stores a model, evicting the least recently used one when full.
+    - get_or_create: Returns a cached model or builds it once, even with concurrent callers.
+    - stats: Returns the hit/miss counters and the current size.
+    - clear: Drops every cached model.
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl  # seconds; None keeps entries until they are evicted by size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (created, model)
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock held while that model is built, number of callers]
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, model = entry
+        if self.ttl is not None and time.monotonic() - created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return model
+
+    def get(self, key):
+        """Return the cached model for `key`, or None."""
+        with self._lock:
+            model = self._lookup(key)
+            if model is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return model
+
+    def put(self, key, model) -> None:
+        """Store a model under `key`."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), model)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """
+        Return the cached model for `key`, calling `factory()` to build it on a miss.
+
+        Concurrent callers asking for the same missing key wait for a single build.
+        """
+        model = self.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                # Another caller may have built the model while we were waiting
+                with self._lock:
+                    model = self._lookup(key)
+                if model is None:
+                    model = factory()
+                    self.put(key, model)
+        finally:
+            # The lock is dropped once no caller holds or waits for it, so concurrent
+            # callers always share it, also when a build raises
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+        return model
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the number of cached models."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every cached model (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
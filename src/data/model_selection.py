@@ -0,0 +1,277 @@
+# Import necessary libraries
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from arch import arch_model
+import numpy as np
+import pandas as pd
+
+from evaluation import qlike
+from panel_store import ReturnsPanelStore
+
+# ----------------------------------------------------------------------------------------------
+# Model grid
+# ----------------------------------------------------------------------------------------------
+
+# Volatility families of the grid: (arch `vol`, `o` = number of asymmetric terms)
+VOL_FAMILIES = {"GARCH": ("GARCH", 0), "GJR": ("GARCH", 1), "EGARCH": ("EGARCH", 1)}
+DISTRIBUTIONS = ("normal", "t", "skewt")
+CRITERIA = ("aic", "bic", "qlike")
+
+
+def model_grid(
+    families: tuple = ("GARCH", "GJR", "EGARCH"),
+    max_p: int = 2,
+    max_q: int = 2,
+    dists: tuple = DISTRIBUTIONS,
+) -> list:
+    """
+    Build the list of model specs to search.
+
+    Every spec is a dict of `arch_model` keyword arguments (vol, p, o, q, dist), so it
+    can be passed straight to `arch_model` or `APIStockProcessor.volatility_forecaster`.
+    The specs are ordered so that every spec comes after the simpler spec it is
+    warm-started from (see `_parent`).
+
+    Parameters:
+    families (tuple): Volatility families, any of "GARCH", "GJR" and "EGARCH".
+    max_p (int): The highest ARCH order.
+    max_q (int): The highest GARCH order.
+    dists (tuple): Error distributions, any of "normal", "t" and "skewt".
+
+    Returns:
+    list: The specs as dicts.
+    """
+    specs = []
+    for family in families:
+        vol, o = VOL_FAMILIES[family]
+        orders = sorted(product(range(1, max_p + 1), range(1, max_q + 1)), key=lambda pq: (sum(pq), pq))
+        for (p, q), dist in product(orders, dists):
+            specs.append({"vol": vol, "p": p, "o": o, "q": q, "dist": dist})
+    return specs
+
+
+def spec_name(spec: dict) -> str:
+    """A short label such as `GJR(1,1)-t` for a spec."""
+    family = "GJR" if spec["vol"] == "GARCH" and spec["o"] else spec["vol"]
+    return f"{family}({spec['p']},{spec['q']})-{spec['dist']}"
+
+
+def _parent(spec: dict) -> tuple:
+    """
+    The simpler spec whose fit is a good starting point for `spec`, or None.
+
+    skew-t starts from t, t from normal, higher orders from the next lower order and
+    GJR(1,1) from GARCH(1,1): each spec nests its parent, so the parent's estimates with
+    the new parameters at their neutral values are a valid point of the larger model.
+    """
+    vol, p, o, q, dist = spec["vol"], spec["p"], spec["o"], spec["q"], spec["dist"]
+    if dist == "skewt":
+        return (vol, p, o, q, "t")
+    if dist == "t":
+        return (vol, p, o, q, "normal")
+    if p > 1:
+        return (vol, p - 1, o, q, dist)
+    if q > 1:
+        return (vol, p, o, q - 1, dist)
+    if vol == "GARCH" and o > 0:
+        return (vol, p, 0, q, dist)
+    return None
+
+
+def _starting_values(model, parent_params: pd.Series) -> np.ndarray:
+    """Map a parent fit's estimates onto the parameters of `model`; new ones get neutral values."""
+    names = (
+        model.parameter_names()
+        + model.volatility.parameter_names()
+        + model.distribution.parameter_names()
+    )
+    values = []
+    for name in names:
+        if name in parent_params.index:
+            values.append(parent_params[name])
+        elif name == "eta" and "nu" in parent_params.index:
+            # skew-t degrees of freedom start from the t fit
+            values.append(parent_params["nu"])
+        elif name in ("nu", "eta"):
+            values.append(8.0)
+        else:
+            # Extra lags, asymmetry terms and skewness start at zero
+            values.append(0.0)
+    return np.array(values)
+
+
+# ----------------------------------------------------------------------------------------------
+# GarchModelSelector Class
+# ----------------------------------------------------------------------------------------------
+
+
+def _score_work_unit(selector, values):
+    """Score every spec for one ticker in a worker process."""
+    return selector.score_array(values)
+
+
+def _score_store_unit(selector, store_path, ticker):
+    """Score every spec for one ticker of a `ReturnsPanelStore`, read in the worker."""
+    values = ReturnsPanelStore.open(store_path).returns_array(ticker)
+    return selector.score_array(np.array(values[~np.isnan(values)]))
+
+
+class GarchModelSelector:
+    """
+    Picks the best volatility model per ticker from a grid of GARCH, GJR and EGARCH specs
+    with normal, t and skew-t errors.
+
+    Each spec is fitted on the returns except the last `test_size`, which gives its AIC
+    and BIC; the fitted parameters then filter the held-out returns one day at a time,
+    and the mean QLIKE of those one-day-ahead variance forecasts scores it out of
+    sample. All scores come from the same single fit per spec.
+
+    Specs are fitted in `model_grid` order and every spec starts from the estimates of
+    the simpler spec it nests (e.g. GARCH(1,1)-t from GARCH(1,1)-normal), which cuts
+    the optimizer iterations of most fits. Tickers are independent work units on a
+    process pool.
+
+    Methods:
+    --------
+    - score: Scores every spec for one returns Series.
+    - score_array: Scores every spec for a returns array.
+    - run: Scores every spec for many tickers in parallel.
+    - best_specs: Picks the best spec per ticker from the scores.
+    """
+
+    def __init__(
+        self,
+        specs: list = None,
+        criterion: str = "bic",
+        test_size: int = 250,
+        warm_start: bool = True,
+        max_workers: int = None,
+    ):
+        if criterion not in CRITERIA:
+            raise ValueError(f"criterion must be one of {CRITERIA}.")
+        if criterion == "qlike" and not test_size:
+            raise ValueError("The QLIKE criterion needs a test_size of at least 1.")
+        self.specs = specs or model_grid()
+        self.criterion = criterion
+        self.test_size = test_size or 0
+        self.warm_start = warm_start
+        self.max_workers = max_workers or os.cpu_count()
+
+    def score(self, returns: pd.Series) -> pd.DataFrame:
+        """
+        Fit and score every spec on one ticker's returns.
+
+        Parameters:
+        returns (pd.Series): A time series of stock returns (in percent).
+
+        Returns:
+        pd.DataFrame: One row per spec (indexed by `spec_name`) with the spec, the
+        log-likelihood, AIC, BIC, out-of-sample QLIKE, convergence flag, optimizer
+        iterations and fit time, sorted by the selection criterion.
+        """
+        return self.score_array(np.asarray(returns, dtype=np.float64))
+
+    def score_array(self, values: np.ndarray) -> pd.DataFrame:
+        """Fit and score every spec on a returns array (see `score`)."""
+        split = len(values) - self.test_size
+        if split < 100:
+            raise ValueError("Not enough returns to fit the models before the test period.")
+        realized = values[split:] ** 2
+
+        fits = {}  # (vol, p, o, q, dist) -> params of converged fits
+        rows = []
+        for spec in self.specs:
+            key = (spec["vol"], spec["p"], spec["o"], spec["q"], spec["dist"])
+            model = arch_model(values, rescale=False, **spec)
+            parent = _parent(spec)
+            starting_values = None
+            if self.warm_start and parent in fits:
+                starting_values = _starting_values(model, fits[parent])
+
+            row = dict(spec, loglikelihood=np.nan, aic=np.nan, bic=np.nan, qlike=np.nan)
+            start = time.perf_counter()
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    result = model.fit(
+                        disp=0, last_obs=split, starting_values=starting_values
+                    )
+                converged = result.convergence_flag == 0
+                row.update(
+                    loglikelihood=result.loglikelihood,
+                    aic=result.aic,
+                    bic=result.bic,
+                    converged=converged,
+                    iterations=result.optimization_result.nit,
+                )
+                if self.test_size:
+                    # The forecast made at day t is for day t + 1
+                    variance = result.forecast(horizon=1, start=split - 1, reindex=False).variance
+                    row["qlike"] = float(qlike(realized, variance.values[:-1, 0])[0])
+                if converged:
+                    fits[key] = result.params
+            except Exception:
+                row.update(converged=False, iterations=0)
+            row["seconds"] = time.perf_counter() - start
+            rows.append(row)
+
+        scores = pd.DataFrame(rows, index=[spec_name(spec) for spec in self.specs])
+        return scores.sort_values(self.criterion, kind="stable")
+
+    def run(self, returns_by_ticker) -> dict:
+        """
+        Score every spec for many tickers on a process pool.
+
+        Parameters:
+        returns_by_ticker (dict | ReturnsPanelStore): Ticker -> pd.Series of returns, or a
+        returns panel store, whose workers read their ticker from the memory map.
+
+        Returns:
+        dict: Ticker -> scores DataFrame (see `score`), in the order of the input tickers.
+        """
+        from_store = hasattr(returns_by_ticker, "returns_array")
+        tickers = list(returns_by_ticker.tickers if from_store else returns_by_ticker)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            if from_store:
+                futures = [
+                    executor.submit(_score_store_unit, self, returns_by_ticker.path, ticker)
+                    for ticker in tickers
+                ]
+            else:
+                futures = [
+                    executor.submit(
+                        _score_work_unit,
+                        self,
+                        np.asarray(returns_by_ticker[ticker], dtype=np.float64),
+                    )
+                    for ticker in tickers
+                ]
+            return {ticker: future.result() for ticker, future in zip(tickers, futures)}
+
+    def best_specs(self, scores_by_ticker: dict, criterion: str = None) -> dict:
+        """
+        Pick the spec with the lowest criterion per ticker, among the converged fits.
+
+        Returns:
+        dict: Ticker -> spec dict, ready for `arch_model(returns, **spec)` or
+        `APIStockProcessor.volatility_forecaster(returns, n_days, **spec)`.
+        """
+        criterion = criterion or self.criterion
+        best = {}
+        for ticker, scores in scores_by_ticker.items():
+            candidates = scores[scores["converged"] & scores[criterion].notna()]
+            if candidates.empty:
+                raise ValueError(f"No spec could be fitted for {ticker}.")
+            row = candidates.loc[candidates[criterion].idxmin()]
+            best[ticker] = {
+                "vol": row["vol"],
+                "p": int(row["p"]),
+                "o": int(row["o"]),
+                "q": int(row["q"]),
+                "dist": row["dist"],
+            }
+        return best
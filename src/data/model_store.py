@@ -0,0 +1,141 @@
+# Import necessary libraries
+import datetime
+import json
+import os
+import numpy as np
+
+# ----------------------------------------------------------------------------------------------
+# ModelStore Class
+# ----------------------------------------------------------------------------------------------
+
+# Bumped whenever the snapshot layout changes; snapshots of other versions are ignored
+SNAPSHOT_VERSION = 1
+
+
+class ModelStore:
+    """
+    A class used to store fitted GARCH models on disk as small JSON snapshots, one file per
+    ticker and spec, so a new process can forecast without refitting.
+
+    A snapshot holds the spec, the fitted parameters, the last shocks and conditional
+    variances (most recent first), the next-day variance and the fingerprint of the
+    returns it was fitted on (`model_cache.fingerprint_returns`). `load` only returns a
+    snapshot whose fingerprint matches the current returns, so a new bar or a revised
+    price makes it stale and the model is refitted.
+
+    Loaded snapshots are kept in memory until their file changes, so repeated loads only
+    cost a `stat` call.
+
+    Methods:
+    --------
+    - path: Returns the location of the snapshot file for a ticker and spec.
+    - save: Writes the snapshot of a fitted `arch_model` result.
+    - load: Reads a snapshot, or None if it is missing, of another version or stale.
+    - restore: Rebuilds an `arch_model` result from a snapshot without refitting.
+    """
+
+    def __init__(self, model_dir: str):
+        self.model_dir = model_dir
+        os.makedirs(self.model_dir, exist_ok=True)
+        self._loaded = {}  # path -> (modification time, snapshot)
+
+    def path(self, ticker: str, spec: dict) -> str:
+        """Return the location of the snapshot file for a ticker and spec."""
+        name = "_".join(str(spec[key]) for key in ("vol", "p", "o", "q", "dist"))
+        return os.path.join(self.model_dir, f"{ticker.upper()}_{name}.json")
+
+    def save(self, ticker: str, result, spec: dict, fingerprint: str) -> dict:
+        """
+        Write the snapshot of a fitted `arch_model` result, replacing the file atomically.
+
+        Parameters:
+        ticker (str): The ticker the model was fitted for.
+        result: The fitted `arch_model` result.
+        spec (dict): vol, p, o, q and dist of the model.
+        fingerprint (str): `fingerprint_returns` of the returns and spec.
+
+        Returns:
+        dict: The snapshot.
+        """
+        from simulation import variance_path
+
+        volatility = result.model.volatility
+        resid = np.asarray(result.resid)
+        variance = np.asarray(result.conditional_volatility) ** 2
+        valid = ~np.isnan(resid)
+        n_lags = max(volatility.p, volatility.o, volatility.q, 1)
+        index = result.resid.index
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "ticker": ticker.upper(),
+            "spec": dict(spec),
+            "fingerprint": fingerprint,
+            "n_obs": int(valid.sum()),
+            "last_date": str(index[-1]) if len(index) else None,
+            "params": {name: float(value) for name, value in result.params.items()},
+            "state": {
+                "resid": resid[valid][-n_lags:][::-1].tolist(),
+                "variance": variance[valid][-n_lags:][::-1].tolist(),
+                "sigma2_next": float(variance_path(result, 1)[0]),
+            },
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+
+        path = self.path(ticker, spec)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self._loaded[path] = (os.stat(path).st_mtime_ns, snapshot)
+        return snapshot
+
+    def load(self, ticker: str, spec: dict, fingerprint: str = None) -> dict:
+        """
+        Read the snapshot for a ticker and spec.
+
+        Returns None when there is no snapshot, when it was written by another snapshot
+        version, or when `fingerprint` is given and does not match (stale snapshot).
+        """
+        path = self.path(ticker, spec)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self._loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            snapshot = cached[1]
+        else:
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return None  # Unreadable snapshots are refitted and overwritten
+            self._loaded[path] = (mtime, snapshot)
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        if fingerprint is not None and snapshot.get("fingerprint") != fingerprint:
+            return None
+        return snapshot
+
+    @staticmethod
+    def restore(snapshot: dict, returns):
+        """
+        Rebuild the `arch_model` result of a snapshot on its returns, without refitting.
+
+        The parameters are fixed (`arch_model(...).fix`), so only one pass of the variance
+        recursion is needed; the result forecasts and simulates like a fitted one.
+        """
+        from arch import arch_model
+
+        spec = snapshot["spec"]
+        model = arch_model(
+            returns,
+            vol=spec["vol"],
+            p=spec["p"],
+            o=spec["o"],
+            q=spec["q"],
+            dist=spec["dist"],
+            rescale=False,
+        )
+        return model.fix(np.array(list(snapshot["params"].values())))
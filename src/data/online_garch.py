@@ -0,0 +1,165 @@
+# Import necessary libraries
+import numpy as np
+
+from garch_forecast import garch11_state, garch11_volatility_path
+
+# ----------------------------------------------------------------------------------------------
+# OnlineGarch Class
+# ----------------------------------------------------------------------------------------------
+
+
+class OnlineGarch:
+    """
+    Keeps a fitted GARCH(1,1) up to date one bar at a time, without refitting.
+
+    `update` advances the variance recursion with the new return in O(1) and returns the
+    next-day volatility forecast. The parameters can be scalars (one ticker) or arrays
+    of shape (N,) (a whole book updated with one array of returns).
+
+    A full refit is signalled by `needs_refit` when `refit_every` bars have been added
+    since the fit, or when the drift check fires: under a well-specified model the
+    squared standardized residuals average 1, so a rolling mean over `drift_window`
+    bars further than `drift_threshold` standard errors from 1 means the parameters
+    no longer describe the data.
+
+    Methods:
+    --------
+    - from_result: Builds the state from a fitted `arch_model` result.
+    - from_snapshot: Builds the state from a `ModelStore` snapshot.
+    - from_batch: Builds the state for every ticker of a fitted `BatchGarch11`.
+    - update: Adds a new return and returns the next-day volatility forecast.
+    - forecast: Returns the volatility forecasts for horizons 1..h.
+    - needs_refit: Tells whether the model should be re-estimated.
+    - refit: Takes the parameters of a new fit and restarts the refit and drift checks.
+    """
+
+    def __init__(
+        self,
+        mu,
+        omega,
+        alpha,
+        beta,
+        sigma2_next,
+        refit_every: int = None,
+        drift_window: int = 60,
+        drift_threshold: float = 3.0,
+    ):
+        if drift_window < 1:
+            raise ValueError("drift_window must be at least 1.")
+        self.refit_every = refit_every
+        self.drift_window = drift_window
+        self.drift_threshold = drift_threshold
+        self._set_state(mu, omega, alpha, beta, sigma2_next)
+
+    def _set_state(self, mu, omega, alpha, beta, sigma2_next) -> None:
+        """Set the parameters and next-day variance, and restart the refit and drift checks."""
+        self.mu = np.asarray(mu, dtype=np.float64)
+        self.omega = np.asarray(omega, dtype=np.float64)
+        self.alpha = np.asarray(alpha, dtype=np.float64)
+        self.beta = np.asarray(beta, dtype=np.float64)
+        self.sigma2_next = np.asarray(sigma2_next, dtype=np.float64)
+        self.n_updates = 0
+        # Ring buffer of squared standardized residuals for the drift check
+        self._z2 = np.empty((self.drift_window,) + self.sigma2_next.shape)
+        self._z2_sum = np.zeros(self.sigma2_next.shape)
+
+    @classmethod
+    def from_result(cls, result, **kwargs) -> "OnlineGarch":
+        """Build the online state from a fitted `arch_model(..., p=1, q=1)` result."""
+        state = garch11_state(result)
+        return cls(
+            state["mu"], state["omega"], state["alpha"], state["beta"], state["sigma2_next"], **kwargs
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict, **kwargs) -> "OnlineGarch":
+        """Build the online state from a GARCH(1,1) snapshot of `ModelStore.load`."""
+        spec = snapshot["spec"]
+        if (spec["vol"], spec["p"], spec["o"], spec["q"]) != ("GARCH", 1, 0, 1):
+            raise ValueError("Only GARCH(1,1) snapshots can be updated online.")
+        params = snapshot["params"]
+        return cls(
+            params.get("mu", 0.0),
+            params["omega"],
+            params["alpha[1]"],
+            params["beta[1]"],
+            snapshot["state"]["sigma2_next"],
+            **kwargs,
+        )
+
+    @classmethod
+    def from_batch(cls, batch, **kwargs) -> "OnlineGarch":
+        """Build the online state for all tickers of a fitted `BatchGarch11`."""
+        params = batch.params
+        return cls(
+            params["mu"].values,
+            params["omega"].values,
+            params["alpha[1]"].values,
+            params["beta[1]"].values,
+            batch.sigma2_next.values,
+            **kwargs,
+        )
+
+    @property
+    def next_volatility(self):
+        """The current next-day volatility forecast."""
+        return np.sqrt(self.sigma2_next)
+
+    def update(self, return_t):
+        """
+        Add the latest return (or array of returns) and return the next-day volatility.
+
+        Missing returns (NaN) leave that ticker's variance on its expected path.
+        """
+        return_t = np.asarray(return_t, dtype=np.float64)
+        resid2 = (return_t - self.mu) ** 2
+        missing = np.isnan(resid2)
+        resid2 = np.where(missing, self.sigma2_next, resid2)
+
+        # Drift statistics use the forecast that was made for this bar
+        z2 = resid2 / self.sigma2_next
+        slot = self.n_updates % len(self._z2)
+        if self.n_updates >= len(self._z2):
+            self._z2_sum -= self._z2[slot]
+        self._z2[slot] = z2
+        self._z2_sum += z2
+        self.n_updates += 1
+
+        self.sigma2_next = self.omega + self.alpha * resid2 + self.beta * self.sigma2_next
+        return self.next_volatility
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        """Return the volatility forecasts for horizons 1..`horizon` (see `garch_forecast`)."""
+        return garch11_volatility_path(
+            self.omega, self.alpha, self.beta, self.sigma2_next, horizon
+        )
+
+    def drift_statistic(self):
+        """Distance of the rolling mean of squared standardized residuals from 1, in standard errors."""
+        n = min(self.n_updates, len(self._z2))
+        if n == 0:
+            return np.zeros(self.sigma2_next.shape)
+        # Var(z^2) = 2 for normal innovations
+        return np.abs(self._z2_sum / n - 1.0) / np.sqrt(2.0 / n)
+
+    def needs_refit(self):
+        """True (per ticker) when the refit schedule is due or the drift check fires."""
+        due = self.refit_every is not None and self.n_updates >= self.refit_every
+        window_full = self.n_updates >= len(self._z2)
+        drifted = window_full & (self.drift_statistic() > self.drift_threshold)
+        return np.logical_or(due, drifted)
+
+    def refit(self, fitted) -> None:
+        """
+        Take the parameters and next-day variance of a new fit, e.g. once `needs_refit`
+        fires, and restart the refit schedule and the drift check from it.
+
+        Parameters:
+        fitted: A fitted `arch_model(..., p=1, q=1)` result, or a fitted `BatchGarch11`
+        for a state built with `from_batch`.
+        """
+        if hasattr(fitted, "sigma2_next"):
+            state = self.from_batch(fitted)
+        else:
+            state = self.from_result(fitted)
+        self._set_state(state.mu, state.omega, state.alpha, state.beta, state.sigma2_next)
@@ -0,0 +1,154 @@
+# Import necessary libraries
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------------------------------------------
+# ReturnsPanelStore Class
+# ----------------------------------------------------------------------------------------------
+
+
+class ReturnsPanelStore:
+    """
+    Aligned closing prices and returns for a universe of tickers, stored as memory-mapped
+    (dates x tickers) matrices in a directory.
+
+    Files:
+    - dates.npy: The shared date axis (datetime64[D], oldest first).
+    - tickers.json: The ticker of every column.
+    - close.npy / returns.npy: Prices and daily returns in percent (NaN where missing).
+
+    The matrices are stored column-major, so each ticker's history is one contiguous
+    block: reading a ticker only touches its own pages, and nothing is loaded into RAM
+    until it is used. Several processes can open the same store read-only.
+
+    Methods:
+    --------
+    - create: Creates an empty store for a date axis and a list of tickers.
+    - build: Creates a store from per-ticker price frames (e.g. from `get_many`).
+    - open: Opens an existing store.
+    - write_ticker: Writes one ticker's closing prices and their returns.
+    - close_prices / returns: DataFrame views for some tickers and a date range.
+    - returns_array: The returns of one ticker as a NumPy view.
+    """
+
+    def __init__(self, path: str, dates: np.ndarray, tickers: list, close, returns):
+        self.path = path
+        self.dates = dates
+        self.tickers = tickers
+        self.close_matrix = close
+        self.returns_matrix = returns
+        self._columns = {ticker: i for i, ticker in enumerate(tickers)}
+
+    @classmethod
+    def create(cls, path: str, dates, tickers: list, dtype="float64") -> "ReturnsPanelStore":
+        """Create an empty (all NaN) store with the given date axis and tickers."""
+        os.makedirs(path, exist_ok=True)
+        dates = np.unique(np.asarray(dates, dtype="datetime64[D]"))
+        tickers = list(tickers)
+        np.save(os.path.join(path, "dates.npy"), dates)
+        with open(os.path.join(path, "tickers.json"), "w") as f:
+            json.dump(tickers, f)
+
+        shape = (len(dates), len(tickers))
+        matrices = []
+        for name in ("close", "returns"):
+            matrix = np.lib.format.open_memmap(
+                os.path.join(path, f"{name}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=shape,
+                fortran_order=True,
+            )
+            matrix[:] = np.nan
+            matrices.append(matrix)
+        return cls(path, dates, tickers, *matrices)
+
+    @classmethod
+    def build(cls, path: str, stock_frames: dict, dtype="float64") -> "ReturnsPanelStore":
+        """Create a store from ticker -> price DataFrame (with a `close` column)."""
+        dates = np.unique(
+            np.concatenate(
+                [df.index.values.astype("datetime64[D]") for df in stock_frames.values()]
+            )
+        )
+        store = cls.create(path, dates, list(stock_frames), dtype)
+        for ticker, df in stock_frames.items():
+            store.write_ticker(ticker, df["close"])
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path: str, mode: str = "r") -> "ReturnsPanelStore":
+        """Open an existing store (`mode="r+"` to update it)."""
+        dates = np.load(os.path.join(path, "dates.npy"))
+        with open(os.path.join(path, "tickers.json")) as f:
+            tickers = json.load(f)
+        close = np.load(os.path.join(path, "close.npy"), mmap_mode=mode)
+        returns = np.load(os.path.join(path, "returns.npy"), mmap_mode=mode)
+        return cls(path, dates, tickers, close, returns)
+
+    def write_ticker(self, ticker: str, close: pd.Series) -> None:
+        """
+        Align one ticker's closing prices to the date axis and write prices and returns.
+
+        Every date of `close` must be on the store's date axis: a store built before a
+        new bar arrived needs rebuilding (or a `create` with the longer axis) first.
+        """
+        column = self._columns[ticker]
+        close = close.sort_index()
+        close_dates = close.index.values.astype("datetime64[D]")
+        positions = np.searchsorted(self.dates, close_dates)
+        # searchsorted gives insertion points, so dates off the axis must be caught here
+        off_axis = positions == len(self.dates)
+        off_axis[~off_axis] = self.dates[positions[~off_axis]] != close_dates[~off_axis]
+        if off_axis.any():
+            missing = ", ".join(str(date) for date in close_dates[off_axis][:5])
+            raise ValueError(
+                f"{off_axis.sum()} {ticker} date(s) are not on the store's date axis: {missing}."
+            )
+        prices = np.full(len(self.dates), np.nan)
+        prices[positions] = close.to_numpy(dtype=np.float64)
+
+        # Returns between consecutive available prices, on the date of the later price
+        available = np.flatnonzero(~np.isnan(prices))
+        returns = np.full(len(self.dates), np.nan)
+        returns[available[1:]] = (prices[available[1:]] / prices[available[:-1]] - 1) * 100
+
+        self.close_matrix[:, column] = prices
+        self.returns_matrix[:, column] = returns
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        self.close_matrix.flush()
+        self.returns_matrix.flush()
+
+    def _select(self, matrix, tickers, start, end) -> pd.DataFrame:
+        rows = slice(
+            np.searchsorted(self.dates, np.datetime64(start, "D")) if start is not None else None,
+            np.searchsorted(self.dates, np.datetime64(end, "D"), side="right") if end is not None else None,
+        )
+        if tickers is None:
+            tickers, values = self.tickers, matrix[rows]
+        else:
+            columns = [self._columns[ticker] for ticker in tickers]
+            # A contiguous run of columns stays a view; anything else is gathered
+            if columns == list(range(columns[0], columns[0] + len(columns))):
+                values = matrix[rows, columns[0] : columns[0] + len(columns)]
+            else:
+                values = matrix[rows][:, columns]
+        index = pd.DatetimeIndex(self.dates[rows].astype("datetime64[ns]"), name="date")
+        return pd.DataFrame(values, index=index, columns=list(tickers), copy=False)
+
+    def close_prices(self, tickers: list = None, start=None, end=None) -> pd.DataFrame:
+        """Closing prices for some tickers (default all) between two dates (inclusive)."""
+        return self._select(self.close_matrix, tickers, start, end)
+
+    def returns(self, tickers: list = None, start=None, end=None) -> pd.DataFrame:
+        """Daily returns in percent for some tickers (default all) between two dates (inclusive)."""
+        return self._select(self.returns_matrix, tickers, start, end)
+
+    def returns_array(self, ticker: str) -> np.ndarray:
+        """One ticker's returns as a read-only view of the memory map (NaN where missing)."""
+        return self.returns_matrix[:, self._columns[ticker]]
@@ -0,0 +1,102 @@
+# Import necessary libraries
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+
+from backtest import GarchBacktester
+
+# ----------------------------------------------------------------------------------------------
+# ParallelBacktestRunner Class
+# ----------------------------------------------------------------------------------------------
+
+
+def _run_work_unit(backtester, shm_name, offset, start, stop):
+    """Run one (ticker, fold) work unit in a worker process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray((shm.size // 8,), dtype=np.float64, buffer=shm.buf)
+        # Copy only this ticker's history up to the end of the fold
+        values = np.array(buffer[offset : offset + stop])
+        del buffer
+    finally:
+        shm.close()
+    return backtester.run_array(values, start, stop)
+
+
+class ParallelBacktestRunner:
+    """
+    Runs walk-forward backtests for many tickers on a process pool.
+
+    The test period of every ticker is split into `n_folds` contiguous folds, and each
+    (ticker, fold) pair is an independent work unit. All return arrays are packed into
+    one shared-memory block, so the workers read them without pickling any Series.
+    Results come back in the order of the input tickers, whatever order the work
+    units finish in.
+
+    Methods:
+    --------
+    - run: Backtests every ticker and returns the forecasts per ticker.
+    """
+
+    def __init__(self, backtester: GarchBacktester = None, max_workers: int = None, n_folds: int = 1):
+        self.backtester = backtester or GarchBacktester()
+        self.max_workers = max_workers or os.cpu_count()
+        self.n_folds = n_folds
+
+    def run(self, returns_by_ticker: dict, test_size: int) -> dict:
+        """
+        Forecast the volatility of the last `test_size` days of every ticker.
+
+        Parameters:
+        returns_by_ticker (dict): Ticker -> pd.Series of returns.
+        test_size (int): The number of days at the end of each series to forecast.
+
+        Returns:
+        dict: Ticker -> pd.Series of one-day-ahead volatility forecasts.
+        """
+        if test_size < 1:
+            raise ValueError("test_size must be at least 1.")
+        tickers = list(returns_by_ticker)
+        arrays = [np.asarray(returns_by_ticker[t], dtype=np.float64) for t in tickers]
+        offsets = np.concatenate([[0], np.cumsum([len(a) for a in arrays])])
+
+        shm = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]) * 8, 8))
+        try:
+            buffer = np.ndarray((int(offsets[-1]),), dtype=np.float64, buffer=shm.buf)
+            for array, offset in zip(arrays, offsets):
+                buffer[offset : offset + len(array)] = array
+            del buffer
+
+            # One work unit per (ticker, fold), submitted in a fixed order
+            units = []
+            for i, array in enumerate(arrays):
+                start = len(array) - test_size
+                bounds = np.linspace(start, len(array), self.n_folds + 1).astype(int)
+                for fold_start, fold_stop in zip(bounds[:-1], bounds[1:]):
+                    if fold_stop > fold_start:
+                        units.append((i, int(offsets[i]), int(fold_start), int(fold_stop)))
+
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(_run_work_unit, self.backtester, shm.name, offset, start, stop)
+                    for _, offset, start, stop in units
+                ]
+                fold_results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        forecasts = {ticker: [] for ticker in tickers}
+        for (i, _, _, _), result in zip(units, fold_results):
+            forecasts[tickers[i]].append(result)
+
+        return {
+            ticker: pd.Series(
+                np.concatenate(forecasts[ticker]) if forecasts[ticker] else [],
+                index=returns_by_ticker[ticker].index[-test_size:],
+                dtype=float,
+            )
+            for ticker in tickers
+        }
@@ -0,0 +1,116 @@
+# Import necessary libraries
+from __future__ import annotations
+import os
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first use, to keep this module quick to import
+
+# ----------------------------------------------------------------------------------------------
+# PriceCache Class
+# ----------------------------------------------------------------------------------------------
+
+# Alpha Vantage returns the latest 100 trading days when `outputsize=compact`
+COMPACT_SIZE = 100
+
+
+class PriceCache:
+    """
+    A class used to store fetched daily stock prices on disk, one Parquet file per ticker.
+
+    The frames are stored exactly as `APIStockProcessor.get_stock_data` returns them
+    (newest date first), so a cached frame can be used in place of a fresh download.
+    Each file also records whether it holds the complete history, i.e. whether it was
+    started from an `outputsize=full` download (`DataFrame.attrs`, kept in the Parquet
+    metadata); only then can a full request be served by a compact refresh.
+
+    Methods:
+    --------
+    - load: Reads the cached prices for a ticker, or None if nothing is cached.
+    - save: Writes the prices for a ticker to disk.
+    - merge: Merges freshly fetched bars into the cached history and saves the result.
+    - has_full_history: Checks whether cached prices hold the complete history.
+    - covered_by_compact: Checks whether a compact fetch is enough to bring the cache up to date.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, ticker: str) -> str:
+        """Return the location of the cache file for a ticker."""
+        return os.path.join(self.cache_dir, f"{ticker.upper()}.parquet")
+
+    def load(self, ticker: str) -> pd.DataFrame:
+        """Read the cached prices for a ticker, or return None when there is no cache file."""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        import pandas as pd
+
+        df_stock = pd.read_parquet(path)
+        df_stock.index.name = "date"
+        return df_stock
+
+    def save(self, ticker: str, df_stock: pd.DataFrame, full_history: bool = False) -> None:
+        """Write the prices for a ticker (and whether they are complete), replacing the file atomically."""
+        df_stock.attrs["full_history"] = bool(full_history)
+        path = self.path(ticker)
+        tmp_path = f"{path}.tmp"
+        df_stock.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    def merge(
+        self,
+        ticker: str,
+        df_new: pd.DataFrame,
+        df_cached: pd.DataFrame = None,
+        full_history: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Merge new bars into the cached history (new values win) and save the result.
+
+        `full_history` tells whether `df_new` is a complete download; the merged file
+        holds the complete history if either part does.
+        """
+        if df_cached is None:
+            df_cached = self.load(ticker)
+        full_history = full_history or self.has_full_history(df_cached)
+        if df_cached is not None and not df_cached.empty:
+            import pandas as pd
+
+            df_stock = pd.concat([df_new, df_cached])
+            df_stock = df_stock[~df_stock.index.duplicated(keep="first")]
+        else:
+            df_stock = df_new
+        df_stock = df_stock.sort_index(ascending=False)
+        self.save(ticker, df_stock, full_history)
+        return df_stock
+
+    @staticmethod
+    def has_full_history(df_cached: pd.DataFrame) -> bool:
+        """Check whether cached prices were started from a full download (False for older files)."""
+        return df_cached is not None and bool(df_cached.attrs.get("full_history", False))
+
+    @staticmethod
+    def covered_by_compact(df_cached: pd.DataFrame, today=None) -> bool:
+        """
+        Check whether a compact fetch (latest 100 trading days) brings the cached history
+        up to date.
+
+        The cache must hold the complete history (a cache started from a compact fetch
+        only has 100 bars) and overlap the compact window. Business days are used as an
+        upper bound for trading days, so holidays only make the check more conservative.
+        """
+        if df_cached is None or df_cached.empty or not PriceCache.has_full_history(df_cached):
+            return False
+        import pandas as pd
+
+        today = pd.Timestamp.today() if today is None else pd.Timestamp(today)
+        last_date = df_cached.index.max()
+        gap = np.busday_count(
+            last_date.to_datetime64().astype("datetime64[D]"),
+            today.to_datetime64().astype("datetime64[D]"),
+        )
+        return gap < COMPACT_SIZE
@@ -0,0 +1,81 @@
+# Import necessary libraries
+import threading
+import time
+
+# ----------------------------------------------------------------------------------------------
+# TokenBucket and RateLimiter Classes
+# ----------------------------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that allows `capacity` requests per `period` seconds.
+
+    Tokens are reserved up front, so concurrent callers queue up behind each other
+    instead of all waking up at the same moment when the bucket refills.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period  # tokens added per second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller has to wait before using it."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reported that the quota is used up."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """
+    Throttles requests to the Alpha Vantage per-minute and per-day quotas.
+
+    Either quota can be set to None to disable it.
+
+    Methods:
+    --------
+    - acquire: Blocks until a request is allowed under every quota.
+    - reserve: Reserves a request slot and returns the wait time (for asyncio callers).
+    - drain: Empties the per-minute bucket so that all callers back off together.
+    """
+
+    def __init__(self, requests_per_minute: int = 5, requests_per_day: int = None):
+        self.minute_bucket = (
+            TokenBucket(requests_per_minute, 60.0) if requests_per_minute else None
+        )
+        self.day_bucket = (
+            TokenBucket(requests_per_day, 86400.0) if requests_per_day else None
+        )
+
+    def reserve(self) -> float:
+        """Reserve the next request slot and return the seconds to wait before sending it."""
+        wait = 0.0
+        for bucket in (self.minute_bucket, self.day_bucket):
+            if bucket is not None:
+                wait = max(wait, bucket.reserve())
+        return wait
+
+    def acquire(self) -> None:
+        """Block until the next request fits into both quotas."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def drain(self) -> None:
+        """Make the following requests wait for the per-minute quota to refill."""
+        if self.minute_bucket is not None:
+            self.minute_bucket.drain()
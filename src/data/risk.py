@@ -0,0 +1,357 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.special import gammaln
+
+from simulation import variance_path
+
+# ----------------------------------------------------------------------------------------------
+# Standardized tail quantiles
+# ----------------------------------------------------------------------------------------------
+
+
+def _t_tail(tail: float, nu: np.ndarray):
+    """Quantile and expected shortfall of the unit-variance Student-t for tail probability `tail`."""
+    t_q = stats.t.ppf(tail, nu)
+    scale = np.sqrt((nu - 2) / nu)
+    # E[T | T < t_q] for a standard t
+    shortfall = -(nu + t_q**2) / (nu - 1) * stats.t.pdf(t_q, nu) / tail
+    return t_q * scale, shortfall * scale
+
+
+def standardized_tail(tail: float, nu=np.inf, lam=0.0):
+    """
+    Lower-tail quantile and expected shortfall of the standardized error distribution.
+
+    `nu = inf` is the normal distribution, a finite `nu` the unit-variance Student-t and
+    a non-zero `lam` Hansen's skew-t (`arch`'s "skewt", with eta = nu). The skew-t is a
+    t split at its mode and scaled by (1 - lam) on the left, so its lower tail is a
+    rescaled t tail. All arguments broadcast, so N tickers are one array operation.
+
+    Parameters:
+    tail (float): The tail probability, e.g. 0.01 for a 99% VaR.
+    nu (float or np.ndarray): Degrees of freedom (inf for normal errors).
+    lam (float or np.ndarray): Skew-t asymmetry (0 for symmetric errors).
+
+    Returns:
+    tuple: (quantile, expected shortfall) arrays, both negative numbers.
+    """
+    nu, lam = np.broadcast_arrays(np.asarray(nu, dtype=np.float64), np.asarray(lam, dtype=np.float64))
+    normal = np.isinf(nu)
+    nu_t = np.where(normal, 30.0, nu)  # Placeholder for the normal rows
+
+    # Skew-t constants; a = 0 and b = 1 when lam = 0
+    c = np.exp(gammaln((nu_t + 1) / 2) - gammaln(nu_t / 2)) / np.sqrt(np.pi * (nu_t - 2))
+    a = 4 * lam * c * (nu_t - 2) / (nu_t - 1)
+    b = np.sqrt(1 + 3 * lam**2 - a**2)
+    left_mass = (1 - lam) / 2
+    if np.any(tail >= left_mass):
+        raise ValueError("The tail probability must lie in the left half of the skew-t.")
+    t_quantile, t_shortfall = _t_tail(tail / (1 - lam), nu_t)
+    quantile = ((1 - lam) * t_quantile - a) / b
+    shortfall = ((1 - lam) * t_shortfall - a) / b
+
+    z = stats.norm.ppf(tail)
+    quantile = np.where(normal, z, quantile)
+    shortfall = np.where(normal, -stats.norm.pdf(z) / tail, shortfall)
+    return quantile, shortfall
+
+
+def empirical_tails(std_resid: np.ndarray, tails: tuple) -> list:
+    """
+    Empirical lower-tail quantiles and expected shortfalls of every column (NaNs ignored).
+
+    Only the smallest observations matter, so one `np.partition` moves them to the top
+    of every column and just those rows are sorted, once for all tail probabilities.
+
+    Parameters:
+    std_resid (np.ndarray): Standardized residuals, dates x tickers (NaN padded).
+    tails (tuple): The tail probabilities.
+
+    Returns:
+    list: A (quantile, expected shortfall) pair of arrays of shape (tickers,) per tail.
+    """
+    values = np.where(np.isnan(std_resid), np.inf, std_resid)
+    n = np.isfinite(values).sum(axis=0)
+    # Number of observations in each tail of each column (at least one)
+    ks = [np.maximum(np.floor(tail * n).astype(int), 1) for tail in tails]
+    k_max = int(max(k.max() for k in ks))
+    smallest = np.sort(np.partition(values, k_max - 1, axis=0)[:k_max], axis=0)
+    tail_sums = np.cumsum(np.where(np.isinf(smallest), 0.0, smallest), axis=0)
+
+    result = []
+    for k in ks:
+        rows = (k - 1)[None, :]
+        quantile = np.take_along_axis(smallest, rows, axis=0)[0]
+        shortfall = np.take_along_axis(tail_sums, rows, axis=0)[0] / k
+        result.append((quantile, shortfall))
+    return result
+
+
+def bootstrap_cumulative(std_resid, mu, variances, garch: dict, horizon: int, n_paths: int, rng):
+    """
+    Yield the bootstrapped cumulative returns of every name for days 1..`horizon`.
+
+    Each path resamples the name's own standardized residuals and feeds the shocks back
+    through its GARCH(1,1) or GJR(1,1,1) recursion, so the h-day distribution carries
+    the volatility clustering and leverage of the fitted model rather than the 1-day
+    shape scaled by sqrt(h). All names advance together, one vectorized step per day.
+
+    Parameters:
+    std_resid (np.ndarray): Standardized residuals, dates x N (NaN padded).
+    mu (np.ndarray): Daily mean returns, shape (N,).
+    variances (np.ndarray): Daily variance forecasts, shape (N, H); only day 1 is used.
+    garch (dict): Arrays "omega", "alpha", "beta" and optionally "gamma", shape (N,).
+    horizon (int): The number of days to simulate.
+    n_paths (int): The number of paths per name.
+    rng (np.random.Generator): The random generator.
+
+    Returns:
+    generator: (day, cumulative returns of shape (n_paths, N)) for day = 1..horizon.
+    """
+    # NaNs sort last, so the residuals of every name are the first n of its row; one row
+    # per name keeps each name's draws within a small, cache-resident block
+    pool = np.sort(std_resid.T, axis=1)
+    n_valid = (~np.isnan(pool)).sum(axis=1)
+    offsets = np.arange(len(mu)) * pool.shape[1]
+    pool = pool.ravel()
+    omega = np.asarray(garch["omega"], dtype=np.float64)
+    alpha = np.asarray(garch["alpha"], dtype=np.float64)
+    gamma = np.asarray(garch.get("gamma", 0.0), dtype=np.float64)
+    beta = np.asarray(garch["beta"], dtype=np.float64)
+
+    # The recursion runs in place on preallocated (paths x names) buffers
+    shape = (n_paths, len(mu))
+    sigma2 = np.tile(variances[:, 0], (n_paths, 1))
+    total = np.zeros(shape)
+    draws, shock, squared = np.empty(shape), np.empty(shape), np.empty(shape)
+    for day in range(1, horizon + 1):
+        rng.random(out=draws)
+        draws *= n_valid
+        rows = draws.astype(np.intp)
+        rows += offsets
+        pool.take(rows, out=shock)
+        np.sqrt(sigma2, out=squared)
+        shock *= squared
+        total += shock
+        total += mu
+        yield day, total
+        if day < horizon:
+            np.multiply(shock, shock, out=squared)
+            sigma2 *= beta
+            sigma2 += omega
+            sigma2 += alpha * squared
+            if np.any(gamma):
+                squared *= shock < 0
+                sigma2 += gamma * squared
+
+# ----------------------------------------------------------------------------------------------
+# RiskEngine Class
+# ----------------------------------------------------------------------------------------------
+
+
+class RiskEngine:
+    """
+    Value-at-Risk and Expected Shortfall for a whole book from GARCH forecasts.
+
+    VaR and ES are computed two ways, both as array operations over all names at once:
+    - parametric: the h-day return is the mean times h plus the square root of the summed
+      daily variance forecasts times a shock from the fitted error distribution (normal,
+      t or skew-t).
+    - fhs: filtered historical simulation. The 1-day shock follows the empirical
+      distribution of each name's standardized residuals; longer horizons bootstrap
+      those residuals along `n_paths` GARCH paths per name (`bootstrap_cumulative`),
+      which needs the GARCH parameters of every name.
+
+    Risk figures are positive losses in percent of the position, or in currency when
+    exposures are given.
+
+    Methods:
+    --------
+    - run: VaR and ES for every name, level and horizon in one table.
+    - inputs_from_results: Builds the inputs from fitted `arch_model` results.
+    - inputs_from_batch: Builds the inputs from a fitted `BatchGarch11`.
+    """
+
+    def __init__(
+        self,
+        levels: tuple = (0.99, 0.975),
+        horizons: tuple = (1, 10),
+        n_paths: int = 10_000,
+        chunk_size: int = 500_000,
+        seed: int = None,
+    ):
+        self.levels = tuple(levels)
+        self.horizons = tuple(horizons)
+        self.n_paths = n_paths
+        self.chunk_size = chunk_size  # Paths x names simulated at once
+        self.seed = seed
+
+    def run(
+        self,
+        tickers: list,
+        mu,
+        variances,
+        nu=np.inf,
+        lam=0.0,
+        std_resid=None,
+        exposure=None,
+        garch=None,
+    ) -> pd.DataFrame:
+        """
+        Compute VaR and ES for N names.
+
+        Parameters:
+        tickers (list): The N names.
+        mu (array): Daily mean returns in percent, shape (N,).
+        variances (array): Daily variance forecasts for days 1..H, shape (N, H) with
+        H >= the longest horizon (e.g. `BatchGarch11.variance_forecast(H)`).
+        nu (array): Degrees of freedom of the errors (inf for normal), shape (N,) or scalar.
+        lam (array): Skew-t asymmetry (0 for symmetric errors), shape (N,) or scalar.
+        std_resid (array): Standardized residuals, dates x N (NaN padded), for the FHS
+        figures; omitted, only the parametric figures are computed.
+        exposure (array): Position values, shape (N,); the figures are then in currency.
+        garch (dict): GARCH(1,1) or GJR(1,1,1) parameters per name ("omega", "alpha",
+        "beta" and optionally "gamma" arrays) for the multi-day FHS figures; omitted,
+        FHS covers the 1-day horizon only.
+
+        Returns:
+        pd.DataFrame: One row per name, with columns such as `parametric_var_99_1d` and
+        `fhs_es_97.5_10d`.
+        """
+        mu = np.asarray(mu, dtype=np.float64)
+        variances = np.asarray(variances, dtype=np.float64)
+        if variances.shape[1] < max(self.horizons):
+            raise ValueError("The variance forecasts are shorter than the longest horizon.")
+        cumulative_variance = np.cumsum(variances, axis=1)
+        scale = 1.0 if exposure is None else np.asarray(exposure, dtype=np.float64) / 100
+
+        tails = [1 - level for level in self.levels]
+
+        # Standardized shocks per level: {level: {method: (quantile, shortfall)}}
+        shocks = {level: {"parametric": standardized_tail(1 - level, nu, lam)} for level in self.levels}
+        if std_resid is not None:
+            std_resid = np.asarray(std_resid, dtype=np.float64)
+            empirical = empirical_tails(std_resid, tails)
+            for level, pair in zip(self.levels, empirical):
+                shocks[level]["fhs"] = pair
+
+        # Multi-day FHS: tails of the bootstrapped h-day returns, a chunk of names at a time
+        long_horizons = [horizon for horizon in self.horizons if horizon > 1]
+        simulated = {}  # {(horizon, level): (quantile, shortfall)} of the h-day return
+        if std_resid is not None and garch is not None and long_horizons:
+            rng = np.random.default_rng(self.seed)
+            for horizon in long_horizons:
+                for level in self.levels:
+                    simulated[horizon, level] = (np.empty(len(mu)), np.empty(len(mu)))
+            step = max(1, self.chunk_size // self.n_paths)
+            for start in range(0, len(mu), step):
+                names = slice(start, start + step)
+                paths = bootstrap_cumulative(
+                    std_resid[:, names],
+                    mu[names],
+                    variances[names],
+                    {key: np.broadcast_to(value, mu.shape)[names] for key, value in garch.items()},
+                    max(long_horizons),
+                    self.n_paths,
+                    rng,
+                )
+                for day, cumulative in paths:
+                    if day in long_horizons:
+                        for level, pair in zip(self.levels, empirical_tails(cumulative, tails)):
+                            simulated[day, level][0][names] = pair[0]
+                            simulated[day, level][1][names] = pair[1]
+            # Names without GARCH parameters have no multi-day FHS figures
+            missing = np.isnan(np.broadcast_to(garch["omega"], mu.shape))
+            for quantile, shortfall in simulated.values():
+                quantile[missing] = shortfall[missing] = np.nan
+
+        columns = {}
+        for method in ("parametric", "fhs"):
+            for level in self.levels:
+                if method not in shocks[level]:
+                    continue
+                quantile, shortfall = shocks[level][method]
+                for horizon in self.horizons:
+                    suffix = f"{level * 100:g}_{horizon}d"
+                    if method == "fhs" and horizon > 1:
+                        if (horizon, level) in simulated:
+                            q_return, es_return = simulated[horizon, level]
+                            columns[f"fhs_var_{suffix}"] = -q_return * scale
+                            columns[f"fhs_es_{suffix}"] = -es_return * scale
+                        continue
+                    drift = horizon * mu
+                    volatility = np.sqrt(cumulative_variance[:, horizon - 1])
+                    columns[f"{method}_var_{suffix}"] = -(drift + volatility * quantile) * scale
+                    columns[f"{method}_es_{suffix}"] = -(drift + volatility * shortfall) * scale
+        return pd.DataFrame(columns, index=pd.Index(tickers, name="ticker"))
+
+    def inputs_from_results(self, results: dict) -> dict:
+        """
+        Build the `run` inputs from fitted `arch_model` results (e.g. `fit_model`).
+
+        The multi-day FHS figures bootstrap GARCH(1,1) and GJR(1,1,1) paths; the GARCH
+        parameters of other specifications (e.g. EGARCH) are NaN, and so are their
+        multi-day FHS figures.
+
+        Returns:
+        dict: Keyword arguments for `run` (tickers, mu, variances, nu, lam, std_resid, garch).
+        """
+        horizon = max(self.horizons)
+        tickers = list(results)
+        mu = np.empty(len(tickers))
+        variances = np.empty((len(tickers), horizon))
+        nu = np.full(len(tickers), np.inf)
+        lam = np.zeros(len(tickers))
+        garch = {key: np.full(len(tickers), np.nan) for key in ("omega", "alpha", "gamma", "beta")}
+        std_resid = {}
+        for i, (ticker, result) in enumerate(results.items()):
+            params = result.params
+            mu[i] = params.get("mu", 0.0)
+            variances[i] = variance_path(result, horizon)
+            nu[i] = params.get("nu", params.get("eta", np.inf))
+            lam[i] = params.get("lambda", 0.0)
+            volatility = result.model.volatility
+            if (
+                type(volatility).__name__ == "GARCH"
+                and volatility.power == 2.0
+                and max(volatility.p, volatility.o, volatility.q) <= 1
+            ):
+                garch["omega"][i] = params["omega"]
+                garch["alpha"][i] = params.get("alpha[1]", 0.0)
+                garch["gamma"][i] = params.get("gamma[1]", 0.0)
+                garch["beta"][i] = params.get("beta[1]", 0.0)
+            std_resid[ticker] = pd.Series(
+                np.asarray(result.resid / result.conditional_volatility)
+            ).dropna().reset_index(drop=True)
+        return {
+            "tickers": tickers,
+            "mu": mu,
+            "variances": variances,
+            "nu": nu,
+            "lam": lam,
+            "std_resid": pd.DataFrame(std_resid).to_numpy(),
+            "garch": garch,
+        }
+
+    def inputs_from_batch(self, batch, returns: pd.DataFrame) -> dict:
+        """
+        Build the `run` inputs from a `BatchGarch11` fitted on `returns` (normal errors).
+
+        Returns:
+        dict: Keyword arguments for `run` (tickers, mu, variances, std_resid, garch).
+        """
+        mu = batch.params["mu"].values
+        std_resid = (returns.to_numpy(dtype=np.float64) - mu) / batch.conditional_volatility().to_numpy()
+        return {
+            "tickers": list(batch.params.index),
+            "mu": mu,
+            "variances": batch.variance_forecast(max(self.horizons)),
+            "std_resid": std_resid,
+            "garch": {
+                "omega": batch.params["omega"].values,
+                "alpha": batch.params["alpha[1]"].values,
+                "beta": batch.params["beta[1]"].values,
+            },
+        }
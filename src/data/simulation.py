@@ -0,0 +1,208 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+
+# ----------------------------------------------------------------------------------------------
+# GarchSimulator Class
+# ----------------------------------------------------------------------------------------------
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _lags(params: pd.Series, name: str, n: int) -> np.ndarray:
+    return np.array([params[f"{name}[{i}]"] for i in range(1, n + 1)])
+
+
+def _skew_t_draws(rng, eta: float, lam: float, size) -> np.ndarray:
+    """
+    Draws from Hansen's standardized skew-t without inverting its CDF.
+
+    Its density is a Student-t split at the mode, scaled by (1 - lam) on the left and
+    (1 + lam) on the right, so a left half is taken with probability (1 - lam) / 2.
+    """
+    c = np.exp(gammaln((eta + 1) / 2) - gammaln(eta / 2)) / np.sqrt(np.pi * (eta - 2))
+    a = 4 * lam * c * (eta - 2) / (eta - 1)
+    b = np.sqrt(1 + 3 * lam**2 - a**2)
+    w = np.abs(rng.standard_t(eta, size=size)) * np.sqrt((eta - 2) / eta)
+    left = rng.random(size) < (1 - lam) / 2
+    y = np.where(left, -(1 - lam) * w, (1 + lam) * w)
+    return (y - a) / b
+
+
+class GarchSimulator:
+    """
+    Monte Carlo forecasts for fitted `arch_model` results with a GARCH, GJR or EGARCH
+    volatility and a constant (or zero) mean.
+
+    Each day of the horizon advances the variance recursion of every path at once, so a
+    30-day horizon is 30 vectorized steps whatever the number of paths. Paths are
+    generated `chunk_size` at a time: only the per-path results (cumulative return and
+    variance per day) are kept for all paths, so the working memory stays bounded.
+
+    Innovations come from the fitted error distribution (`method="simulation"`) or are
+    resampled from the model's own standardized residuals (`method="bootstrap"`, i.e.
+    filtered historical simulation).
+
+    Methods:
+    --------
+    - simulate_paths: Cumulative returns and variances of every simulated path.
+    - forecast: Quantiles of the cumulative return and volatility per horizon.
+    """
+
+    def __init__(
+        self,
+        n_paths: int = 20_000,
+        chunk_size: int = 5_000,
+        method: str = "simulation",
+        quantiles: tuple = DEFAULT_QUANTILES,
+        seed: int = None,
+    ):
+        if method not in ("simulation", "bootstrap"):
+            raise ValueError("method must be 'simulation' or 'bootstrap'.")
+        self.n_paths = n_paths
+        self.chunk_size = chunk_size
+        self.method = method
+        self.quantiles = tuple(quantiles)
+        self.seed = seed
+
+    def _innovations(self, result, rng):
+        """Return a function drawing standardized innovations of a given shape."""
+        if self.method == "bootstrap":
+            std_resid = np.asarray(result.resid / result.conditional_volatility)
+            std_resid = std_resid[~np.isnan(std_resid)]
+            return lambda size: std_resid[rng.integers(len(std_resid), size=size)]
+
+        distribution = result.model.distribution
+        dist_params = result.params[distribution.parameter_names()].to_numpy()
+        name = type(distribution).__name__
+        if name == "Normal":
+            return rng.standard_normal
+        if name == "StudentsT":
+            nu = dist_params[0]
+            return lambda size: rng.standard_t(nu, size=size) * np.sqrt((nu - 2) / nu)
+        if name == "SkewStudent":
+            return lambda size: _skew_t_draws(rng, dist_params[0], dist_params[1], size)
+        return lambda size: distribution.ppf(rng.random(size), dist_params)
+
+    def simulate_paths(self, result, horizon: int):
+        """
+        Simulate `n_paths` paths of the next `horizon` days.
+
+        Parameters:
+        result: A fitted `arch_model` result (GARCH, GJR or EGARCH volatility).
+        horizon (int): The number of days to simulate.
+
+        Returns:
+        tuple: (cumulative returns, variances), both of shape (horizon, n_paths). Row h
+        holds the sum of the daily returns (in percent) up to day h + 1 and the
+        conditional variance of day h + 1.
+        """
+        volatility = result.model.volatility
+        vol_name = type(volatility).__name__
+        if vol_name not in ("GARCH", "EGARCH") or getattr(volatility, "power", 2.0) != 2.0:
+            raise ValueError(f"Simulation is not supported for {vol_name} volatility.")
+
+        params = result.params
+        p, o, q = volatility.p, volatility.o, volatility.q
+        mu = params.get("mu", 0.0)
+        omega = params["omega"]
+        alpha = _lags(params, "alpha", p)
+        gamma = _lags(params, "gamma", o)
+        beta = _lags(params, "beta", q)
+
+        # The last observed shocks and variances start every path (most recent first)
+        resid = np.asarray(result.resid)
+        variance = np.asarray(result.conditional_volatility) ** 2
+        valid = ~np.isnan(resid)
+        resid, variance = resid[valid], variance[valid]
+        n_lags = max(p, o, q, 1)
+        last_resid = resid[-n_lags:][::-1]
+        last_variance = variance[-n_lags:][::-1]
+
+        rng = np.random.default_rng(self.seed)
+        draw = self._innovations(result, rng)
+        cumulative = np.empty((horizon, self.n_paths))
+        variances = np.empty((horizon, self.n_paths))
+
+        for start in range(0, self.n_paths, self.chunk_size):
+            n = min(self.chunk_size, self.n_paths - start)
+            # Lag buffers: index 0 is the previous day
+            shocks = [np.full(n, e) for e in last_resid]
+            sigma2 = [np.full(n, s) for s in last_variance]
+            z = draw((horizon, n))
+            total = np.zeros(n)
+            for h in range(horizon):
+                if vol_name == "GARCH":
+                    next_sigma2 = np.full(n, omega)
+                    for i in range(p):
+                        next_sigma2 += alpha[i] * shocks[i] ** 2
+                    for j in range(o):
+                        next_sigma2 += gamma[j] * shocks[j] ** 2 * (shocks[j] < 0)
+                    for k in range(q):
+                        next_sigma2 += beta[k] * sigma2[k]
+                else:
+                    # EGARCH: ln s2 = omega + sum a (|e| - E|e|) + sum g e + sum b ln s2
+                    log_sigma2 = np.full(n, omega)
+                    for i in range(p):
+                        e = shocks[i] / np.sqrt(sigma2[i])
+                        log_sigma2 += alpha[i] * (np.abs(e) - np.sqrt(2 / np.pi))
+                    for j in range(o):
+                        log_sigma2 += gamma[j] * shocks[j] / np.sqrt(sigma2[j])
+                    for k in range(q):
+                        log_sigma2 += beta[k] * np.log(sigma2[k])
+                    next_sigma2 = np.exp(log_sigma2)
+
+                shock = np.sqrt(next_sigma2) * z[h]
+                total += mu + shock
+                cumulative[h, start : start + n] = total
+                variances[h, start : start + n] = next_sigma2
+                shocks = [shock] + shocks[:-1]
+                sigma2 = [next_sigma2] + sigma2[:-1]
+
+        return cumulative, variances
+
+    def forecast(self, result, horizon: int, index=None) -> pd.DataFrame:
+        """
+        Simulated forecast distribution for horizons 1..`horizon`.
+
+        Parameters:
+        result: A fitted `arch_model` result.
+        horizon (int): The number of days to forecast.
+        index: Optional labels of the forecast days (e.g. business dates).
+
+        Returns:
+        pd.DataFrame: One row per day with the quantiles of the cumulative return
+        (columns `("cumulative_return", q)`) and of the daily volatility
+        (`("volatility", q)`), plus `("volatility", "mean")`, the square root of the
+        mean simulated variance, which matches the analytic forecast.
+        """
+        cumulative, variances = self.simulate_paths(result, horizon)
+        levels = np.array(self.quantiles)
+        return_quantiles = np.quantile(cumulative, levels, axis=1).T
+        volatility_quantiles = np.sqrt(np.quantile(variances, levels, axis=1).T)
+
+        columns = pd.MultiIndex.from_tuples(
+            [("cumulative_return", q) for q in self.quantiles]
+            + [("volatility", q) for q in self.quantiles]
+            + [("volatility", "mean")]
+        )
+        values = np.column_stack(
+            [return_quantiles, volatility_quantiles, np.sqrt(variances.mean(axis=1))]
+        )
+        if index is None:
+            index = pd.RangeIndex(1, horizon + 1, name="horizon")
+        return pd.DataFrame(values, index=index, columns=columns)
+
+
+def variance_path(result, horizon: int) -> np.ndarray:
+    """
+    Variance forecasts for days 1..`horizon` of a fitted `arch_model` result.
+
+    `arch`'s analytic forecast, except for EGARCH beyond one day, which has no analytic
+    multi-step form: its path is the mean simulated variance (a fixed seed keeps
+    repeated calls identical).
+    """
+    if type(result.model.volatility).__name__ == "EGARCH" and horizon > 1:
+        return GarchSimulator(seed=0).simulate_paths(result, horizon)[1].mean(axis=1)
+    return result.forecast(horizon=horizon, reindex=False).variance.values[-1]
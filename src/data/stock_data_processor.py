@@ -1,30 +1,98 @@
 # Import necessary libraries
-from arch import arch_model
-import pandas as pd
-import requests
+from __future__ import annotations
+import numpy as np
+import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from alpha_vantage_parser import RateLimitError, parse_time_series
+from garch_forecast import garch11_state, garch11_volatility_path
+from metrics import MetricsRegistry
+from model_cache import ModelCache, fingerprint_returns
+from model_store import ModelStore
+from price_cache import COMPACT_SIZE, PriceCache
+from rate_limiter import RateLimiter
+from transport import HTTPTransport
+
+# pandas, arch and the simulator are imported on first use: `arch` alone takes longer to
+# import than everything else, and a process serving cached data may never fit a model
+if TYPE_CHECKING:
+    import pandas as pd
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+
+logger = logging.getLogger(__name__)
 
 # ----------------------------------------------------------------------------------------------
 # APIStockProcessor Class
 # ----------------------------------------------------------------------------------------------
 
+
 class APIStockProcessor:
     """
     A class used to get stock data from the AlphaVantage API.
 
     Methods:
     --------
-    - get_stock_data: Fetches stock data from the AlphaVantage API.
+    - get_stock_data: Fetches stock data from the AlphaVantage API (or the local price cache).
+    - get_many: Fetches several tickers concurrently within the API rate limits.
     - extract_returns: Computes daily returns and limits the dataset.
+    - extract_returns_matrix: Computes daily returns for a wide matrix of closing prices.
+    - fit_model: Fits a GARCH model, reusing a cached fit or a model snapshot when the data
+      and spec are unchanged.
+    - volatility_path: Forecasts volatility for horizons 1..n as a NumPy array.
     - volatility_forecaster: Forecasts stock volatility using a GARCH model.
+    - simulation_forecast: Forecasts quantiles of returns and volatility by simulation.
+
+    Every stage reports durations, bytes downloaded, rows parsed, optimizer iterations,
+    convergence and cache hits to `self.metrics` (a `MetricsRegistry`).
     """
 
-    def __init__(self, api_key=None):
+    def __init__(
+        self,
+        api_key=None,
+        cache_dir=None,
+        offline=False,
+        requests_per_minute=5,
+        requests_per_day=None,
+        base_url=ALPHA_VANTAGE_URL,
+        model_cache_size=32,
+        model_cache_ttl=None,
+        model_dir=None,
+        metrics: MetricsRegistry = None,
+        transport: HTTPTransport = None,
+    ):
         # First try env variable (Render)
         self.__api_key = api_key or os.getenv("ALPHA_API_KEY")
-        if not self.__api_key:
+        # Offline mode only reads the local price cache, so no API key is needed
+        self.offline = offline
+        if not self.__api_key and not self.offline:
             raise ValueError("Alpha Vantage API key not found. Please set ALPHA_API_KEY.")
-        self.session = requests.Session()
+        # Pooled keep-alive connections with timeouts and retries (see `transport.py`)
+        self.transport = transport or HTTPTransport()
+        self.base_url = base_url  # Can point at a local stub server in tests
+
+        # Optional on-disk price cache (one Parquet file per ticker)
+        cache_dir = cache_dir or os.getenv("STOCK_CACHE_DIR")
+        self.cache = PriceCache(cache_dir) if cache_dir else None
+        if self.offline and self.cache is None:
+            raise ValueError("Offline mode requires a cache_dir (or STOCK_CACHE_DIR).")
+
+        # Shared by every request made through this processor (including `get_many` workers)
+        self.rate_limiter = RateLimiter(requests_per_minute, requests_per_day)
+
+        # Fitted GARCH models keyed by a fingerprint of the returns and the model spec
+        self.model_cache = ModelCache(maxsize=model_cache_size, ttl=model_cache_ttl)
+
+        # Optional on-disk model snapshots (one JSON file per ticker and spec), so a new
+        # process reuses the fits of the previous one while the data is unchanged
+        model_dir = model_dir or os.getenv("STOCK_MODEL_DIR")
+        self.model_store = ModelStore(model_dir) if model_dir else None
+
+        # Stage timings and counters (see `metrics.py` for sinks and Prometheus export)
+        self.metrics = metrics or MetricsRegistry()
 
     def get_stock_data(
         self,
@@ -33,10 +101,175 @@ class APIStockProcessor:
         data_type: str = "json",
         limit: int = None,
     ) -> pd.DataFrame:
-        """Fetch stock data from Alpha Vantage API."""
-        
-        url = (
-            "https://www.alphavantage.co/query?"
+        """
+        Fetch stock data from Alpha Vantage API.
+
+        When a price cache is configured, only the latest 100 bars (`outputsize=compact`)
+        are downloaded once the cached history reaches back far enough, and the new bars
+        are merged into the cache. In offline mode the cached prices are returned (only
+        the latest 100 for `outputsize=compact`, as online).
+        """
+        with self.metrics.timed("get_stock_data", ticker=ticker):
+            if self.cache is None:
+                df_stock = self._fetch_stock_data(ticker, outputsize, data_type)
+            else:
+                with self.metrics.timed("price_cache_load", ticker=ticker):
+                    df_cached = self.cache.load(ticker)
+                fetch_size = self._cache_fetch_size(ticker, outputsize, df_cached)
+                if fetch_size is None:
+                    df_stock = self._cache_offline(outputsize, df_cached)
+                else:
+                    df_new = self._fetch_stock_data(ticker, fetch_size, data_type)
+                    df_stock = self._cache_update(ticker, outputsize, fetch_size, df_new, df_cached)
+
+        if limit:
+            df_stock = df_stock.head(limit)
+
+        return df_stock
+
+    # The price-cache policy below is shared with `AsyncAPIStockProcessor`, which only
+    # differs in how the bars are downloaded
+
+    def _cache_fetch_size(self, ticker: str, outputsize: str, df_cached: pd.DataFrame) -> str:
+        """
+        Decide what to download for a request served through the price cache.
+
+        Returns:
+        str: The `outputsize` to fetch ("compact" when it brings a complete cached history
+        up to date), or None in offline mode, where the cached prices are used instead
+        (see `_cache_offline`).
+        """
+        if self.offline:
+            if df_cached is None:
+                raise ValueError(f"No cached data for {ticker} in offline mode.")
+            self.metrics.increment("price_cache_requests_total", ticker=ticker, result="offline")
+            return None
+        fetch_size = outputsize
+        if outputsize == "full" and self.cache.covered_by_compact(df_cached):
+            fetch_size = "compact"
+        result = "incremental" if fetch_size != outputsize else "full"
+        self.metrics.increment("price_cache_requests_total", ticker=ticker, result=result)
+        return fetch_size
+
+    @staticmethod
+    def _cache_offline(outputsize: str, df_cached: pd.DataFrame) -> pd.DataFrame:
+        """The cached prices served offline: the latest 100 bars for a compact request."""
+        return df_cached.head(COMPACT_SIZE) if outputsize == "compact" else df_cached
+
+    def _cache_update(
+        self,
+        ticker: str,
+        outputsize: str,
+        fetch_size: str,
+        df_new: pd.DataFrame,
+        df_cached: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Merge freshly downloaded bars into the price cache and return what was requested."""
+        with self.metrics.timed("price_cache_merge", ticker=ticker):
+            df_stock = self.cache.merge(
+                ticker, df_new, df_cached, full_history=fetch_size == "full"
+            )
+        # A compact request returns just the latest bars, as without a cache
+        return df_new if outputsize == "compact" else df_stock
+
+    def get_many(
+        self,
+        tickers: list,
+        outputsize: str = "full",
+        data_type: str = "json",
+        limit: int = None,
+        max_workers: int = 4,
+        return_exceptions: bool = False,
+    ) -> dict:
+        """
+        Fetch stock data for several tickers concurrently.
+
+        Requests share the processor's connection pool and rate limiter. A rate-limit note
+        drains the per-minute quota for every worker, and the ticker is retried with the
+        transport's backoff (`_fetch_stock_data` is the only retry layer).
+
+        Returns:
+        dict: Ticker -> DataFrame, in the order of `tickers`. With `return_exceptions=True`
+        a failed ticker maps to its exception instead of aborting the whole batch.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                ticker: executor.submit(self.get_stock_data, ticker, outputsize, data_type, limit)
+                for ticker in tickers
+            }
+
+        stock_frames = {}
+        for ticker, future in futures.items():
+            try:
+                stock_frames[ticker] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                stock_frames[ticker] = e
+        return stock_frames
+
+    def _fetch_stock_data(
+        self, ticker: str, outputsize: str, data_type: str
+    ) -> pd.DataFrame:
+        """
+        Download the daily time series for a ticker and parse it while it streams in.
+
+        Rate-limit notes are retried with the transport's exponential backoff, after
+        draining the per-minute quota so that concurrent requests back off too; server
+        errors and connection failures are already retried inside the transport.
+        """
+        url = self._build_url(ticker, outputsize, data_type)
+
+        logger.debug("Fetching %s (outputsize=%s, datatype=%s)", ticker, outputsize, data_type)
+
+        for attempt in range(self.transport.max_retries + 1):
+            try:
+                return self._download(url, ticker, data_type)
+            except RateLimitError:
+                if attempt == self.transport.max_retries:
+                    raise
+                self.rate_limiter.drain()
+                delay = self.transport.backoff(attempt)
+                logger.warning("Rate-limit note for %s, retrying in %.1fs", ticker, delay)
+                self.metrics.increment("rate_limit_retries_total", ticker=ticker)
+                time.sleep(delay)
+
+    def _download(self, url: str, ticker: str, data_type: str) -> pd.DataFrame:
+        """One rate-limited request, parsed while the response streams in."""
+        with self.metrics.timed("rate_limit_wait", ticker=ticker):
+            self.rate_limiter.acquire()
+
+        start = time.perf_counter()
+        with self.transport.get(url) as response:
+            # Time until the response headers arrived
+            self.metrics.observe("network", time.perf_counter() - start, ticker=ticker)
+            response.raise_for_status()
+            with self.metrics.timed("download_parse", ticker=ticker):
+                df_stock = parse_time_series(
+                    self._count_bytes(response.iter_content(chunk_size=64 * 1024), ticker),
+                    ticker,
+                    data_type,
+                    self._size_hint(response.headers),
+                )
+        self.metrics.increment("rows_parsed_total", len(df_stock), ticker=ticker)
+        return df_stock
+
+    @staticmethod
+    def _size_hint(headers) -> int:
+        """Content-Length as a parser size hint (0 when compressed: it is the compressed size)."""
+        if headers.get("Content-Encoding", "identity") != "identity":
+            return 0
+        return int(headers.get("Content-Length") or 0)
+
+    def _count_bytes(self, chunks, ticker: str):
+        """Pass chunks through while counting the downloaded bytes."""
+        for chunk in chunks:
+            self.metrics.increment("bytes_downloaded_total", len(chunk), ticker=ticker)
+            yield chunk
+
+    def _build_url(self, ticker: str, outputsize: str, data_type: str) -> str:
+        return (
+            f"{self.base_url}?"
             "function=TIME_SERIES_DAILY&"
             f"symbol={ticker}&"
             f"outputsize={outputsize}&"
@@ -44,44 +277,284 @@ class APIStockProcessor:
             f"apikey={self.__api_key}"
         )
 
-        # Debugging (optional: logs show in Render)
-        print(f"DEBUG: Fetching {ticker} with API key {self.__api_key[:4]}...")
+    def extract_returns(
+        self,
+        df: pd.DataFrame,
+        limit: int = 2500,
+        log: bool = False,
+        as_array: bool = False,
+    ):
+        """
+        Compute the daily returns (in percent) of the closing prices, oldest first.
 
-        response = requests.get(url=url)
-        response.raise_for_status()
+        Only the close column is used: it is put in date order (a reversed view for Alpha
+        Vantage's newest-first frames, no sort when it is already ordered), cut to the last
+        `limit + 1` prices, and the returns are computed on the NumPy values. Missing
+        prices are skipped: the return after a gap spans it, from the previous available
+        price, and is dated on the later price (as in `extract_returns_matrix` and
+        `ReturnsPanelStore`).
 
-        response_data = response.json()
+        Parameters:
+        df (pd.DataFrame): Stock prices with a `close` column and a date index.
+        limit (int): The number of most recent returns to keep (None keeps all).
+        log (bool): Return log returns instead of simple returns.
+        as_array (bool): Return a (float64 array, DatetimeIndex) pair instead of a Series.
 
-        if "Error Message" in response_data:
-            raise ValueError(f"Error encountered while fetching data: {response_data['Error Message']}")
-        if "Note" in response_data:
-            raise ValueError("Rate limit exceeded. Please wait and try again.")
-        if "Time Series (Daily)" not in response_data:
-            raise Exception(f"Invalid API call for {ticker}. Please enter a valid ticker symbol.")
+        Returns:
+        pd.Series: The returns, or a (values, dates) tuple when `as_array` is set.
+        """
+        start = time.perf_counter()
+        close = df["close"]
+        if not close.index.is_monotonic_increasing:
+            if close.index.is_monotonic_decreasing:
+                close = close.iloc[::-1]
+            else:
+                close = close.sort_index()
 
-        stock_data = response_data["Time Series (Daily)"]
+        window = close.iloc[-(limit + 1) :] if limit else close
+        prices = window.to_numpy(dtype=np.float64)
+        if np.isnan(prices).any():
+            # Drop the missing prices, so the window still holds `limit + 1` of them
+            close = close[close.notna()]
+            window = close.iloc[-(limit + 1) :] if limit else close
+            prices = window.to_numpy(dtype=np.float64)
 
-        df_stock = pd.DataFrame.from_dict(stock_data, orient="index", dtype=float)
-        df_stock.index = pd.to_datetime(df_stock.index)
-        df_stock.index.name = "date"
-        df_stock.columns = [col.split(". ")[1] for col in df_stock.columns]
+        if log:
+            returns = np.diff(np.log(prices)) * 100
+        else:
+            returns = (prices[1:] / prices[:-1] - 1) * 100
+        dates = window.index[1:]
 
-        if limit:
-            df_stock = df_stock.head(limit)
+        self.metrics.observe("returns", time.perf_counter() - start)
+        if as_array:
+            return returns, dates
+        import pandas as pd
 
-        return df_stock
+        return pd.Series(returns, index=dates, name="returns")
+
+    def extract_returns_matrix(
+        self, close_prices: pd.DataFrame, limit: int = 2500, log: bool = False
+    ) -> pd.DataFrame:
+        """
+        Compute daily returns (in percent) for a wide matrix of closing prices at once.
+
+        Parameters:
+        close_prices (pd.DataFrame): Closing prices, dates x tickers (e.g. from `close_matrix`).
+        limit (int): The number of most recent dates to keep (None keeps all).
+        log (bool): Return log returns instead of simple returns.
+
+        Returns:
+        pd.DataFrame: Returns, dates x tickers, oldest first. Dates without a price (before
+        a ticker's first price, or a gap, e.g. tickers on different calendars) are NaN, and
+        the return after a gap spans it, from the previous available price (as in
+        `extract_returns` and `ReturnsPanelStore`).
+        """
+        import pandas as pd
+
+        if not close_prices.index.is_monotonic_increasing:
+            close_prices = close_prices.sort_index()
+        prices = close_prices.to_numpy(dtype=np.float64)
+        window = prices[-(limit + 1) :] if limit else prices
+        if np.isnan(window).any():
+            # Previous available price of every row (NaN before a ticker's first price),
+            # taken over the whole matrix so a gap at the start of the window is spanned too
+            rows = np.where(~np.isnan(prices), np.arange(len(prices))[:, None], 0)
+            np.maximum.accumulate(rows, axis=0, out=rows)
+            previous = np.take_along_axis(prices, rows, axis=0)[:-1]
+            current = prices[1:]
+            if limit:
+                previous, current = previous[-limit:], current[-limit:]
+        else:
+            previous, current = window[:-1], window[1:]
+
+        if log:
+            returns = np.log(current / previous) * 100
+        else:
+            returns = (current / previous - 1) * 100
+        return pd.DataFrame(
+            returns,
+            index=close_prices.index[len(close_prices) - len(returns) :],
+            columns=close_prices.columns,
+        )
+
+    @staticmethod
+    def close_matrix(stock_frames: dict) -> pd.DataFrame:
+        """Align the closing prices of several tickers (e.g. from `get_many`) into one matrix."""
+        import pandas as pd
+
+        return pd.concat(
+            {ticker: df["close"] for ticker, df in stock_frames.items()}, axis=1
+        ).sort_index()
+
+    def fit_model(
+        self,
+        stock_data: pd.Series,
+        p: int = 1,
+        q: int = 1,
+        dist: str = "normal",
+        ticker: str = None,
+        vol: str = "GARCH",
+        o: int = 0,
+    ):
+        """
+        Fit a GARCH(p, q) model, or return the cached fit for the same returns and spec.
 
-    def extract_returns(self, df: pd.DataFrame, limit: int = 2500) -> pd.Series:
-        df = df.copy()
-        df.sort_index(ascending=True, inplace=True)
-        df["returns"] = df["close"].pct_change() * 100
-        return df["returns"].dropna().iloc[-limit:]
+        `vol` and `o` select other volatility families (e.g. `vol="EGARCH", o=1`, or
+        `o=1` for GJR), as picked by `model_selection.GarchModelSelector`.
+        `ticker` labels the fit metrics and, with a model store, names the snapshot: a
+        snapshot fitted on the same returns and spec is restored instead of refitting,
+        and every new fit is saved.
+        """
+        labels = {"ticker": ticker} if ticker else {}
+        spec = {"vol": vol, "p": p, "o": o, "q": q, "dist": dist}
+        key = fingerprint_returns(stock_data, **spec)
+        fitted, restored = [], []
 
-    def volatility_forecaster(self, stock_data: pd.Series, n_days: int) -> dict:
-        model = arch_model(stock_data, p=1, q=1, rescale=False).fit(disp=0)
-        forecasts = model.forecast(horizon=n_days, reindex=False).variance
+        def fit():
+            snapshot = self._load_snapshot(ticker, spec, key)
+            if snapshot is not None:
+                with self.metrics.timed("snapshot_restore", **labels):
+                    result = self.model_store.restore(snapshot, stock_data)
+                restored.append(result)
+                return result
+            from arch import arch_model
+
+            with self.metrics.timed("fit", **labels):
+                result = arch_model(
+                    stock_data, vol=vol, p=p, o=o, q=q, dist=dist, rescale=False
+                ).fit(disp=0)
+            fitted.append(result)
+            if self.model_store is not None and ticker:
+                self.model_store.save(ticker, result, spec, key)
+            return result
+
+        model = self.model_cache.get_or_create(key, fit)
+        if fitted or restored:
+            self.metrics.increment("model_cache_misses_total", **labels)
+        else:
+            self.metrics.increment("model_cache_hits_total", **labels)
+        if fitted:
+            self.metrics.set_gauge("fit_iterations", model.optimization_result.nit, **labels)
+            self.metrics.set_gauge("fit_converged", int(model.convergence_flag == 0), **labels)
+        return model
+
+    def _load_snapshot(self, ticker: str, spec: dict, key: str, count_miss: bool = True) -> dict:
+        """Return the model snapshot fitted on the same returns and spec, or None."""
+        if self.model_store is None or not ticker:
+            return None
+        snapshot = self.model_store.load(ticker, spec, key)
+        if snapshot is not None or count_miss:
+            result = "miss" if snapshot is None else "hit"
+            self.metrics.increment("model_snapshot_requests_total", ticker=ticker, result=result)
+        return snapshot
+
+    def volatility_path(
+        self,
+        stock_data: pd.Series,
+        n_days: int,
+        p: int = 1,
+        q: int = 1,
+        dist: str = "normal",
+        ticker: str = None,
+        vol: str = "GARCH",
+        o: int = 0,
+    ) -> np.ndarray:
+        """
+        Forecast the volatility for horizons 1..`n_days` as a NumPy array.
+
+        GARCH(1,1) forecasts use the closed form in `garch_forecast`, so once the fit is
+        cached no forecast DataFrame is built. Other specs use `simulation.variance_path`
+        (`arch`'s forecast, or the mean simulated variance for EGARCH beyond one day).
+        A fresh GARCH(1,1) snapshot is forecast directly, without rebuilding the fit.
+        """
+        labels = {"ticker": ticker} if ticker else {}
+        garch11 = vol == "GARCH" and p == 1 and o == 0 and q == 1
+        if garch11 and self.model_store is not None and ticker:
+            spec = {"vol": vol, "p": p, "o": o, "q": q, "dist": dist}
+            key = fingerprint_returns(stock_data, **spec)
+            # A miss is counted by `fit_model` below
+            snapshot = self._load_snapshot(ticker, spec, key, count_miss=False)
+            if snapshot is not None:
+                with self.metrics.timed("forecast", **labels):
+                    params = snapshot["params"]
+                    return garch11_volatility_path(
+                        params["omega"],
+                        params["alpha[1]"],
+                        params["beta[1]"],
+                        snapshot["state"]["sigma2_next"],
+                        n_days,
+                    )
+
+        # Changing only the horizon re-uses the cached fit
+        model = self.fit_model(stock_data, p=p, q=q, dist=dist, ticker=ticker, vol=vol, o=o)
+        with self.metrics.timed("forecast", **labels):
+            if garch11:
+                state = garch11_state(model)
+                return garch11_volatility_path(
+                    state["omega"], state["alpha"], state["beta"], state["sigma2_next"], n_days
+                )
+            from simulation import variance_path
+
+            return np.sqrt(variance_path(model, n_days))
+
+    def volatility_forecaster(
+        self,
+        stock_data: pd.Series,
+        n_days: int,
+        p: int = 1,
+        q: int = 1,
+        dist: str = "normal",
+        ticker: str = None,
+        vol: str = "GARCH",
+        o: int = 0,
+    ) -> dict:
+        import pandas as pd
+
+        volatility = self.volatility_path(
+            stock_data, n_days, p=p, q=q, dist=dist, ticker=ticker, vol=vol, o=o
+        )
         start_date = stock_data.index[-1] + pd.DateOffset(days=1)
         predicted_dates = pd.bdate_range(start=start_date, periods=n_days)
-        volatility = forecasts.iloc[-1].values ** 0.5
         predicted_output = pd.Series(volatility, index=[d.isoformat() for d in predicted_dates])
         return predicted_output.to_dict()
+
+    def simulation_forecast(
+        self,
+        stock_data: pd.Series,
+        n_days: int,
+        p: int = 1,
+        q: int = 1,
+        dist: str = "normal",
+        ticker: str = None,
+        vol: str = "GARCH",
+        o: int = 0,
+        n_paths: int = 20_000,
+        method: str = "simulation",
+        seed: int = None,
+    ) -> pd.DataFrame:
+        """
+        Forecast the distribution of the next `n_days` by Monte Carlo simulation.
+
+        Parameters:
+        stock_data (pd.Series): A time series of stock returns (in percent).
+        n_days (int): The number of business days to forecast.
+        n_paths (int): The number of simulated paths.
+        method (str): "simulation" (fitted error distribution) or "bootstrap"
+        (resampled standardized residuals).
+        seed (int): Seed of the random generator, for reproducible forecasts.
+
+        Returns:
+        pd.DataFrame: Per business date (ISO 8601), the quantiles of the cumulative
+        return and of the volatility (see `GarchSimulator.forecast`).
+        """
+        import pandas as pd
+        from simulation import GarchSimulator
+
+        model = self.fit_model(stock_data, p=p, q=q, dist=dist, ticker=ticker, vol=vol, o=o)
+        start_date = stock_data.index[-1] + pd.DateOffset(days=1)
+        predicted_dates = pd.bdate_range(start=start_date, periods=n_days)
+        simulator = GarchSimulator(n_paths=n_paths, method=method, seed=seed)
+        with self.metrics.timed("simulate", **({"ticker": ticker} if ticker else {})):
+            return simulator.forecast(
+                model, n_days, index=[d.isoformat() for d in predicted_dates]
+            )
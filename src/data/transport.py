@@ -0,0 +1,84 @@
+# Import necessary libraries
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ----------------------------------------------------------------------------------------------
+# HTTPTransport Class
+# ----------------------------------------------------------------------------------------------
+
+# Server errors worth retrying (429 is also sent by proxies in front of the API)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HTTPTransport:
+    """
+    The HTTP layer of `APIStockProcessor`: one keep-alive connection pool with timeouts,
+    retries and compression.
+
+    - Connections are pooled per host by a `requests.Session`, so a batch of downloads
+      pays the TCP/TLS setup once per pooled connection instead of once per request.
+    - Every request has a connect and a read timeout, so a hung socket fails instead of
+      blocking a worker forever (the read timeout applies to each read of the stream).
+    - Connection errors and 5xx/429 responses are retried by the connection pool with
+      exponential backoff (honouring `Retry-After`). Alpha Vantage sends its rate-limit
+      notes with status 200, so those are retried by the caller using `backoff`.
+    - With `gzip`, responses are requested compressed and decompressed while streaming.
+
+    Pass `session` to swap in any object with a `requests`-like `get` (e.g. a fake
+    server in tests); it is used as is, without the pool and retry setup.
+
+    Methods:
+    --------
+    - get: Sends a streamed GET request.
+    - backoff: Returns the delay before a retry.
+    - close: Closes the pooled connections.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        backoff_max: float = 60.0,
+        gzip: bool = True,
+        session=None,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.headers = {"Accept-Encoding": "gzip, deflate" if gzip else "identity"}
+
+        if session is None:
+            retry = Retry(
+                total=max_retries,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET"}),
+                backoff_factor=backoff_factor,
+                backoff_max=backoff_max,  # A Retry argument since urllib3 2
+                raise_on_status=False,  # The last response is returned for raise_for_status
+            )
+            adapter = HTTPAdapter(
+                pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def get(self, url: str):
+        """Send a streamed GET request; use the response as a context manager."""
+        return self.session.get(url=url, stream=True, timeout=self.timeout, headers=self.headers)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter before retry number `attempt` (0 for the first)."""
+        delay = min(self.backoff_max, self.backoff_factor * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
@@ -0,0 +1,253 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# ----------------------------------------------------------------------------------------------
+# Rolling kernels
+# ----------------------------------------------------------------------------------------------
+
+
+def _cumsum0(values: np.ndarray) -> np.ndarray:
+    """Cumulative sum along axis 0 with a leading row of zeros."""
+    out = np.empty((values.shape[0] + 1,) + values.shape[1:])
+    out[0] = 0.0
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+def _window_diff(cumulative: np.ndarray, window: int) -> np.ndarray:
+    """Sums over the trailing `window` rows from a `_cumsum0` array (NaN for the first rows)."""
+    out = np.empty((cumulative.shape[0] - 1,) + cumulative.shape[1:])
+    out[: window - 1] = np.nan
+    np.subtract(cumulative[window:], cumulative[:-window], out=out[window - 1 :])
+    return out
+
+
+def _rolling_sums(values: np.ndarray, windows, squares: bool = True):
+    """
+    Rolling sums (and sums of squares) of every column along axis 0, for several windows.
+
+    One cumulative sum serves every window: each window's sums are the difference of two
+    rows of it, so the cost is O(n) per window whatever its length. Windows containing a
+    NaN come out as NaN.
+
+    Returns:
+    generator: (window, sums, sums of squares or None) per window.
+    """
+    valid = ~np.isnan(values)
+    has_gaps = not valid.all()
+    if has_gaps:
+        values = np.where(valid, values, 0.0)
+        counts = _cumsum0(valid.astype(np.float64))
+    csum = _cumsum0(values)
+    csum2 = _cumsum0(values * values) if squares else None
+
+    for window in windows:
+        s1 = _window_diff(csum, window)
+        s2 = _window_diff(csum2, window) if squares else None
+        if has_gaps:
+            incomplete = _window_diff(counts, window) < window
+            s1[incomplete] = np.nan
+        yield window, s1, s2
+
+
+def rolling_std(values: np.ndarray, windows) -> dict:
+    """
+    Rolling sample standard deviations of every column for several windows.
+
+    Matches `DataFrame.rolling(window).std()`: a window with a missing value is NaN.
+    Columns are demeaned first so the sum-of-squares form does not lose precision.
+
+    Parameters:
+    values (np.ndarray): Dates x tickers, oldest first.
+    windows (iterable): Window lengths in rows.
+
+    Returns:
+    dict: Window -> array of the same shape as `values`.
+    """
+    with np.errstate(invalid="ignore"):
+        centered = values - np.nanmean(values, axis=0)
+    result = {}
+    for window, s1, s2 in _rolling_sums(centered, windows):
+        # (sum x^2 - (sum x)^2 / n) / (n - 1), in place
+        np.square(s1, out=s1)
+        s1 /= -window
+        s1 += s2
+        np.maximum(s1, 0.0, out=s1)
+        s1 /= window - 1
+        result[window] = np.sqrt(s1, out=s1)
+    return result
+
+
+def rolling_mean(values: np.ndarray, windows) -> dict:
+    """Rolling means of every column for several windows (NaN if the window has gaps)."""
+    return {
+        window: s1 / window for window, s1, _ in _rolling_sums(values, windows, squares=False)
+    }
+
+
+def ewma_variance(values: np.ndarray, lam: float) -> np.ndarray:
+    """
+    Exponentially weighted mean of squared values along axis 0 (RiskMetrics with decay `lam`).
+
+    Matches `(values**2).ewm(alpha=1 - lam).mean()`: both the weighted sum and the sum
+    of the weights are one linear filter pass, and missing values get no weight but
+    still age the older ones.
+    """
+    squared = values**2
+    valid = ~np.isnan(squared)
+    a = [1.0, -lam]
+    if valid.all():
+        # Without gaps the weights are the same for every column: (1 - lam^(t+1)) / (1 - lam)
+        weighted = lfilter([1.0], a, squared, axis=0)
+        weights = (1.0 - lam ** np.arange(1, len(values) + 1)) / (1.0 - lam)
+        weighted /= weights.reshape((-1,) + (1,) * (values.ndim - 1))
+        return weighted
+    weighted = lfilter([1.0], a, np.where(valid, squared, 0.0), axis=0)
+    weights = lfilter([1.0], a, valid.astype(np.float64), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weights > 0, weighted / weights, np.nan)
+
+
+def squared_acf(values: np.ndarray, nlags: int = 20) -> np.ndarray:
+    """
+    Autocorrelations of the squared values of every column for lags 0..`nlags`, via FFT.
+
+    Matches `statsmodels.tsa.stattools.acf(x**2, nlags, fft=True)` for a column without
+    gaps. Missing values count as zero deviations from the column mean.
+
+    Returns:
+    np.ndarray: Shape (nlags + 1, columns).
+    """
+    squared = values**2
+    valid = ~np.isnan(squared)
+    with np.errstate(invalid="ignore"):
+        deviations = np.where(valid, squared - np.nanmean(squared, axis=0), 0.0)
+    n = deviations.shape[0]
+    size = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    spectrum = np.fft.rfft(deviations, n=size, axis=0)
+    autocov = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=0)[: nlags + 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return autocov / autocov[0]
+
+
+# ----------------------------------------------------------------------------------------------
+# VolatilityFeatureEngine Class
+# ----------------------------------------------------------------------------------------------
+
+
+class VolatilityFeatureEngine:
+    """
+    Realized-volatility features for a whole universe of tickers, as baselines for the
+    GARCH forecasts.
+
+    All features work on wide (dates x tickers) matrices and cover every window at once:
+    rolling moments come from one cumulative sum per matrix, EWMA from one linear
+    filter pass per decay, and the squared-return ACF from one FFT. Volatilities are
+    daily, in percent, like the returns (`annualize=True` scales them by sqrt(252)).
+
+    Methods:
+    --------
+    - rolling_volatility: Rolling standard deviation of the returns per window.
+    - ewma_volatility: EWMA (RiskMetrics) volatility per decay factor.
+    - parkinson_volatility: High-low range estimator per window.
+    - garman_klass_volatility: Open-high-low-close range estimator per window.
+    - squared_return_acf: Autocorrelations of the squared returns per ticker.
+    - compute: Every volatility feature from per-ticker price frames.
+    """
+
+    def __init__(
+        self,
+        windows: tuple = (10, 30, 60),
+        ewma_lambdas: tuple = (0.94, 0.97),
+        annualize: bool = False,
+    ):
+        self.windows = tuple(windows)
+        self.ewma_lambdas = tuple(ewma_lambdas)
+        self.scale = np.sqrt(252) if annualize else 1.0
+
+    def _frame(self, values: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+        if self.scale != 1.0:
+            values *= self.scale
+        return pd.DataFrame(values, index=like.index, columns=like.columns, copy=False)
+
+    def rolling_volatility(self, returns: pd.DataFrame) -> dict:
+        """Window -> DataFrame of rolling standard deviations of the returns."""
+        stds = rolling_std(returns.to_numpy(dtype=np.float64), self.windows)
+        return {window: self._frame(std, returns) for window, std in stds.items()}
+
+    def ewma_volatility(self, returns: pd.DataFrame) -> dict:
+        """Decay factor -> DataFrame of EWMA volatilities of the returns."""
+        values = returns.to_numpy(dtype=np.float64)
+        return {
+            lam: self._frame(np.sqrt(ewma_variance(values, lam)), returns)
+            for lam in self.ewma_lambdas
+        }
+
+    def parkinson_volatility(self, high: pd.DataFrame, low: pd.DataFrame) -> dict:
+        """Window -> DataFrame of Parkinson volatilities, from (ln H/L)^2 / (4 ln 2) per day."""
+        log_range = np.log(high.to_numpy(dtype=np.float64) / low.to_numpy(dtype=np.float64))
+        daily = log_range**2 / (4 * np.log(2)) * 100**2
+        means = rolling_mean(daily, self.windows)
+        return {window: self._frame(np.sqrt(mean), high) for window, mean in means.items()}
+
+    def garman_klass_volatility(
+        self, open_: pd.DataFrame, high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame
+    ) -> dict:
+        """Window -> DataFrame of Garman-Klass volatilities, from the daily OHLC ranges."""
+        log_hl = np.log(high.to_numpy(dtype=np.float64) / low.to_numpy(dtype=np.float64))
+        log_co = np.log(close.to_numpy(dtype=np.float64) / open_.to_numpy(dtype=np.float64))
+        daily = (0.5 * log_hl**2 - (2 * np.log(2) - 1) * log_co**2) * 100**2
+        means = rolling_mean(daily, self.windows)
+        return {
+            window: self._frame(np.sqrt(np.maximum(mean, 0.0)), high)
+            for window, mean in means.items()
+        }
+
+    def squared_return_acf(self, returns: pd.DataFrame, nlags: int = 20) -> pd.DataFrame:
+        """Lags x tickers autocorrelations of the squared returns."""
+        acf = squared_acf(returns.to_numpy(dtype=np.float64), nlags)
+        return pd.DataFrame(acf, index=pd.RangeIndex(nlags + 1, name="lag"), columns=returns.columns)
+
+    @staticmethod
+    def ohlc_matrices(stock_frames: dict) -> dict:
+        """Align the open/high/low/close columns of several tickers into dates x tickers matrices."""
+        return {
+            field: pd.concat(
+                {ticker: df[field] for ticker, df in stock_frames.items()}, axis=1
+            ).sort_index()
+            for field in ("open", "high", "low", "close")
+        }
+
+    def compute(self, stock_frames: dict) -> pd.DataFrame:
+        """
+        Compute every volatility feature for several tickers (e.g. from `get_many`).
+
+        Parameters:
+        stock_frames (dict): Ticker -> price DataFrame from `get_stock_data`.
+
+        Returns:
+        pd.DataFrame: Dates x (feature, ticker) columns, oldest first. Features are named
+        `std_{window}`, `ewma_{lambda}`, `parkinson_{window}` and `garman_klass_{window}`.
+        """
+        ohlc = self.ohlc_matrices(stock_frames)
+        close = ohlc["close"]
+        prices = close.to_numpy(dtype=np.float64)
+        returns = pd.DataFrame(
+            np.vstack([np.full((1, prices.shape[1]), np.nan), (prices[1:] / prices[:-1] - 1) * 100]),
+            index=close.index,
+            columns=close.columns,
+        )
+
+        features = {}
+        for window, frame in self.rolling_volatility(returns).items():
+            features[f"std_{window}"] = frame
+        for lam, frame in self.ewma_volatility(returns).items():
+            features[f"ewma_{lam}"] = frame
+        for window, frame in self.parkinson_volatility(ohlc["high"], ohlc["low"]).items():
+            features[f"parkinson_{window}"] = frame
+        gk = self.garman_klass_volatility(ohlc["open"], ohlc["high"], ohlc["low"], close)
+        for window, frame in gk.items():
+            features[f"garman_klass_{window}"] = frame
+        return pd.concat(features, axis=1, names=["feature", "ticker"])
@@ -0,0 +1,93 @@
+"""Shared fixtures: the `src/data` modules on the path and an offline Alpha Vantage stand-in."""
+
+# Import necessary libraries
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Append the absolute path of the `src/data` directory to system path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data"))
+
+# Alpha Vantage returns the latest 100 trading days when `outputsize=compact`
+COMPACT_SIZE = 100
+
+
+def daily_bars(n_bars: int, end=None, seed: int = 0) -> pd.DataFrame:
+    """`n_bars` business days of prices ending `end` (today by default), oldest first."""
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+    dates = pd.bdate_range(end=end, periods=n_bars, name="date")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": 1000},
+        index=dates,
+    )
+
+
+def garch_returns(n_obs: int, seed: int = 0, omega=0.05, alpha=0.1, beta=0.85, mu=0.05) -> pd.Series:
+    """Daily returns in percent simulated from a GARCH(1,1), on business days ending today."""
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal(n_obs)
+    returns = np.empty(n_obs)
+    sigma2 = omega / (1 - alpha - beta)
+    for t in range(n_obs):
+        returns[t] = mu + np.sqrt(sigma2) * shocks[t]
+        sigma2 = omega + alpha * (returns[t] - mu) ** 2 + beta * sigma2
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_obs, name="date")
+    return pd.Series(returns, index=dates, name="returns")
+
+
+def json_payload(bars: pd.DataFrame) -> bytes:
+    """A `TIME_SERIES_DAILY` JSON response (newest bar first), as Alpha Vantage sends it."""
+    series = {
+        date.strftime("%Y-%m-%d"): {
+            "1. open": f"{row.open:.4f}",
+            "2. high": f"{row.high:.4f}",
+            "3. low": f"{row.low:.4f}",
+            "4. close": f"{row.close:.4f}",
+            "5. volume": str(int(row.volume)),
+        }
+        for date, row in bars.iloc[::-1].iterrows()
+    }
+    meta = {"1. Information": "Daily Prices (open, high, low, close) and Volumes"}
+    return json.dumps({"Meta Data": meta, "Time Series (Daily)": series}, indent=4).encode()
+
+
+class FixtureResponse:
+    """Minimal streamed `requests.Response` stand-in."""
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.headers = {"Content-Length": str(len(payload))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.payload), chunk_size):
+            yield self.payload[i : i + chunk_size]
+
+
+class FixtureSession:
+    """Serves `bars` like Alpha Vantage (the last 100 for `compact`) and records the URLs."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars
+        self.urls = []
+
+    def get(self, url: str, **kwargs):
+        self.urls.append(url)
+        bars = self.bars.iloc[-COMPACT_SIZE:] if "outputsize=compact" in url else self.bars
+        return FixtureResponse(json_payload(bars))
+
+    @property
+    def output_sizes(self) -> list:
+        return [url.split("outputsize=")[1].split("&")[0] for url in self.urls]
@@ -0,0 +1,54 @@
+# Import necessary libraries
+import json
+import pytest
+
+from alpha_vantage_parser import RateLimitError, parse_time_series
+from conftest import daily_bars, json_payload
+
+
+def parse(payload: bytes, chunk_size: int = 64):
+    chunks = (payload[i : i + chunk_size] for i in range(0, len(payload), chunk_size))
+    return parse_time_series(chunks, "FIXT")
+
+
+def test_parses_every_bar_across_chunk_boundaries():
+    bars = daily_bars(50)
+    df_stock = parse(json_payload(bars), chunk_size=7)
+    assert len(df_stock) == 50
+    assert df_stock.index[0] == bars.index[-1]  # Newest first, as sent
+    assert df_stock["close"].iloc[::-1].to_numpy() == pytest.approx(bars["close"].to_numpy(), abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."},
+        {"Information": "Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day."},
+    ],
+)
+def test_rate_limit_payloads_raise_rate_limit_error(payload):
+    with pytest.raises(RateLimitError):
+        parse(json.dumps(payload).encode())
+
+
+def test_other_information_payloads_raise_value_error_with_the_message():
+    message = "Thank you for using Alpha Vantage! The outputsize=full parameter value is a premium feature."
+    with pytest.raises(ValueError, match="premium feature") as error:
+        parse(json.dumps({"Information": message}).encode())
+    assert not isinstance(error.value, RateLimitError)
+
+
+@pytest.mark.parametrize("position", [0, 25, 49])
+def test_bars_with_unexpected_fields_raise_instead_of_being_skipped(position):
+    data = json.loads(json_payload(daily_bars(50)))
+    series = data["Time Series (Daily)"]
+    date = list(series)[position]
+    series[date]["6. dividend amount"] = "0.0000"
+    with pytest.raises(ValueError, match=date):
+        parse(json.dumps(data, indent=4).encode(), chunk_size=7)
+
+
+def test_csv_rows_with_unexpected_fields_raise():
+    payload = b"timestamp,open,high,low,close,volume\r\n2024-01-03,1,2,0.5,1.5,100\r\n2024-01-02,1,2,0.5,1.5,100,7\r\n"
+    with pytest.raises(ValueError, match="2024-01-02"):
+        parse_time_series([payload], "FIXT", data_type="csv")
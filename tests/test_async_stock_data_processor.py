@@ -0,0 +1,109 @@
+# Import necessary libraries
+import asyncio
+import pandas as pd
+from aiohttp import web
+
+from async_stock_data_processor import AsyncAPIStockProcessor
+from conftest import COMPACT_SIZE, daily_bars, json_payload
+from stock_data_processor import APIStockProcessor
+from transport import HTTPTransport
+
+
+class StubServer:
+    """A local Alpha Vantage stand-in on a free port (`aiohttp.web`), recording the requests."""
+
+    def __init__(self, bars: pd.DataFrame, failures: int = 0):
+        self.bars = bars
+        self.failures = failures  # Requests answered with 503 before serving the bars
+        self.requests = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        if self.failures:
+            self.failures -= 1
+            return web.Response(status=503)
+        bars = self.bars
+        if request.query["outputsize"] == "compact":
+            bars = bars.iloc[-COMPACT_SIZE:]
+        return web.Response(body=json_payload(bars), content_type="application/json")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/query", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/query"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+    @property
+    def output_sizes(self) -> list:
+        return [query["outputsize"] for query in self.requests]
+
+
+def make_processor(server: StubServer, **kwargs) -> AsyncAPIStockProcessor:
+    transport = HTTPTransport(max_retries=2, backoff_factor=0.0)
+    return AsyncAPIStockProcessor(
+        api_key="test", requests_per_minute=None, base_url=server.url, transport=transport, **kwargs
+    )
+
+
+def test_get_many_retries_and_parses_streamed_responses():
+    bars = daily_bars(300)
+
+    async def run():
+        async with StubServer(bars, failures=1) as server:
+            async with make_processor(server) as processor:
+                frames = await processor.get_many(["AAA", "BBB"])
+        return server, frames
+
+    server, frames = asyncio.run(run())
+
+    assert len(server.requests) == 3  # One 503 retried, then both tickers
+    for df_stock in frames.values():
+        assert len(df_stock) == len(bars)
+        assert df_stock.index[0] == bars.index[-1]  # Newest first, as the sync processor
+        assert abs(df_stock["close"].iloc[0] - bars["close"].iloc[-1]) < 1e-3
+
+
+def test_cache_policy_matches_the_sync_processor(tmp_path):
+    bars = daily_bars(300)
+
+    async def run():
+        async with StubServer(bars) as server:
+            async with make_processor(server, cache_dir=str(tmp_path)) as processor:
+                compact = await processor.get_stock_data("AAA", outputsize="compact")
+                full = await processor.get_stock_data("AAA")
+                refreshed = await processor.get_stock_data("AAA")
+        return server, compact, full, refreshed
+
+    server, compact, full, refreshed = asyncio.run(run())
+
+    # A compact-only cache is no full history; once it is, compact requests refresh it
+    assert server.output_sizes == ["compact", "full", "compact"]
+    assert len(compact) == COMPACT_SIZE
+    assert len(full) == len(refreshed) == len(bars)
+
+
+def test_forwards_model_arguments():
+    returns = APIStockProcessor(api_key="test").extract_returns(
+        daily_bars(600).iloc[::-1], log=True
+    )
+
+    async def run():
+        async with AsyncAPIStockProcessor(api_key="test") as processor:
+            log_returns = await processor.extract_returns(daily_bars(600).iloc[::-1], log=True)
+            forecast = await processor.volatility_forecaster(
+                log_returns, 5, p=1, q=1, dist="t", vol="GARCH", o=1
+            )
+        return log_returns, forecast
+
+    log_returns, forecast = asyncio.run(run())
+
+    pd.testing.assert_series_equal(log_returns, returns)
+    assert len(forecast) == 5
@@ -0,0 +1,40 @@
+# Import necessary libraries
+import numpy as np
+import pytest
+from arch import arch_model
+
+from backtest import GarchBacktester
+from conftest import garch_returns
+
+
+def refit_loop(returns, test_size: int) -> np.ndarray:
+    """The original walk-forward loop: a fresh `arch_model` fit before every test day."""
+    forecasts = []
+    for t in range(len(returns) - test_size, len(returns)):
+        result = arch_model(returns.iloc[:t], p=1, q=1, rescale=False).fit(disp="off")
+        forecasts.append(result.forecast(horizon=1, reindex=False).variance.iloc[-1, 0] ** 0.5)
+    return np.array(forecasts)
+
+
+def test_refit_every_day_matches_the_refit_loop():
+    returns = garch_returns(500)
+    forecasts = GarchBacktester(refit_every=1, warm_start=False).run(returns, 10)
+    assert list(forecasts.index) == list(returns.index[-10:])
+    assert forecasts.to_numpy() == pytest.approx(refit_loop(returns, 10), rel=1e-8)
+
+
+def test_warm_start_and_refit_every_stay_close_to_the_refit_loop():
+    returns = garch_returns(500)
+    expected = refit_loop(returns, 10)
+    warm = GarchBacktester(refit_every=1, warm_start=True).run(returns, 10)
+    assert warm.to_numpy() == pytest.approx(expected, rel=1e-3)
+    # Between refits only the variance recursion advances, with the older parameters
+    every_5 = GarchBacktester(refit_every=5, warm_start=True).run(returns, 10)
+    assert every_5.to_numpy() == pytest.approx(expected, rel=2e-2)
+
+
+def test_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        GarchBacktester(refit_every=0)
+    with pytest.raises(ValueError):
+        GarchBacktester().run_array(np.zeros(10), 0, 5)
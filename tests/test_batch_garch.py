@@ -0,0 +1,49 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from arch import arch_model
+
+from batch_garch import BatchGarch11
+from conftest import garch_returns
+
+
+def arch_fit(returns: pd.Series):
+    return arch_model(returns, p=1, q=1, rescale=False).fit(disp="off")
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    returns = pd.DataFrame(
+        {
+            "AAA": garch_returns(800, seed=1),
+            "BBB": garch_returns(800, seed=2, alpha=0.05, beta=0.93),
+            "CCC": garch_returns(800, seed=3, omega=0.2, alpha=0.15, beta=0.6),
+        }
+    )
+    # A ticker listed later: the recursion starts at its first return
+    returns.iloc[:300, 2] = np.nan
+    return returns, BatchGarch11().fit(returns)
+
+
+def test_matches_arch_for_every_ticker(fitted):
+    returns, batch = fitted
+    assert batch.converged.all()
+    for ticker in returns:
+        result = arch_fit(returns[ticker].dropna())
+        # Same likelihood, so the optimum agrees within optimizer tolerance
+        assert batch.loglikelihood[ticker] == pytest.approx(result.loglikelihood, abs=1e-3)
+        assert batch.params.loc[ticker].to_numpy() == pytest.approx(result.params.to_numpy(), rel=5e-3, abs=1e-4)
+        volatility = batch.conditional_volatility()[ticker].dropna()
+        assert volatility.to_numpy() == pytest.approx(result.conditional_volatility.to_numpy(), rel=1e-3)
+        forecast = result.forecast(horizon=5, reindex=False).variance.iloc[-1].to_numpy()
+        assert batch.variance_forecast(5)[list(returns).index(ticker)] == pytest.approx(forecast, rel=2e-3)
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError):
+        BatchGarch11().fit(np.zeros(10))
+    with pytest.raises(ValueError):
+        BatchGarch11().fit(np.full((10, 2), np.nan))
+    with pytest.raises(ValueError):
+        BatchGarch11().conditional_volatility()
@@ -0,0 +1,40 @@
+# Import necessary libraries
+import pytest
+from pydantic import ValidationError
+from pydantic_settings import BaseSettings
+
+import config
+
+
+@pytest.fixture
+def fresh_config(monkeypatch, tmp_path):
+    """The config module with an empty `.env` and a cleared settings cache."""
+    # Set first so the key `load_dotenv` exports is removed again afterwards
+    monkeypatch.setenv("ALPHA_API_KEY", "")
+    monkeypatch.delenv("ALPHA_API_KEY")
+    monkeypatch.setattr(config, "env_path", str(tmp_path / ".env"))
+    monkeypatch.chdir(tmp_path)
+    config.get_settings.cache_clear()
+    yield config
+    config.get_settings.cache_clear()
+
+
+def test_settings_class_is_importable_without_a_key(fresh_config):
+    from config import Settings
+
+    assert issubclass(Settings, BaseSettings)
+    assert Settings.model_fields["alpha_api_key"].is_required()
+    assert Settings(alpha_api_key="abc").alpha_api_key == "abc"
+
+
+def test_settings_are_read_on_first_use_and_cached(fresh_config, monkeypatch, tmp_path):
+    with pytest.raises(ValidationError):
+        fresh_config.get_settings()
+
+    (tmp_path / ".env").write_text("ALPHA_API_KEY=from-dotenv\n")
+    settings = fresh_config.get_settings()
+    assert settings.alpha_api_key == "from-dotenv"
+    assert fresh_config.get_settings() is settings
+    assert fresh_config.settings is settings
+    with pytest.raises(AttributeError):
+        fresh_config.missing
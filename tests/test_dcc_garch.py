@@ -0,0 +1,95 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from dcc_garch import DCCGarch, _normalize
+
+
+def simulate_dcc(n_obs, target, a, b, seed=0):
+    """Standardized residuals whose correlation follows a DCC(1,1) with the given target."""
+    rng = np.random.default_rng(seed)
+    q = target.copy()
+    z = np.empty((n_obs, len(target)))
+    for t in range(n_obs):
+        z[t] = np.linalg.cholesky(_normalize(q)) @ rng.standard_normal(len(target))
+        q = (1 - a - b) * target + a * np.outer(z[t], z[t]) + b * q
+    return pd.DataFrame(z, columns=[f"T{i}" for i in range(len(target))])
+
+
+def loop_q(z, target, a, b):
+    """Q_1..Q_{T+1} by the textbook recursion, one date at a time."""
+    q = [target]
+    for t in range(len(z)):
+        q.append((1 - a - b) * target + a * np.outer(z[t], z[t]) + b * q[-1])
+    return np.array(q)
+
+
+@pytest.fixture(scope="module")
+def three_names():
+    target = np.array([[1.0, 0.5, 0.2], [0.5, 1.0, 0.3], [0.2, 0.3, 1.0]])
+    return DCCGarch().fit(simulate_dcc(1500, target, 0.05, 0.9, seed=1))
+
+
+def test_recovers_the_dcc_parameters_of_two_names():
+    target = np.array([[1.0, 0.5], [0.5, 1.0]])
+    std_resid = simulate_dcc(4000, target, 0.08, 0.9, seed=0)
+    model = DCCGarch().fit(std_resid)
+    assert model.converged
+    assert model.a == pytest.approx(0.08, abs=0.025)
+    assert model.b == pytest.approx(0.9, abs=0.04)
+    assert model.a + model.b == pytest.approx(0.98, abs=0.015)
+    # Correlation targeting: S is the sample correlation of the residuals
+    z = std_resid.to_numpy()
+    np.testing.assert_allclose(model.target, _normalize(z.T @ z / len(z)))
+
+
+def test_two_name_likelihood_is_the_bivariate_normal_likelihood():
+    target = np.array([[1.0, 0.4], [0.4, 1.0]])
+    std_resid = simulate_dcc(300, target, 0.04, 0.9, seed=2)
+    model = DCCGarch().fit(std_resid)
+    z = std_resid.to_numpy()
+    rho = np.array([_normalize(q)[0, 1] for q in loop_q(z, model.target, model.a, model.b)[:-1]])
+    loglik = sum(
+        stats.multivariate_normal.logpdf(z[t], cov=[[1.0, rho[t]], [rho[t], 1.0]]) for t in range(len(z))
+    )
+    # The repo drops the constant -log(2 pi) per date
+    assert model.loglikelihood == pytest.approx(loglik + len(z) * np.log(2 * np.pi), rel=1e-8)
+
+
+def test_filtered_paths_match_the_loop_recursion(three_names):
+    model = three_names
+    q = loop_q(model._z, model.target, model.a, model.b)
+    correlations = np.array([_normalize(q_t) for q_t in q])
+
+    paths = model.conditional_correlation([("T0", "T1"), ("T0", "T2"), ("T1", "T2")])
+    np.testing.assert_allclose(paths["T0/T1"], correlations[:-1, 0, 1], rtol=1e-10)
+    np.testing.assert_allclose(paths["T0/T2"], correlations[:-1, 0, 2], rtol=1e-10)
+    np.testing.assert_allclose(paths["T1/T2"], correlations[:-1, 1, 2], rtol=1e-10)
+    np.testing.assert_allclose(model.correlation_next, correlations[-1], rtol=1e-10)
+
+
+def test_forecasts_revert_to_the_target_and_agree(three_names):
+    model = three_names
+    correlation = model.forecast_correlation(2000)
+    np.testing.assert_allclose(correlation[0], model.correlation_next)
+    np.testing.assert_allclose(correlation[-1], model.target, atol=1e-8)
+    persistence = model.a + model.b
+    expected = (1 - persistence**4) * model.target + persistence**4 * model.correlation_next
+    np.testing.assert_allclose(correlation[4], expected)
+
+    variances = np.array([[1.0, 1.2, 1.4], [2.0, 1.9, 1.8], [0.5, 0.6, 0.7]])
+    weights = np.array([0.5, 0.3, 0.2])
+    covariance = model.forecast_covariance(variances)
+    daily = np.einsum("n,hnm,m->h", weights, covariance, weights)
+    table = model.portfolio_volatility(pd.Series(weights, index=model.tickers), variances)
+    np.testing.assert_allclose(table["volatility"], np.sqrt(daily))
+    np.testing.assert_allclose(table["cumulative_volatility"], np.sqrt(np.cumsum(daily)))
+
+
+def test_requires_two_names():
+    with pytest.raises(ValueError):
+        DCCGarch().fit(pd.DataFrame({"A": np.ones(50)}))
+    with pytest.raises(ValueError):
+        DCCGarch().forecast_correlation(5)
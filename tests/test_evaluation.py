@@ -0,0 +1,57 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from evaluation import band_hit_rate, evaluate_forecasts, mincer_zarnowitz, mse, qlike
+
+
+@pytest.fixture
+def forecasts():
+    rng = np.random.default_rng(0)
+    variance = rng.uniform(0.5, 3.0, size=(300, 3))
+    proxy = variance * rng.chisquare(1, size=(300, 3)) * np.array([1.0, 1.3, 0.8])
+    # Paths of different lengths share the array
+    variance[:40, 1] = np.nan
+    proxy[250:, 2] = np.nan
+    return proxy, variance
+
+
+def test_losses_match_per_column_means(forecasts):
+    proxy, variance = forecasts
+    for k in range(3):
+        valid = ~np.isnan(proxy[:, k]) & ~np.isnan(variance[:, k])
+        p, h = proxy[valid, k], variance[valid, k]
+        assert qlike(proxy, variance)[k] == pytest.approx(np.mean(np.log(h) + p / h))
+        assert mse(proxy, variance)[k] == pytest.approx(np.mean((p - h) ** 2))
+        returns = np.sqrt(p)
+        hit_rate = np.mean(returns <= 2 * np.sqrt(h))
+        assert band_hit_rate(np.sqrt(proxy), np.sqrt(variance))[k] == pytest.approx(hit_rate)
+
+
+def test_mincer_zarnowitz_matches_statsmodels_ols(forecasts):
+    proxy, variance = forecasts
+    table = mincer_zarnowitz(proxy, variance)
+    for k in range(3):
+        valid = ~np.isnan(proxy[:, k]) & ~np.isnan(variance[:, k])
+        ols = sm.OLS(proxy[valid, k], sm.add_constant(variance[valid, k])).fit()
+        f_test = ols.f_test((np.eye(2), np.array([0.0, 1.0])))
+        row = table.iloc[k]
+        assert [row["alpha"], row["beta"]] == pytest.approx(ols.params, rel=1e-9)
+        assert row["r2"] == pytest.approx(ols.rsquared, rel=1e-9)
+        assert row["f_stat"] == pytest.approx(float(f_test.fvalue), rel=1e-9)
+        assert row["pvalue"] == pytest.approx(float(f_test.pvalue), rel=1e-6)
+
+
+def test_evaluate_forecasts_aligns_series_by_date():
+    dates = pd.bdate_range("2024-01-01", periods=50)
+    rng = np.random.default_rng(1)
+    returns = pd.Series(rng.normal(0, 1.2, 50), index=dates)
+    volatility = pd.Series(1.2, index=dates[10:], name="MSFT")
+    table = evaluate_forecasts(returns, volatility)
+    assert list(table.index) == ["MSFT"]
+    assert table.loc["MSFT", "n"] == 40
+    assert table.loc["MSFT", "qlike"] == pytest.approx(
+        np.mean(np.log(1.44) + returns.iloc[10:] ** 2 / 1.44)
+    )
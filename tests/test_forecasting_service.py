@@ -0,0 +1,98 @@
+# Import necessary libraries
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+
+from conftest import daily_bars
+from metrics import MetricsRegistry
+from stock_data_processor import APIStockProcessor
+
+# The service lives with the apps in `reports/app`
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "reports", "app"))
+from forecasting_service import ForecastService, build_server
+
+
+class SlowProcessor:
+    """Counts downloads and fits; each takes long enough for concurrent requests to overlap."""
+
+    def __init__(self):
+        self.processor = APIStockProcessor(api_key="test")
+        self.metrics = MetricsRegistry()
+        self.downloads = 0
+        self.fits = 0
+
+    def get_stock_data(self, ticker):
+        self.downloads += 1
+        time.sleep(0.1)
+        return daily_bars(300).iloc[::-1]
+
+    def extract_returns(self, df):
+        return self.processor.extract_returns(df)
+
+    def volatility_forecaster(self, returns, horizon, ticker=None):
+        self.fits += 1
+        time.sleep(0.1)
+        return self.processor.volatility_forecaster(returns, horizon)
+
+
+def test_concurrent_identical_requests_share_one_download_and_fit():
+    processor = SlowProcessor()
+    service = ForecastService(processor)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.forecast("FIXT", 5)))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert processor.downloads == 1
+    assert processor.fits == 1
+    assert len(results) == 6 and all(result == results[0] for result in results)
+    # Within the data TTL later requests reuse the returns
+    service.forecast("FIXT", 10)
+    assert processor.downloads == 1
+
+
+@pytest.fixture
+def server():
+    server = build_server("127.0.0.1", 0, workers=2, service=ForecastService(SlowProcessor()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url: str):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "ticker=", "ticker=FIXT&horizon=0", "ticker=FIXT&horizon=31", "ticker=FIXT&horizon=ten"],
+)
+def test_bad_requests_return_400(server, query):
+    status, body = get(f"{server}/forecast?{query}")
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_forecast_health_metrics_and_unknown_paths(server):
+    status, body = get(f"{server}/forecast?ticker=fixt&horizon=3&annualized=true")
+    assert status == 200
+    assert len(json.loads(body)) == 3
+    assert get(f"{server}/health") == (200, b'{"status": "ok"}')
+    assert get(f"{server}/metrics")[0] == 200
+    assert get(f"{server}/nothing")[0] == 404
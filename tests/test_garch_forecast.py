@@ -0,0 +1,40 @@
+# Import necessary libraries
+import numpy as np
+import pytest
+from arch import arch_model
+
+from conftest import garch_returns
+from garch_forecast import garch11_state, garch11_variance_path, garch11_volatility_path
+
+
+def recursion(omega, alpha, beta, sigma2_next, horizon):
+    """The multi-step forecast recursion: E[eps^2] = sigma^2 beyond the first day."""
+    path = [sigma2_next]
+    for _ in range(horizon - 1):
+        path.append(omega + (alpha + beta) * path[-1])
+    return np.array(path)
+
+
+def test_closed_form_path_equals_arch_forecast():
+    result = arch_model(garch_returns(1000), p=1, q=1, rescale=False).fit(disp="off")
+    state = garch11_state(result)
+    expected = result.forecast(horizon=30, reindex=False).variance.iloc[-1].to_numpy()
+    path = garch11_variance_path(
+        state["omega"], state["alpha"], state["beta"], state["sigma2_next"], 30
+    )
+    assert path == pytest.approx(expected, rel=1e-10)
+    assert garch11_volatility_path(
+        state["omega"], state["alpha"], state["beta"], state["sigma2_next"], 30
+    ) == pytest.approx(np.sqrt(expected), rel=1e-10)
+
+
+def test_vectorized_and_integrated_paths_follow_the_recursion():
+    omega = np.array([0.05, 0.1, 0.02])
+    alpha = np.array([0.1, 0.05, 0.1])
+    beta = np.array([0.85, 0.9, 0.9])  # The last model is integrated (alpha + beta = 1)
+    sigma2_next = np.array([2.0, 0.5, 1.0])
+    paths = garch11_variance_path(omega, alpha, beta, sigma2_next, 20)
+    assert paths.shape == (3, 20)
+    for i in range(3):
+        assert paths[i] == pytest.approx(recursion(omega[i], alpha[i], beta[i], sigma2_next[i], 20), rel=1e-12)
+    assert garch11_variance_path(0.05, 0.1, 0.85, 2.0, 20) == pytest.approx(paths[0], rel=1e-15)
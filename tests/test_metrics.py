@@ -0,0 +1,55 @@
+# Import necessary libraries
+import pytest
+
+from conftest import FixtureSession, daily_bars
+from metrics import MetricsRegistry
+from stock_data_processor import APIStockProcessor
+from transport import HTTPTransport
+
+
+def test_render_prometheus_text_format():
+    events = []
+    metrics = MetricsRegistry(sinks=[events.append])
+    metrics.observe("fit", 0.5, ticker="MSFT")
+    metrics.observe("fit", 1.5, ticker="MSFT")
+    metrics.increment("bytes_downloaded_total", 100, ticker="MSFT")
+    metrics.increment("bytes_downloaded_total", 50, ticker="MSFT")
+    metrics.set_gauge("fit_iterations", 12, ticker='A"B')
+
+    assert metrics.render_prometheus() == (
+        "# HELP stock_processor_stage_duration_seconds Time spent per processing stage.\n"
+        "# TYPE stock_processor_stage_duration_seconds summary\n"
+        'stock_processor_stage_duration_seconds_count{stage="fit",ticker="MSFT"} 2\n'
+        'stock_processor_stage_duration_seconds_sum{stage="fit",ticker="MSFT"} 2.000000\n'
+        "# TYPE stock_processor_stage_duration_max_seconds gauge\n"
+        'stock_processor_stage_duration_max_seconds{stage="fit",ticker="MSFT"} 1.500000\n'
+        "# TYPE stock_processor_bytes_downloaded_total counter\n"
+        'stock_processor_bytes_downloaded_total{ticker="MSFT"} 150\n'
+        "# TYPE stock_processor_fit_iterations gauge\n"
+        'stock_processor_fit_iterations{ticker="A\\"B"} 12\n'
+    )
+    assert [event["type"] for event in events] == ["timing", "timing", "counter", "counter", "gauge"]
+
+
+def test_timed_records_failing_stages():
+    metrics = MetricsRegistry()
+    with pytest.raises(RuntimeError):
+        with metrics.timed("parse"):
+            raise RuntimeError()
+    assert 'stock_processor_stage_duration_seconds_count{stage="parse"} 1' in metrics.render_prometheus()
+
+
+def test_processor_reports_download_and_cache_metrics(tmp_path):
+    session = FixtureSession(daily_bars(300))
+    processor = APIStockProcessor(
+        api_key="test",
+        cache_dir=str(tmp_path),
+        requests_per_minute=None,
+        transport=HTTPTransport(session=session),
+    )
+    processor.get_stock_data("FIXT")
+    text = processor.metrics.render_prometheus()
+    assert 'stock_processor_rows_parsed_total{ticker="FIXT"} 300\n' in text
+    assert 'stock_processor_price_cache_requests_total{result="full",ticker="FIXT"} 1\n' in text
+    for stage in ("get_stock_data", "network", "download_parse", "price_cache_merge"):
+        assert f'_count{{stage="{stage}",ticker="FIXT"}} 1\n' in text
@@ -0,0 +1,124 @@
+# Import necessary libraries
+import threading
+import time
+import pytest
+
+import model_cache
+from conftest import garch_returns
+from model_cache import ModelCache, fingerprint_returns
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ModelCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_cache.time, "monotonic", lambda: now[0])
+    cache = ModelCache(ttl=60)
+    cache.put("a", 1)
+    now[0] += 59
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_concurrent_callers_share_one_build():
+    cache = ModelCache()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(cache.get_or_create("a", factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(model is models[0] for model in models)
+
+
+def test_failed_build_keeps_later_callers_on_one_lock():
+    cache = ModelCache()
+    first_started, first_fail = threading.Event(), threading.Event()
+    retry_started, retry_finish = threading.Event(), threading.Event()
+    builds = []
+
+    def failing():
+        first_started.set()
+        first_fail.wait()
+        raise RuntimeError("fit failed")
+
+    def retry():
+        retry_started.set()
+        retry_finish.wait()
+        builds.append("retry")
+        return "model"
+
+    def late():
+        builds.append("late")
+        return "late model"
+
+    def call(factory, results):
+        try:
+            results.append(cache.get_or_create("a", factory))
+        except RuntimeError:
+            pass
+
+    results = []
+    first = threading.Thread(target=call, args=(failing, results))
+    first.start()
+    first_started.wait()
+    waiter = threading.Thread(target=call, args=(retry, results))
+    waiter.start()
+    time.sleep(0.05)  # The waiter is now blocked on the key lock
+    first_fail.set()
+    first.join()
+    retry_started.wait()
+    # Arrives while the waiter rebuilds: it must wait for that build, not start its own
+    late_caller = threading.Thread(target=call, args=(late, results))
+    late_caller.start()
+    time.sleep(0.05)
+    retry_finish.set()
+    waiter.join()
+    late_caller.join()
+    assert builds == ["retry"]
+    assert results == ["model", "model"]
+    assert cache._key_locks == {}
+
+
+def test_fingerprint_changes_with_new_data_or_spec():
+    returns = garch_returns(100)
+    fingerprint = fingerprint_returns(returns, p=1, q=1)
+    assert fingerprint == fingerprint_returns(returns.copy(), p=1, q=1)
+    assert fingerprint != fingerprint_returns(returns, p=2, q=1)
+    assert fingerprint != fingerprint_returns(returns.iloc[:-1], p=1, q=1)
+    revised = returns.copy()
+    revised.iloc[50] += 0.01
+    assert fingerprint != fingerprint_returns(revised, p=1, q=1)
+
+
+def test_failed_build_releases_its_key_lock():
+    def factory():
+        raise RuntimeError("fit failed")
+
+    cache = ModelCache()
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("a", factory)
+    assert cache._key_locks == {}
+    assert cache.get_or_create("a", lambda: "model") == "model"
@@ -0,0 +1,65 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from arch import arch_model
+
+from conftest import garch_returns
+from model_selection import GarchModelSelector, model_grid, spec_name
+from panel_store import ReturnsPanelStore
+
+SPECS = model_grid(families=("GARCH", "GJR"), max_p=1, max_q=1, dists=("normal", "t"))
+
+
+def test_grid_orders_every_spec_after_its_parent():
+    names = [spec_name(spec) for spec in model_grid()]
+    assert len(names) == 3 * 4 * 3
+    assert names.index("GARCH(1,1)-normal") < names.index("GARCH(1,1)-t") < names.index("GARCH(1,1)-skewt")
+    assert names.index("GARCH(1,1)-normal") < names.index("GARCH(2,1)-normal")
+
+
+def test_scores_match_cold_arch_fits():
+    returns = garch_returns(600)
+    scores = GarchModelSelector(SPECS, criterion="qlike", test_size=50).score(returns)
+    assert scores["qlike"].is_monotonic_increasing
+    values = returns.to_numpy()
+    for spec in SPECS:
+        result = arch_model(values, rescale=False, **spec).fit(disp=0, last_obs=550)
+        row = scores.loc[spec_name(spec)]
+        # Warm starts reach the same optimum as a cold fit
+        assert row["loglikelihood"] == pytest.approx(result.loglikelihood, abs=1e-3)
+        assert row["bic"] == pytest.approx(result.bic, abs=1e-2)
+        variance = result.forecast(horizon=1, start=549, reindex=False).variance.to_numpy()[:-1, 0]
+        expected = np.mean(np.log(variance) + values[550:] ** 2 / variance)
+        assert row["qlike"] == pytest.approx(expected, rel=1e-3)
+
+
+def test_parallel_runs_match_the_serial_scores(tmp_path):
+    returns_by_ticker = {"AAA": garch_returns(400, seed=1), "BBB": garch_returns(400, seed=2)}
+    selector = GarchModelSelector(SPECS, test_size=50, max_workers=2)
+    serial = {ticker: selector.score(returns) for ticker, returns in returns_by_ticker.items()}
+    columns = ["loglikelihood", "aic", "bic", "qlike"]
+
+    parallel = selector.run(returns_by_ticker)
+    assert list(parallel) == ["AAA", "BBB"]
+    # The same returns, read from a memory-mapped panel store in the workers
+    store = ReturnsPanelStore.create(str(tmp_path), returns_by_ticker["AAA"].index, ["AAA", "BBB"])
+    store.returns_matrix[:] = pd.DataFrame(returns_by_ticker).to_numpy()
+    store.flush()
+    from_store = selector.run(ReturnsPanelStore.open(str(tmp_path)))
+    for ticker in returns_by_ticker:
+        pd.testing.assert_frame_equal(parallel[ticker][columns], serial[ticker][columns])
+        pd.testing.assert_frame_equal(from_store[ticker][columns], serial[ticker][columns])
+
+    best = selector.best_specs(serial)
+    for ticker, spec in best.items():
+        assert spec_name(spec) == serial[ticker]["bic"].idxmin()
+
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        GarchModelSelector(criterion="mse")
+    with pytest.raises(ValueError):
+        GarchModelSelector(criterion="qlike", test_size=0)
+    with pytest.raises(ValueError):
+        GarchModelSelector(test_size=50).score(garch_returns(120))
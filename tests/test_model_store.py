@@ -0,0 +1,102 @@
+# Import necessary libraries
+import json
+import numpy as np
+import pytest
+from arch import arch_model
+
+import model_store
+from conftest import garch_returns
+from model_cache import fingerprint_returns
+from model_store import ModelStore
+from online_garch import OnlineGarch
+from stock_data_processor import APIStockProcessor
+
+GARCH11 = {"vol": "GARCH", "p": 1, "o": 0, "q": 1, "dist": "normal"}
+GJR_T = {"vol": "GARCH", "p": 1, "o": 1, "q": 1, "dist": "t"}
+
+
+def fit(returns, spec):
+    return arch_model(returns, rescale=False, **spec).fit(disp="off")
+
+
+@pytest.fixture(scope="module")
+def returns():
+    return garch_returns(800, seed=11)
+
+
+@pytest.mark.parametrize("spec", [GARCH11, GJR_T])
+def test_round_trip_restores_the_fitted_forecasts(tmp_path, returns, spec):
+    result = fit(returns, spec)
+    key = fingerprint_returns(returns, **spec)
+    ModelStore(str(tmp_path)).save("aaa", result, spec, key)
+
+    # A new store (a new process) reads the snapshot back from disk
+    snapshot = ModelStore(str(tmp_path)).load("AAA", spec, key)
+    assert snapshot["spec"] == spec
+    assert snapshot["n_obs"] == len(returns)
+    assert snapshot["params"] == pytest.approx(result.params.to_dict(), rel=1e-15)
+
+    restored = ModelStore.restore(snapshot, returns)
+    expected = result.forecast(horizon=10, reindex=False).variance.to_numpy()
+    actual = restored.forecast(horizon=10, reindex=False).variance.to_numpy()
+    np.testing.assert_allclose(actual, expected, rtol=1e-10)
+    assert snapshot["state"]["sigma2_next"] == pytest.approx(expected[0, 0], rel=1e-12)
+
+
+def test_stale_other_version_and_unreadable_snapshots_are_ignored(tmp_path, returns, monkeypatch):
+    store = ModelStore(str(tmp_path))
+    key = fingerprint_returns(returns, **GARCH11)
+    store.save("AAA", fit(returns, GARCH11), GARCH11, key)
+
+    assert store.load("BBB", GARCH11, key) is None
+    assert store.load("AAA", GJR_T) is None
+    # A new bar changes the fingerprint
+    new_key = fingerprint_returns(garch_returns(801, seed=11), **GARCH11)
+    assert store.load("AAA", GARCH11, new_key) is None
+    assert store.load("AAA", GARCH11, key) is not None
+
+    monkeypatch.setattr(model_store, "SNAPSHOT_VERSION", 2)
+    assert ModelStore(str(tmp_path)).load("AAA", GARCH11, key) is None
+    monkeypatch.undo()
+
+    with open(store.path("AAA", GARCH11), "w") as f:
+        f.write("{not json")
+    assert ModelStore(str(tmp_path)).load("AAA", GARCH11, key) is None
+
+
+def test_processor_forecasts_from_a_snapshot_without_refitting(tmp_path, returns, monkeypatch):
+    first = APIStockProcessor(api_key="test", model_dir=str(tmp_path))
+    expected = first.volatility_path(returns, 10, ticker="AAA")
+    expected_gjr = first.volatility_path(returns, 10, ticker="AAA", o=1, dist="t")
+    with open(first.model_store.path("AAA", GARCH11)) as f:
+        assert json.load(f)["fingerprint"] == fingerprint_returns(returns, **GARCH11)
+
+    # The fast path needs neither a fit nor a rebuilt arch result
+    def refuse(*args, **kwargs):
+        raise AssertionError("The snapshot should be used as is.")
+
+    second = APIStockProcessor(api_key="test", model_dir=str(tmp_path))
+    monkeypatch.setattr(ModelStore, "restore", staticmethod(refuse))
+    monkeypatch.setattr("arch.arch_model", refuse)
+    np.testing.assert_allclose(second.volatility_path(returns, 10, ticker="AAA"), expected, rtol=1e-12)
+    monkeypatch.undo()
+
+    # Other specs are restored with fixed parameters instead of refitted
+    np.testing.assert_allclose(
+        second.volatility_path(returns, 10, ticker="AAA", o=1, dist="t"), expected_gjr, rtol=1e-10
+    )
+    stages = {stage for stage, _ in second.metrics._timings}
+    assert "snapshot_restore" in stages and "fit" not in stages
+
+
+def test_online_state_from_a_snapshot(tmp_path, returns):
+    result = fit(returns, GARCH11)
+    snapshot = ModelStore(str(tmp_path)).save("AAA", result, GARCH11, "key")
+    online, reference = OnlineGarch.from_snapshot(snapshot), OnlineGarch.from_result(result)
+    for value in garch_returns(20, seed=12):
+        online.update(value)
+        reference.update(value)
+    assert online.forecast(5) == pytest.approx(reference.forecast(5), rel=1e-12)
+
+    with pytest.raises(ValueError):
+        OnlineGarch.from_snapshot(ModelStore(str(tmp_path)).save("AAA", fit(returns, GJR_T), GJR_T, "key"))
@@ -0,0 +1,74 @@
+# Import necessary libraries
+import numpy as np
+import pytest
+from arch import arch_model
+
+from batch_garch import BatchGarch11
+from conftest import garch_returns
+from online_garch import OnlineGarch
+
+
+def arch_fit(returns):
+    return arch_model(returns, p=1, q=1, rescale=False).fit(disp="off")
+
+
+def test_updates_equal_the_recursion_of_the_fitted_model_on_all_returns():
+    returns = garch_returns(700)
+    result = arch_fit(returns.iloc[:600])
+    online = OnlineGarch.from_result(result)
+    for value in returns.iloc[600:]:
+        online.update(value)
+
+    # The same parameters run over every return (no refit)
+    fixed = arch_model(returns, p=1, q=1, rescale=False).fix(result.params.to_numpy())
+    expected = fixed.forecast(horizon=10, reindex=False).variance.iloc[-1].to_numpy()
+    assert online.next_volatility == pytest.approx(np.sqrt(expected[0]), rel=1e-10)
+    assert online.forecast(10) == pytest.approx(np.sqrt(expected), rel=1e-10)
+
+
+def test_array_updates_match_one_state_per_ticker():
+    returns = np.column_stack([garch_returns(400, seed=seed).to_numpy() for seed in (1, 2, 3)])
+    batch = BatchGarch11().fit(returns[:350])
+    book = OnlineGarch.from_batch(batch)
+    singles = [
+        OnlineGarch(*batch.params.iloc[i].to_numpy(), batch.sigma2_next.iloc[i]) for i in range(3)
+    ]
+    for row in returns[350:]:
+        book.update(row)
+        for single, value in zip(singles, row):
+            single.update(value)
+    assert book.next_volatility == pytest.approx([s.next_volatility for s in singles], rel=1e-12)
+    # A batch refit replaces the whole book's state
+    book.refit(batch)
+    assert book.n_updates == 0
+    assert book.sigma2_next == pytest.approx(batch.sigma2_next.to_numpy())
+
+
+def test_missing_return_follows_the_expected_path():
+    online = OnlineGarch(0.0, 0.05, 0.1, 0.85, 1.0)
+    online.update(np.nan)
+    assert online.sigma2_next == pytest.approx(0.05 + 0.95 * 1.0)
+
+
+def test_drift_check_fires_and_refit_restarts_it():
+    calm = garch_returns(600, seed=4)
+    online = OnlineGarch.from_result(arch_fit(calm), drift_window=30)
+    # Returns five times as volatile as the fitted model expects
+    for value in 5 * garch_returns(30, seed=5).to_numpy():
+        online.update(value)
+    assert online.needs_refit()
+
+    online.refit(arch_fit(calm))
+    assert online.n_updates == 0
+    assert not online.needs_refit()
+
+
+def test_refit_schedule_and_invalid_window():
+    online = OnlineGarch(0.0, 0.05, 0.1, 0.85, 1.0, refit_every=3)
+    for _ in range(2):
+        online.update(0.5)
+    assert not online.needs_refit()
+    online.update(0.5)
+    assert online.needs_refit()
+    with pytest.raises(ValueError):
+        OnlineGarch(0.0, 0.05, 0.1, 0.85, 1.0, drift_window=0)
@@ -0,0 +1,26 @@
+# Import necessary libraries
+import numpy as np
+import pytest
+
+from conftest import daily_bars
+from panel_store import ReturnsPanelStore
+
+
+def test_build_aligns_tickers_on_the_shared_date_axis(tmp_path):
+    bars = daily_bars(30)
+    store = ReturnsPanelStore.build(str(tmp_path), {"AAA": bars, "BBB": bars.iloc[10:]})
+    close = store.close_prices()
+    assert close["AAA"].to_numpy() == pytest.approx(bars["close"].to_numpy())
+    assert np.isnan(close["BBB"].iloc[:10]).all()
+    assert np.isnan(store.returns_array("BBB")[10])  # No return before the first price
+
+
+@pytest.mark.parametrize("extra", ["after", "between"])
+def test_dates_off_the_axis_raise(tmp_path, extra):
+    bars = daily_bars(30)
+    store = ReturnsPanelStore.create(str(tmp_path), bars.index[::2], ["AAA"])
+    # A bar newer than the axis, or one on a date the axis skipped
+    close = daily_bars(31)["close"] if extra == "after" else bars["close"].iloc[:2]
+    with pytest.raises(ValueError, match="not on the store's date axis"):
+        store.write_ticker("AAA", close)
+    assert np.isnan(store.close_matrix).all()
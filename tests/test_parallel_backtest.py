@@ -0,0 +1,22 @@
+# Import necessary libraries
+import pandas as pd
+
+from backtest import GarchBacktester
+from conftest import garch_returns
+from parallel_backtest import ParallelBacktestRunner
+
+
+def test_parallel_folds_match_the_serial_backtest():
+    returns_by_ticker = {
+        "AAA": garch_returns(400, seed=1),
+        "BBB": garch_returns(450, seed=2),
+        "CCC": garch_returns(420, seed=3),
+    }
+    # Without warm starts each fold starts from the same state the serial run has there
+    backtester = GarchBacktester(refit_every=1, warm_start=False)
+    runner = ParallelBacktestRunner(backtester, max_workers=2, n_folds=3)
+    forecasts = runner.run(returns_by_ticker, test_size=9)
+
+    assert list(forecasts) == list(returns_by_ticker)  # Input order
+    for ticker, returns in returns_by_ticker.items():
+        pd.testing.assert_series_equal(forecasts[ticker], backtester.run(returns, 9))
@@ -0,0 +1,60 @@
+# Import necessary libraries
+from conftest import FixtureSession, daily_bars
+from price_cache import PriceCache
+from stock_data_processor import APIStockProcessor
+from transport import HTTPTransport
+
+
+def make_processor(cache_dir, session) -> APIStockProcessor:
+    return APIStockProcessor(
+        api_key="test",
+        cache_dir=str(cache_dir),
+        requests_per_minute=None,
+        transport=HTTPTransport(session=session),
+    )
+
+
+def test_compact_then_full_downloads_the_full_history(tmp_path):
+    session = FixtureSession(daily_bars(300))
+    processor = make_processor(tmp_path, session)
+
+    assert len(processor.get_stock_data("FIXT", outputsize="compact")) == 100
+    # A cache started from a compact fetch must not serve a full request
+    assert len(processor.get_stock_data("FIXT")) == 300
+    # Once the full history is cached, full requests are incremental
+    assert len(processor.get_stock_data("FIXT")) == 300
+    assert session.output_sizes == ["compact", "full", "compact"]
+
+
+def test_cache_without_full_history_flag_is_refreshed_in_full(tmp_path):
+    bars = daily_bars(300)
+    cache = PriceCache(str(tmp_path))
+    cache.save("FIXT", bars.iloc[::-1])  # e.g. a file written before the flag existed
+    assert not cache.has_full_history(cache.load("FIXT"))
+
+    session = FixtureSession(bars)
+    make_processor(tmp_path, session).get_stock_data("FIXT")
+    assert session.output_sizes == ["full"]
+    assert cache.has_full_history(cache.load("FIXT"))
+
+
+def test_stale_full_cache_is_refreshed_in_full(tmp_path):
+    bars = daily_bars(400)
+    cache = PriceCache(str(tmp_path))
+    # The newest cached bar is older than the compact window
+    cache.save("FIXT", bars.iloc[:250].iloc[::-1], full_history=True)
+
+    session = FixtureSession(bars)
+    assert len(make_processor(tmp_path, session).get_stock_data("FIXT")) == 400
+    assert session.output_sizes == ["full"]
+
+
+def test_offline_compact_returns_the_latest_bars_as_online(tmp_path):
+    bars = daily_bars(300)
+    make_processor(tmp_path, FixtureSession(bars)).get_stock_data("FIXT")
+
+    offline = APIStockProcessor(cache_dir=str(tmp_path), offline=True)
+    df_compact = offline.get_stock_data("FIXT", outputsize="compact")
+    assert len(df_compact) == 100
+    assert df_compact.index[0] == bars.index[-1]  # The newest bars, newest first
+    assert len(offline.get_stock_data("FIXT")) == 300
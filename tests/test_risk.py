@@ -0,0 +1,82 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from arch import arch_model
+from arch.univariate import SkewStudent
+
+from batch_garch import BatchGarch11
+from conftest import garch_returns
+from risk import RiskEngine, standardized_tail
+from simulation import GarchSimulator
+
+
+def fit(returns, **spec):
+    return arch_model(returns, rescale=False, **spec).fit(disp="off")
+
+
+def tail_of(paths, tail):
+    """Empirical lower-tail quantile and expected shortfall of simulated returns."""
+    quantile = np.quantile(paths, tail)
+    return quantile, paths[paths <= quantile].mean()
+
+
+def test_skew_t_tail_matches_arch():
+    quantile, shortfall = standardized_tail(0.01, nu=6.0, lam=-0.3)
+    assert quantile == pytest.approx(SkewStudent().ppf(0.01, np.array([6.0, -0.3])), rel=1e-8)
+    draws = SkewStudent().ppf(np.random.default_rng(0).random(2_000_000), np.array([6.0, -0.3]))
+    assert shortfall == pytest.approx(draws[draws <= quantile].mean(), rel=1e-2)
+
+
+def test_multi_day_fhs_matches_a_monte_carlo_bootstrap():
+    returns = garch_returns(2000, seed=3)
+    results = {"GJR": fit(returns, p=1, o=1, q=1), "GARCH": fit(returns * 1.5, p=1, q=1)}
+    engine = RiskEngine(levels=(0.99, 0.95), horizons=(1, 10), n_paths=100_000, seed=0)
+    table = engine.run(**engine.inputs_from_results(results))
+
+    for ticker, result in results.items():
+        cumulative, _ = GarchSimulator(n_paths=200_000, method="bootstrap", seed=1).simulate_paths(
+            result, 10
+        )
+        for level in engine.levels:
+            quantile, shortfall = tail_of(cumulative[9], 1 - level)
+            assert table.loc[ticker, f"fhs_var_{level * 100:g}_10d"] == pytest.approx(-quantile, rel=3e-2)
+            assert table.loc[ticker, f"fhs_es_{level * 100:g}_10d"] == pytest.approx(-shortfall, rel=3e-2)
+
+
+def test_one_day_fhs_is_the_empirical_residual_tail():
+    returns = garch_returns(1000, seed=4)
+    result = fit(returns, p=1, q=1)
+    engine = RiskEngine(levels=(0.99,), horizons=(1, 5), n_paths=1000, seed=0)
+    inputs = engine.inputs_from_results({"A": result})
+    table = engine.run(**inputs)
+
+    z = np.sort(inputs["std_resid"][:, 0])
+    k = int(0.01 * len(z))
+    sigma = np.sqrt(inputs["variances"][0, 0])
+    assert table.loc["A", "fhs_var_99_1d"] == pytest.approx(-(inputs["mu"][0] + sigma * z[k - 1]))
+    assert table.loc["A", "fhs_es_99_1d"] == pytest.approx(-(inputs["mu"][0] + sigma * z[:k].mean()))
+
+    # Without the GARCH parameters FHS covers one day only
+    inputs.pop("garch")
+    assert "fhs_var_99_5d" not in engine.run(**inputs).columns
+
+
+def test_chunking_seeding_and_unsupported_specs():
+    returns = pd.DataFrame({f"T{i}": garch_returns(800, seed=i) for i in range(5)})
+    batch = BatchGarch11().fit(returns)
+    inputs = RiskEngine().inputs_from_batch(batch, returns)
+    whole = RiskEngine(n_paths=2000, seed=7).run(**inputs)
+    again = RiskEngine(n_paths=2000, seed=7).run(**inputs)
+    chunked = RiskEngine(n_paths=2000, chunk_size=4000, seed=7).run(**inputs)
+    pd.testing.assert_frame_equal(whole, again)
+    assert list(chunked.columns) == list(whole.columns)
+    assert np.isfinite(chunked.to_numpy()).all()
+
+    # EGARCH has no GARCH(1,1) recursion to bootstrap along
+    egarch = fit(returns["T0"], vol="EGARCH", p=1, o=1, q=1)
+    engine = RiskEngine(n_paths=1000, seed=0)
+    table = engine.run(**engine.inputs_from_results({"E": egarch, "G": fit(returns["T1"])}))
+    assert np.isnan(table.loc["E", "fhs_var_99_10d"])
+    assert np.isfinite(table.loc["E", "fhs_var_99_1d"])
+    assert np.isfinite(table.loc["G", "fhs_var_99_10d"])
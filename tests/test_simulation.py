@@ -0,0 +1,73 @@
+# Import necessary libraries
+import numpy as np
+import pytest
+from arch import arch_model
+from arch.univariate import SkewStudent
+from scipy import stats
+
+from conftest import garch_returns
+from simulation import GarchSimulator, _skew_t_draws, variance_path
+
+
+def fit(returns, **spec):
+    return arch_model(returns, rescale=False, **spec).fit(disp="off")
+
+
+@pytest.fixture(scope="module")
+def returns():
+    return garch_returns(1500, seed=7)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"p": 1, "q": 1},
+        {"p": 1, "o": 1, "q": 1, "dist": "t"},
+        {"p": 2, "q": 1, "dist": "skewt"},
+    ],
+)
+def test_mean_simulated_variance_matches_the_analytic_forecast(returns, spec):
+    result = fit(returns, **spec)
+    expected = result.forecast(horizon=10, reindex=False).variance.iloc[-1].to_numpy()
+    _, variances = GarchSimulator(n_paths=100_000, chunk_size=30_000, seed=1).simulate_paths(result, 10)
+    # Day 1 is known exactly; later days within Monte Carlo error
+    assert variances[0] == pytest.approx(expected[0], rel=1e-12)
+    assert variances.mean(axis=1) == pytest.approx(expected, rel=2e-2)
+
+
+def test_skew_t_draws_follow_arch_distribution():
+    eta, lam = 6.0, -0.3
+    draws = _skew_t_draws(np.random.default_rng(0), eta, lam, 200_000)
+    assert draws.mean() == pytest.approx(0.0, abs=0.01)
+    assert draws.var() == pytest.approx(1.0, abs=0.02)
+    cdf = lambda x: SkewStudent().cdf(x, np.array([eta, lam]))
+    assert stats.kstest(draws[:20_000], cdf).pvalue > 0.01
+
+
+def test_forecast_quantiles_and_bootstrap(returns):
+    result = fit(returns, p=1, q=1)
+    simulator = GarchSimulator(n_paths=20_000, method="bootstrap", seed=3)
+    table = simulator.forecast(result, 5)
+    assert list(table.index) == [1, 2, 3, 4, 5]
+    quantiles = table["cumulative_return"].to_numpy()
+    assert (np.diff(quantiles, axis=1) >= 0).all()
+    # The bootstrap resamples standardized residuals with unit variance on average
+    expected = np.sqrt(result.forecast(horizon=5, reindex=False).variance.iloc[-1].to_numpy())
+    assert table[("volatility", "mean")].to_numpy() == pytest.approx(expected, rel=3e-2)
+    # The same seed gives the same paths, whatever the chunking
+    a = GarchSimulator(n_paths=1000, chunk_size=1000, seed=5).simulate_paths(result, 3)[1]
+    b = GarchSimulator(n_paths=1000, chunk_size=1000, seed=5).simulate_paths(result, 3)[1]
+    assert np.array_equal(a, b)
+
+
+def test_variance_path_simulates_only_egarch_beyond_one_day(returns):
+    garch = fit(returns, p=1, q=1)
+    assert variance_path(garch, 5) == pytest.approx(
+        garch.forecast(horizon=5, reindex=False).variance.iloc[-1].to_numpy(), rel=1e-12
+    )
+    egarch = fit(returns, vol="EGARCH", p=1, o=1, q=1)
+    path = variance_path(egarch, 5)
+    assert path[0] == pytest.approx(egarch.forecast(horizon=1, reindex=False).variance.iloc[-1, 0], rel=1e-10)
+    assert np.array_equal(path, variance_path(egarch, 5))
+    with pytest.raises(ValueError):
+        GarchSimulator(method="historical")
@@ -0,0 +1,81 @@
+# Import necessary libraries
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from alpha_vantage_parser import RateLimitError
+from conftest import FixtureResponse, daily_bars
+from stock_data_processor import APIStockProcessor
+from transport import HTTPTransport
+
+
+class MessageSession:
+    """Answers every request with the same Alpha Vantage message payload."""
+
+    def __init__(self, payload: dict):
+        self.payload = json.dumps(payload).encode()
+        self.calls = 0
+
+    def get(self, url: str, **kwargs):
+        self.calls += 1
+        return FixtureResponse(self.payload)
+
+
+def make_processor(session) -> APIStockProcessor:
+    transport = HTTPTransport(session=session, max_retries=2, backoff_factor=0.0)
+    return APIStockProcessor(api_key="test", requests_per_minute=None, transport=transport)
+
+
+def test_premium_information_is_not_retried():
+    session = MessageSession({"Information": "The outputsize=full parameter value is a premium feature."})
+    processor = make_processor(session)
+    with pytest.raises(ValueError, match="premium feature"):
+        processor.get_many(["FIXT"])
+    assert session.calls == 1
+
+
+def test_rate_limit_note_is_retried_with_backoff():
+    session = MessageSession({"Note": "Our standard API call frequency is 5 calls per minute."})
+    processor = make_processor(session)
+    with pytest.raises(RateLimitError):
+        processor.get_stock_data("FIXT")
+    assert session.calls == 3  # The first request and max_retries=2 retries
+
+
+def test_get_many_retries_rate_limits_in_one_layer_only():
+    session = MessageSession({"Note": "Our standard API call frequency is 5 calls per minute."})
+    processor = make_processor(session)
+    frames = processor.get_many(["FIXT"], return_exceptions=True)
+    assert isinstance(frames["FIXT"], RateLimitError)
+    assert session.calls == 3  # Not multiplied by a second retry loop in get_many
+
+
+def test_returns_span_missing_prices_the_same_way_everywhere(tmp_path):
+    from panel_store import ReturnsPanelStore
+
+    bars = daily_bars(40)
+    # Another calendar: no prices on some days, including the first day of a limited window
+    gappy = bars.copy()
+    gappy.iloc[[5, 6, 20, 28], gappy.columns.get_loc("close")] = np.nan
+    processor = APIStockProcessor(api_key="test")
+    close = processor.close_matrix({"FULL": bars, "GAPPY": gappy})
+
+    expected = processor.extract_returns(gappy.iloc[::-1], limit=None)
+    assert len(expected) == 40 - 4 - 1
+    kept = gappy["close"].dropna()
+    assert expected.loc[kept.index[19]] == pytest.approx((kept.iloc[19] / kept.iloc[18] - 1) * 100)
+
+    matrix = processor.extract_returns_matrix(close, limit=None)
+    pd.testing.assert_series_equal(
+        matrix["GAPPY"].dropna(), expected, check_names=False, check_freq=False, rtol=1e-12
+    )
+    # The window's first price is missing: its first return spans back past the window
+    limited = processor.extract_returns_matrix(close, limit=11)
+    assert len(limited) == 11
+    assert limited["GAPPY"].to_numpy() == pytest.approx(expected.iloc[-11:].to_numpy())
+    assert limited["FULL"].to_numpy() == pytest.approx(processor.extract_returns(bars, limit=11).to_numpy())
+    assert processor.extract_returns(gappy, limit=9).to_numpy() == pytest.approx(expected.iloc[-9:].to_numpy())
+
+    store = ReturnsPanelStore.build(str(tmp_path), {"GAPPY": gappy})
+    assert store.returns(["GAPPY"])["GAPPY"].dropna().to_numpy() == pytest.approx(expected.to_numpy())
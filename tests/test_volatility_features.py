@@ -0,0 +1,55 @@
+# Import necessary libraries
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.stattools import acf
+
+from conftest import daily_bars, garch_returns
+from volatility_features import VolatilityFeatureEngine, squared_acf
+
+
+@pytest.fixture
+def returns():
+    returns = pd.DataFrame({f"T{i}": garch_returns(500, seed=i) for i in range(3)})
+    returns.iloc[:30, 1] = np.nan  # Listed later
+    returns.iloc[200, 2] = np.nan  # One missing day
+    return returns
+
+
+def test_rolling_volatility_matches_pandas(returns):
+    engine = VolatilityFeatureEngine(windows=(10, 60))
+    for window, frame in engine.rolling_volatility(returns).items():
+        pd.testing.assert_frame_equal(frame, returns.rolling(window).std(), rtol=1e-9)
+
+
+def test_ewma_volatility_matches_pandas(returns):
+    engine = VolatilityFeatureEngine(ewma_lambdas=(0.94, 0.97))
+    for lam, frame in engine.ewma_volatility(returns).items():
+        expected = np.sqrt((returns**2).ewm(alpha=1 - lam).mean())
+        pd.testing.assert_frame_equal(frame, expected, rtol=1e-9)
+
+
+def test_squared_acf_matches_statsmodels(returns):
+    values = returns["T0"].to_numpy()
+    expected = acf(values**2, nlags=20, fft=True)
+    assert squared_acf(values[:, None], 20)[:, 0] == pytest.approx(expected, rel=1e-9)
+
+
+def test_range_estimators_and_compute_match_pandas():
+    frames = {"AAA": daily_bars(120, seed=1), "BBB": daily_bars(120, seed=2).iloc[20:]}
+    engine = VolatilityFeatureEngine(windows=(10,), ewma_lambdas=(0.94,), annualize=True)
+    ohlc = engine.ohlc_matrices(frames)
+
+    daily = np.log(ohlc["high"] / ohlc["low"]) ** 2 / (4 * np.log(2)) * 100**2
+    expected = np.sqrt(daily.rolling(10).mean()) * np.sqrt(252)
+    pd.testing.assert_frame_equal(engine.parkinson_volatility(ohlc["high"], ohlc["low"])[10], expected, rtol=1e-9)
+
+    features = engine.compute(frames)
+    assert sorted(features.columns.get_level_values("feature").unique()) == [
+        "ewma_0.94", "garman_klass_10", "parkinson_10", "std_10"
+    ]
+    returns = ohlc["close"].pct_change(fill_method=None) * 100
+    expected_std = returns.rolling(10).std() * np.sqrt(252)
+    pd.testing.assert_frame_equal(
+        features["std_10"], expected_std, check_names=False, rtol=1e-9
+    )